@@ -1,21 +1,15 @@
 from core.state import AnalyticsAgentState
 from datetime import datetime
+from core.log import get_logger
+
+log = get_logger(__name__)
 
 def analytics_agent(state: AnalyticsAgentState) -> dict:
-    print(f"\n{'='*60}")
-    print(f"[ANALYTICS] Logging conversation")
-    print(f"[ANALYTICS] State access: {list(state.keys())}")
-    print(f"{'='*60}")
+    log.debug("[ANALYTICS] Logging conversation; state access: %s", list(state))
     
     session_id = state["session_id"]
     events = state.get("analytics_events", [])
     
-    print(f"[ANALYTICS] Events ({len(events)}):")
-    for event in events:
-        event_type = event.get("event", "unknown")
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"  [{timestamp}] {event_type}")
-    
     metrics = {
         "session_id": session_id,
         "total_events": len(events),
@@ -23,13 +17,10 @@ def analytics_agent(state: AnalyticsAgentState) -> dict:
         "logged_at": datetime.now().isoformat()
     }
     
-    print(f"\n[ANALYTICS] Summary:")
-    print(f"  Session: {session_id}")
-    print(f"  Total events: {metrics['total_events']}")
-    print(f"  Event types: {', '.join(metrics['event_types'])}")
-    
-    print(f"[ANALYTICS] Complete")
-    print(f"{'='*60}\n")
+    log.info(
+        "[ANALYTICS] Session %s: %d events (%s)",
+        session_id, metrics["total_events"], ", ".join(map(str, metrics["event_types"]))
+    )
     
     return {
         "conversation_metrics": metrics
@@ -1,15 +1,15 @@
 from core.state import ComplianceAgentState
 import re
 from typing import List
+from core.log import get_logger
+
+log = get_logger(__name__)
 
 
 def compliance_agent(state: ComplianceAgentState) -> dict:
     output = state["sanitized_output"]
     
-    print(f"\n{'='*60}")
-    print(f"[COMPLIANCE] Scanning ({len(output)} chars)")
-    print(f"[COMPLIANCE] State access: {list(state.keys())}")
-    print(f"{'='*60}")
+    log.debug("[COMPLIANCE] Scanning (%d chars); state access: %s", len(output), list(state))
     
     flags = []
     
@@ -23,14 +23,14 @@ def compliance_agent(state: ComplianceAgentState) -> dict:
         if re.search(pattern, output):
             output = re.sub(pattern, '[REDACTED]', output)
             flags.append("ssn_removed")
-            print("[COMPLIANCE] ⚠️  SSN detected and removed")
+            log.warning("[COMPLIANCE] SSN detected and removed")
     
     cc_pattern = r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b'
     
     if re.search(cc_pattern, output):
         output = re.sub(cc_pattern, '[REDACTED]', output)
         flags.append("credit_card_removed")
-        print("[COMPLIANCE] ⚠️  Credit card detected and removed")
+        log.warning("[COMPLIANCE] Credit card detected and removed")
     
     password_patterns = [
         r'password\s*[:=]\s*\S+',
@@ -41,7 +41,7 @@ def compliance_agent(state: ComplianceAgentState) -> dict:
         if re.search(pattern, output, re.IGNORECASE):
             output = re.sub(pattern, '[PASSWORD REDACTED]', output, flags=re.IGNORECASE)
             flags.append("password_removed")
-            print("[COMPLIANCE] ⚠️  Password detected and removed")
+            log.warning("[COMPLIANCE] Password detected and removed")
     
     profanity_list = ["badword1", "badword2"]
     
@@ -62,10 +62,8 @@ def compliance_agent(state: ComplianceAgentState) -> dict:
             "flags": flags,
             "severity": "critical" if "ssn_removed" in flags else "medium"
         }]
-        print(f"[COMPLIANCE] Issues found: {', '.join(flags)}")
+        log.info("[COMPLIANCE] Issues found: %s", ", ".join(flags))
     else:
-        print("[COMPLIANCE] ✅ No issues detected")
-    
-    print(f"{'='*60}\n")
+        log.debug("[COMPLIANCE] No issues detected")
     
     return result
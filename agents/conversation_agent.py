@@ -1,51 +1,187 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm_clients import get_chat_model
+from core.llm_dispatch import coalesce_key, get_llm_dispatcher
 from core.state import ConversationAgentState
-from config.prompts import CONVERSATION_SYSTEM_PROMPT
+from config.prompts import CONVERSATION_SYSTEM_PROMPT, FUSED_STYLE_PROMPT
 from utils.intent_classifier import classify_intent, extract_confidence
 from utils.entity_extractor import extract_entities
+from core.knowledge_base import DEFAULT_TENANT
+from core.response_cache import get_response_cache, lookup_reply
+from core.log import get_logger
+import asyncio
 import os
 
+log = get_logger(__name__)
+
+FALLBACK_REPLY = "I'm having trouble right now. Please try again."
+
+
 def conversation_agent(
     state: ConversationAgentState,
-    knowledge_base
+    knowledge_base,
+    tenant_id: str = DEFAULT_TENANT,
+    fused: bool = False
+) -> dict:
+    # fused=True writes the reply in the brand's tone and voice directly, so the
+    # supervisor can skip the stylist pass.
+
+    user_message = state["messages"][-1]["content"]
+    _log_start(state, user_message)
+
+    context_chunks, context_used = retrieve_context(knowledge_base, user_message)
+    prompt = build_conversation_prompt(state, user_message, context_chunks, fused)
+    cached, cache_key = cached_reply(state, knowledge_base, tenant_id, user_message, context_chunks, fused)
+
+    if cached is not None:
+        reply = cached
+        log.debug("[CACHE] Reused cached reply (%d chars)", len(reply))
+    else:
+        try:
+            llm = _conversation_llm()
+            response = get_llm_dispatcher().call(
+                lambda: llm.invoke(prompt), key=coalesce_key(llm, prompt),
+                name="llm.conversation", prompt_chars=len(prompt)
+            )
+            reply = _accept_reply(response, cache_key)
+        except Exception as e:
+            log.warning("[AI] Failed: %s", e)
+            reply = FALLBACK_REPLY
+
+    return build_conversation_result(
+        state, user_message, reply, context_chunks, context_used, cached is not None, fused
+    )
+
+
+async def aconversation_agent(
+    state: ConversationAgentState,
+    knowledge_base,
+    tenant_id: str = DEFAULT_TENANT,
+    fused: bool = False
 ) -> dict:
-    
+
     user_message = state["messages"][-1]["content"]
-    
-    print(f"\n{'='*60}")
-    print(f"[CONVERSATION] Processing: '{user_message[:50]}...'")
-    print(f"[CONVERSATION] State access: {list(state.keys())}")
-    print(f"{'='*60}")
-    
+    _log_start(state, user_message)
+
+    # FAISS search and query embedding are CPU-bound; keep them off the event loop.
+    context_chunks, context_used = await asyncio.to_thread(retrieve_context, knowledge_base, user_message)
+    prompt = build_conversation_prompt(state, user_message, context_chunks, fused)
+    cached, cache_key = await asyncio.to_thread(
+        cached_reply, state, knowledge_base, tenant_id, user_message, context_chunks, fused
+    )
+
+    if cached is not None:
+        reply = cached
+        log.debug("[CACHE] Reused cached reply (%d chars)", len(reply))
+    else:
+        try:
+            llm = _conversation_llm()
+            response = await get_llm_dispatcher().acall(
+                lambda: llm.ainvoke(prompt), key=coalesce_key(llm, prompt),
+                name="llm.conversation", prompt_chars=len(prompt)
+            )
+            reply = _accept_reply(response, cache_key)
+        except Exception as e:
+            log.warning("[AI] Failed: %s", e)
+            reply = FALLBACK_REPLY
+
+    return build_conversation_result(
+        state, user_message, reply, context_chunks, context_used, cached is not None, fused
+    )
+
+
+def _log_start(state: ConversationAgentState, user_message: str):
+    log.debug("[CONVERSATION] Processing: '%s...'; state access: %s", user_message[:50], list(state))
+
+
+def _conversation_llm():
+    return get_chat_model(
+        model="gemini-2.0-flash",
+        temperature=0.7,
+        api_key=os.getenv("GEMINI_API_KEY")
+    )
+
+
+def _accept_reply(response, cache_key) -> str:
+    reply = response.content.strip()
+    log.debug("[AI] Generated reply (%d chars)", len(reply))
+    if cache_key is not None:
+        get_response_cache().put(*cache_key, reply)
+    return reply
+
+
+def retrieve_context(knowledge_base, user_message: str):
     try:
         context_chunks = knowledge_base.search(user_message, n=3)
         context_used = len(context_chunks) > 0
-        print(f"[RAG] Found {len(context_chunks)} relevant chunks")
+        log.debug("[RAG] Found %d relevant chunks", len(context_chunks))
     except Exception as e:
-        print(f"[RAG] Search failed: {e}")
+        log.warning("[RAG] Search failed: %s", e)
         context_chunks = []
         context_used = False
-    
+    return context_chunks, context_used
+
+
+def cached_reply(
+    state: ConversationAgentState,
+    knowledge_base,
+    tenant_id: str,
+    user_message: str,
+    context_chunks,
+    fused: bool = False
+):
+    # First turns only: a reply later in the conversation depends on the history.
+    if len(state["messages"]) > 1:
+        return None, None
+    scope = f"{tenant_id}:conversation"
+    if fused:
+        # Fused replies are already styled; keep them apart from two-pass drafts.
+        tone, voice = _brand_style(state)
+        scope = f"{scope}:fused:{tone}:{voice}"
+    try:
+        return lookup_reply(
+            get_response_cache(), knowledge_base, scope, user_message, context_chunks
+        )
+    except Exception as e:
+        log.warning("[CACHE] Lookup failed: %s", e)
+        return None, None
+
+
+def _brand_style(state: ConversationAgentState):
+    brand = state.get("brand_profile") or {}
+    return brand.get("tone", "professional"), brand.get("voice", "helpful")
+
+
+def build_conversation_prompt(
+    state: ConversationAgentState,
+    user_message: str,
+    context_chunks,
+    fused: bool = False
+) -> str:
     history_messages = state["messages"][:-1]
     if history_messages:
         history_str = "\n".join([
-            f"{msg['role']}: {msg['content']}" 
+            f"{msg['role']}: {msg['content']}"
             for msg in history_messages
         ])
     else:
         history_str = "This is the start of the conversation."
-    
+
     if context_chunks:
         context_str = "\n\n".join([
-            f"[Context {i+1}]\n{chunk}" 
+            f"[Context {i+1}]\n{chunk}"
             for i, chunk in enumerate(context_chunks)
         ])
     else:
         context_str = "No relevant documents found."
-    
-    prompt = f"""{CONVERSATION_SYSTEM_PROMPT}
 
-Knowledge Base Context:
+    if fused:
+        tone, voice = _brand_style(state)
+        style_str = FUSED_STYLE_PROMPT.format(tone=tone, voice=voice) + "\n\n"
+    else:
+        style_str = ""
+
+    return f"""{CONVERSATION_SYSTEM_PROMPT}
+
+{style_str}Knowledge Base Context:
 {context_str}
 
 Conversation History:
@@ -57,33 +193,28 @@ User's Message:
 Your Task:
 Provide a helpful response (2-4 sentences).
 """
-    
-    try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            temperature=0.7,
-            google_api_key=os.getenv("GEMINI_API_KEY")
-        )
-        
-        response = llm.invoke(prompt)
-        reply = response.content.strip()
-        
-        print(f"[AI] Generated reply ({len(reply)} chars)")
-        
-    except Exception as e:
-        print(f"[AI] Failed: {e}")
-        reply = "I'm having trouble right now. Please try again."
-    
+
+
+def build_conversation_result(
+    state: ConversationAgentState,
+    user_message: str,
+    reply: str,
+    context_chunks,
+    context_used: bool,
+    cached: bool,
+    fused: bool = False
+) -> dict:
+
     intent = classify_intent(user_message)
     confidence = extract_confidence(reply)
-    
-    print(f"[INTENT] Detected: {intent} (confidence: {confidence})")
-    
+
+    log.debug("[INTENT] Detected: %s (confidence: %s)", intent, confidence)
+
     extracted = extract_entities(state["messages"])
-    
+
     if extracted.get("email"):
-        print(f"[ENTITIES] Found email: {extracted['email']}")
-    
+        log.debug("[ENTITIES] Found email: %s", extracted["email"])
+
     result = {
         "current_intent": intent,
         "confidence_score": confidence,
@@ -95,11 +226,12 @@ Provide a helpful response (2-4 sentences).
             "event": "message_received",
             "session_id": state["session_id"],
             "intent": intent,
-            "confidence": confidence
+            "confidence": confidence,
+            "cached_reply": cached,
+            "generation_mode": "fused" if fused else "two_pass"
         }]
     }
-    
-    print(f"[CONVERSATION] Complete. Returning updates: {list(result.keys())}")
-    print(f"{'='*60}\n")
-    
+
+    log.debug("[CONVERSATION] Complete. Returning updates: %s", list(result))
+
     return result
@@ -1,12 +1,12 @@
 from core.state import IntegrationAgentState
+from core.log import get_logger
+
+log = get_logger(__name__)
 
 
 def integration_agent(state: IntegrationAgentState) -> dict:
     
-    print(f"\n{'='*60}")
-    print(f"[INTEGRATION] Processing external systems")
-    print(f"[INTEGRATION] State access: {list(state.keys())}")
-    print(f"{'='*60}")
+    log.debug("[INTEGRATION] Processing external systems; state access: %s", list(state))
     
     
     crm_payload = state.get("crm_payload")
@@ -16,10 +16,10 @@ def integration_agent(state: IntegrationAgentState) -> dict:
     
     
     if crm_payload:
-        print(f"[INTEGRATION] Pushing to CRM:")
-        print(f"  Email: {crm_payload.get('email')}")
-        print(f"  Company: {crm_payload.get('company')}")
-        print(f"  Score: {crm_payload.get('lead_score')}/100")
+        log.info(
+            "[INTEGRATION] Pushing to CRM: %s (%s), score %s/100",
+            crm_payload.get("email"), crm_payload.get("company"), crm_payload.get("lead_score")
+        )
         
         success = push_to_crm_mock(crm_payload)
         
@@ -35,11 +35,10 @@ def integration_agent(state: IntegrationAgentState) -> dict:
     
     
     if meeting_slots:
-        print(f"[INTEGRATION] Would book calendar (Phase 3)")
+        log.info("[INTEGRATION] Would book calendar (Phase 3)")
     
     
-    print(f"[INTEGRATION] Complete")
-    print(f"{'='*60}\n")
+    log.debug("[INTEGRATION] Complete")
     
     return {
         "analytics_events": events
@@ -48,8 +47,6 @@ def integration_agent(state: IntegrationAgentState) -> dict:
 
 def push_to_crm_mock(payload: dict) -> bool:
     
-    print("\n[MOCK CRM] Would send to HubSpot:")
-    print(f"  POST /crm/v3/objects/contacts")
-    print(f"  Body: {payload}\n")
+    log.info("[MOCK CRM] Would send to HubSpot: POST /crm/v3/objects/contacts %s", payload)
     
     return True
@@ -1,18 +1,18 @@
 from core.state import LeadAgentState
 from typing import Dict
+from core.log import get_logger
+
+log = get_logger(__name__)
 
 def lead_qualification_agent(state: LeadAgentState) -> dict:
     
     entities = state["entities"]
     messages = state["messages"]
     
-    print(f"\n{'='*60}")
-    print(f"[LEAD QUAL] Starting")
-    print(f"[LEAD QUAL] State access: {list(state.keys())}")
-    print(f"{'='*60}")
+    log.debug("[LEAD QUAL] Starting; state access: %s", list(state))
     
     if not entities.get("email"):
-        print("[LEAD QUAL] No email found")
+        log.debug("[LEAD QUAL] No email found")
         return {}
     
     bant_score = calculate_bant_score(entities, messages)
@@ -24,7 +24,7 @@ def lead_qualification_agent(state: LeadAgentState) -> dict:
     else:
         qualification = "cold"
     
-    print(f"[LEAD QUAL] Score: {bant_score}/100 ({qualification.upper()})")
+    log.info("[LEAD QUAL] Score: %d/100 (%s)", bant_score, qualification.upper())
     
     crm_payload = {
         "email": entities.get("email"),
@@ -50,8 +50,7 @@ def lead_qualification_agent(state: LeadAgentState) -> dict:
         }]
     }
     
-    print(f"[LEAD QUAL] Complete")
-    print(f"{'='*60}\n")
+    log.debug("[LEAD QUAL] Complete")
     
     return result
 
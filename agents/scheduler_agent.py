@@ -1,19 +1,19 @@
 from core.state import SchedulerAgentState
 from datetime import datetime, timedelta
 from typing import List, Dict
+from core.log import get_logger
+
+log = get_logger(__name__)
 
 def scheduler_agent(state: SchedulerAgentState) -> dict:
     
-    print(f"\n{'='*60}")
-    print(f"[SCHEDULER] Finding demo slots")
-    print(f"[SCHEDULER] State access: {list(state.keys())}")
-    print(f"{'='*60}")
+    log.debug("[SCHEDULER] Finding demo slots; state access: %s", list(state))
     
     try:
         slots = generate_mock_slots()
-        print(f"[SCHEDULER] Found {len(slots)} slots")
+        log.debug("[SCHEDULER] Found %d slots", len(slots))
     except Exception as e:
-        print(f"[SCHEDULER] Failed: {e}")
+        log.warning("[SCHEDULER] Failed: %s", e)
         return {}
     
     formatted = format_slots_for_user(slots)
@@ -39,8 +39,7 @@ Which time works best? Reply with the number (1, 2, 3, etc.)."""
         }]
     }
     
-    print(f"[SCHEDULER] Complete")
-    print(f"{'='*60}\n")
+    log.debug("[SCHEDULER] Complete")
     
     return result
 
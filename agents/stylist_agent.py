@@ -1,52 +1,93 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm_clients import get_chat_model
+from core.llm_dispatch import coalesce_key, get_llm_dispatcher
 from core.state import StylistAgentState
 from config.prompts import BRAND_STYLIST_PROMPT
+from core.log import get_logger
 import os
 
+log = get_logger(__name__)
+
+
 def brand_stylist_agent(state: StylistAgentState) -> dict:
-    
-    print(f"\n{'='*60}")
-    print(f"[STYLIST] Styling message")
-    print(f"[STYLIST] State access: {list(state.keys())}")
-    print(f"{'='*60}")
-    
+
+    raw_message, prompt = _prepare(state)
+    if prompt is None:
+        return {"sanitized_output": raw_message}
+
+    try:
+        llm = _stylist_llm()
+        response = get_llm_dispatcher().call(
+            lambda: llm.invoke(prompt), key=coalesce_key(llm, prompt),
+            name="llm.stylist", prompt_chars=len(prompt)
+        )
+        styled = response.content.strip()
+
+        log.debug("[STYLIST] Styled successfully")
+
+    except Exception as e:
+        log.warning("[STYLIST] Failed: %s, using original", e)
+        styled = raw_message
+
+    return _result(styled)
+
+
+async def abrand_stylist_agent(state: StylistAgentState) -> dict:
+
+    raw_message, prompt = _prepare(state)
+    if prompt is None:
+        return {"sanitized_output": raw_message}
+
+    try:
+        llm = _stylist_llm()
+        response = await get_llm_dispatcher().acall(
+            lambda: llm.ainvoke(prompt), key=coalesce_key(llm, prompt),
+            name="llm.stylist", prompt_chars=len(prompt)
+        )
+        styled = response.content.strip()
+
+        log.debug("[STYLIST] Styled successfully")
+
+    except Exception as e:
+        log.warning("[STYLIST] Failed: %s, using original", e)
+        styled = raw_message
+
+    return _result(styled)
+
+
+def _prepare(state: StylistAgentState):
+    log.debug("[STYLIST] Styling message; state access: %s", list(state))
+
     raw_message = state["provisional_reply"]
     brand = state["brand_profile"]
-    
+
     if len(raw_message) < 50:
-        print("[STYLIST] Message too short, skipping")
-        return {"sanitized_output": raw_message}
-    
+        log.debug("[STYLIST] Message too short, skipping")
+        return raw_message, None
+
     tone = brand.get("tone", "professional")
     voice = brand.get("voice", "helpful")
-    
+
     prompt = BRAND_STYLIST_PROMPT.format(
         tone=tone,
         voice=voice,
         message=raw_message
     )
-    
-    try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            temperature=0.3,
-            google_api_key=os.getenv("GEMINI_API_KEY")
-        )
-        
-        response = llm.invoke(prompt)
-        styled = response.content.strip()
-        
-        print(f"[STYLIST] Styled successfully")
-        
-    except Exception as e:
-        print(f"[STYLIST] Failed: {e}, using original")
-        styled = raw_message
-    
+    return raw_message, prompt
+
+
+def _stylist_llm():
+    return get_chat_model(
+        model="gemini-2.0-flash",
+        temperature=0.3,
+        api_key=os.getenv("GEMINI_API_KEY")
+    )
+
+
+def _result(styled: str) -> dict:
     result = {
         "sanitized_output": styled
     }
-    
-    print(f"[STYLIST] Complete")
-    print(f"{'='*60}\n")
-    
+
+    log.debug("[STYLIST] Complete")
+
     return result
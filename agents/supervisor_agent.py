@@ -1,22 +1,132 @@
-from core.state import ChimeraFullState
+from core.state import (
+    ChimeraFullState,
+    LeadAgentState,
+    SchedulerAgentState,
+    StylistAgentState,
+    ComplianceAgentState,
+    IntegrationAgentState,
+    AnalyticsAgentState
+)
 from core.state_filter import StateFilter
+from core.state_view import FrozenMapping, FrozenSequence, thaw
+from core.tenant_config import generation_mode_for_state
+from core.llm_dispatch import lane_for_state, use_lane
+from core.audit_log import estimate_size
+from core.log import get_logger
+from core.tracing import span
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
+import asyncio
+import contextvars
 import copy
+import inspect
+import os
+import threading
+
+log = get_logger(__name__)
+
+AGENT_WORKERS = int(os.getenv("CHIMERA_AGENT_WORKERS", "8"))
+
+ALLOWED_UPDATES = {
+    "lead_agent": [
+        "lead_data", "crm_payload", "lead_status", "analytics_events"
+    ],
+    "scheduler_agent": [
+        "meeting_slots", "provisional_reply", "analytics_events"
+    ],
+    "stylist_agent": [
+        "sanitized_output"
+    ],
+    "compliance_agent": [
+        "sanitized_output", "compliance_flags", "analytics_events"
+    ],
+    "integration_agent": [
+        "analytics_events"
+    ],
+    "analytics_agent": [
+        "conversation_metrics"
+    ]
+}
+
+# Event logs: every agent's entries are kept, in merge order.
+APPEND_FIELDS = {"analytics_events"}
+
+# What each agent sees, straight from its filtered state type.
+AGENT_READS = {
+    "lead_agent": set(LeadAgentState.__annotations__),
+    "scheduler_agent": set(SchedulerAgentState.__annotations__),
+    "stylist_agent": set(StylistAgentState.__annotations__),
+    "compliance_agent": set(ComplianceAgentState.__annotations__),
+    "integration_agent": set(IntegrationAgentState.__annotations__),
+    "analytics_agent": set(AnalyticsAgentState.__annotations__)
+}
+
+_agent_pool = None
+_agent_pool_lock = threading.Lock()
 
 def supervisor_agent(full_state: ChimeraFullState) -> ChimeraFullState:
+    routing = plan_supervisor_pass(full_state)
+    if routing is None:
+        return full_state
+    
+    full_state = run_stage(full_state, routing)
+    
+    return finish_supervisor_pass(full_state, routing)
+
+async def asupervisor_agent(full_state: ChimeraFullState) -> ChimeraFullState:
+    routing = plan_supervisor_pass(full_state)
+    if routing is None:
+        return full_state
+    
+    full_state = await arun_stage(full_state, routing)
+    
+    return finish_supervisor_pass(full_state, routing)
+
+def run_stage(full_state: ChimeraFullState, routing: Dict) -> ChimeraFullState:
+    # Runs the agents of one routing decision; shared by the iterative supervisor
+    # and the precompiled plan executor.
+    agents_to_call = routing.get("agents", [])
+    mode = routing.get("mode", "sequential")
+    
+    if routing.get("promote_draft"):
+        full_state["sanitized_output"] = full_state["provisional_reply"]
+    
+    if agents_to_call:
+        if mode == "parallel":
+            full_state = call_agents_parallel_filtered(full_state, agents_to_call)
+        else:
+            for agent_name in agents_to_call:
+                full_state = call_agent_filtered(full_state, agent_name)
+    
+    return full_state
+
+async def arun_stage(full_state: ChimeraFullState, routing: Dict) -> ChimeraFullState:
+    agents_to_call = routing.get("agents", [])
+    mode = routing.get("mode", "sequential")
+    
+    if routing.get("promote_draft"):
+        full_state["sanitized_output"] = full_state["provisional_reply"]
+    
+    if agents_to_call:
+        if mode == "parallel":
+            full_state = await acall_agents_parallel_filtered(full_state, agents_to_call)
+        else:
+            for agent_name in agents_to_call:
+                full_state = await acall_agent_filtered(full_state, agent_name)
+    
+    return full_state
+
+def plan_supervisor_pass(full_state: ChimeraFullState):
+    # Returns the routing decision, or None once the iteration cap has ended the turn.
     phase = full_state.get("supervisor_phase", "initial_analysis")
     iteration = full_state.get("iteration_count", 0)
     
-    print(f"\n{'='*60}")
-    print(f"[SUPERVISOR] Pass #{iteration + 1} - Phase: {phase}")
-    print(f"[SUPERVISOR] Full state access: YES")
-    print(f"[SUPERVISOR] Fields: {list(full_state.keys())}")
-    print(f"{'='*60}")
+    log.debug("[SUPERVISOR] Pass #%d - Phase: %s", iteration + 1, phase)
     
     if iteration >= 10:
-        print("[SUPERVISOR] Max iterations reached. Ending.")
+        log.warning("[SUPERVISOR] Max iterations reached. Ending.")
         full_state["next_action"] = "analytics"
-        return full_state
+        return None
     
     if phase == "initial_analysis":
         routing = phase_1_initial_analysis(full_state)
@@ -28,22 +138,20 @@ def supervisor_agent(full_state: ChimeraFullState) -> ChimeraFullState:
         routing = {"agents": [], "mode": "done"}
     
     agents_to_call = routing.get("agents", [])
-    mode = routing.get("mode", "sequential")
-    next_phase = routing.get("next_phase", "finalization")
     
-    print(f"[SUPERVISOR] Decision:")
-    print(f"  Agents: {', '.join(agents_to_call) if agents_to_call else 'none'}")
-    print(f"  Mode: {mode}")
-    print(f"  Next phase: {next_phase}")
+    log.debug(
+        "[SUPERVISOR] Decision: agents=%s mode=%s next_phase=%s",
+        ", ".join(agents_to_call) or "none",
+        routing.get("mode", "sequential"),
+        routing.get("next_phase", "finalization")
+    )
     
-    if agents_to_call:
-        if mode == "parallel":
-            full_state = call_agents_parallel_filtered(full_state, agents_to_call)
-        else:
-            for agent_name in agents_to_call:
-                full_state = call_agent_filtered(full_state, agent_name)
+    return routing
+
+def finish_supervisor_pass(full_state: ChimeraFullState, routing: Dict) -> ChimeraFullState:
+    mode = routing.get("mode", "sequential")
     
-    full_state["supervisor_phase"] = next_phase
+    full_state["supervisor_phase"] = routing.get("next_phase", "finalization")
     full_state["previous_agent"] = "supervisor"
     full_state["iteration_count"] += 1
     
@@ -52,8 +160,7 @@ def supervisor_agent(full_state: ChimeraFullState) -> ChimeraFullState:
     else:
         full_state["next_action"] = "supervisor"
     
-    print(f"[SUPERVISOR] Next: {full_state['next_action']}")
-    print(f"{'='*60}\n")
+    log.debug("[SUPERVISOR] Next: %s", full_state["next_action"])
     
     return full_state
 
@@ -62,11 +169,41 @@ def call_agent_filtered(
     agent_name: str
 ) -> ChimeraFullState:
     
-    print(f"\n[SUPERVISOR] Calling {agent_name} with filtered state")
+    log.debug("[SUPERVISOR] Calling %s with filtered state", agent_name)
+    
+    resolved = resolve_agent(full_state, agent_name)
+    if resolved is None:
+        return full_state
+    filtered_state, agent_func = resolved
+    
+    agent_result = run_agent(full_state, agent_name, filtered_state, agent_func)
+    if agent_result is None:
+        return full_state
+    
+    return merge_agent_result(full_state, agent_name, agent_result)
+
+async def acall_agent_filtered(
+    full_state: ChimeraFullState,
+    agent_name: str
+) -> ChimeraFullState:
+    
+    log.debug("[SUPERVISOR] Calling %s with filtered state (async)", agent_name)
     
+    resolved = resolve_agent(full_state, agent_name, prefer_async=True)
+    if resolved is None:
+        return full_state
+    filtered_state, agent_func = resolved
+    
+    agent_result = await arun_agent(full_state, agent_name, filtered_state, agent_func)
+    if agent_result is None:
+        return full_state
+    
+    return merge_agent_result(full_state, agent_name, agent_result)
+
+def resolve_agent(full_state: ChimeraFullState, agent_name: str, prefer_async: bool = False):
     from agents.lead_agent import lead_qualification_agent
     from agents.scheduler_agent import scheduler_agent
-    from agents.stylist_agent import brand_stylist_agent
+    from agents.stylist_agent import brand_stylist_agent, abrand_stylist_agent
     from agents.compliance_agent import compliance_agent
     from agents.integration_agent import integration_agent
     from agents.analytics_agent import analytics_agent
@@ -79,7 +216,7 @@ def call_agent_filtered(
         agent_func = scheduler_agent
     elif agent_name == "stylist_agent":
         filtered_state = StateFilter.for_stylist_agent(full_state)
-        agent_func = brand_stylist_agent
+        agent_func = abrand_stylist_agent if prefer_async else brand_stylist_agent
     elif agent_name == "compliance_agent":
         filtered_state = StateFilter.for_compliance_agent(full_state)
         agent_func = compliance_agent
@@ -90,31 +227,132 @@ def call_agent_filtered(
         filtered_state = StateFilter.for_analytics_agent(full_state)
         agent_func = analytics_agent
     else:
-        print(f"[SUPERVISOR] Unknown agent: {agent_name}")
-        return full_state
+        log.warning("[SUPERVISOR] Unknown agent: %s", agent_name)
+        return None
     
+    return filtered_state, agent_func
+
+def run_agent(full_state: ChimeraFullState, agent_name: str, filtered_state: Dict, agent_func):
+    # Returns the agent's updates, or None if it failed. Safe to call from a worker thread.
     try:
-        agent_result = agent_func(filtered_state)
-        print(f"[SUPERVISOR] {agent_name} returned: {list(agent_result.keys())}")
+        # Hot leads get the priority lane for any LLM call the agent makes.
+        with use_lane(lane_for_state(full_state)), agent_span(agent_name, filtered_state) as current:
+            agent_result = agent_func(filtered_state)
+            current.set("agent.output_fields", len(agent_result))
+        log.debug("[SUPERVISOR] %s returned: %s", agent_name, list(agent_result))
+        return agent_result
     except Exception as e:
-        print(f"[SUPERVISOR] {agent_name} failed: {e}")
-        return full_state
-    
-    full_state = merge_agent_result(full_state, agent_name, agent_result)
+        log.warning("[SUPERVISOR] %s failed: %s", agent_name, e)
+        return None
+
+async def arun_agent(
+    full_state: ChimeraFullState,
+    agent_name: str,
+    filtered_state: Dict,
+    agent_func,
+    offload: bool = False
+):
+    # Agents without network I/O stay synchronous and run inline; they finish in
+    # microseconds. With offload=True they go to a worker thread so that several
+    # can overlap.
+    try:
+        with use_lane(lane_for_state(full_state)), agent_span(agent_name, filtered_state) as current:
+            if offload and not inspect.iscoroutinefunction(agent_func):
+                agent_result = await asyncio.to_thread(agent_func, filtered_state)
+            else:
+                agent_result = agent_func(filtered_state)
+                if inspect.isawaitable(agent_result):
+                    agent_result = await agent_result
+            current.set("agent.output_fields", len(agent_result))
+        log.debug("[SUPERVISOR] %s returned: %s", agent_name, list(agent_result))
+        return agent_result
+    except Exception as e:
+        log.warning("[SUPERVISOR] %s failed: %s", agent_name, e)
+        return None
+
+def agent_span(agent_name: str, filtered_state: Dict):
+    # One "agent" span per agent run; this is what the per-agent p50/p99 are built from.
+    return span(
+        agent_name,
+        kind="agent",
+        input_fields=len(filtered_state),
+        input_size=estimate_size(filtered_state)
+    )
+
+def plan_waves(agent_names: List[str]) -> List[List[str]]:
+    # An agent that reads a field written by an earlier agent in the list waits
+    # for it (stylist -> compliance via sanitized_output); everything else in a
+    # wave runs concurrently. Order within a wave is the routing order.
+    waves = []
+    wave_of = {}
+    for agent_name in agent_names:
+        reads = AGENT_READS.get(agent_name, set())
+        wave = 0
+        for earlier, earlier_wave in wave_of.items():
+            if reads & set(ALLOWED_UPDATES.get(earlier, [])):
+                wave = max(wave, earlier_wave + 1)
+        wave_of[agent_name] = wave
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(agent_name)
+    return waves
+
+def agent_pool() -> ThreadPoolExecutor:
+    global _agent_pool
+    with _agent_pool_lock:
+        if _agent_pool is None:
+            _agent_pool = ThreadPoolExecutor(max_workers=AGENT_WORKERS, thread_name_prefix="chimera-agent")
+        return _agent_pool
+
+def call_agents_parallel_filtered(
+    full_state: ChimeraFullState,
+    agent_names: List[str]
+) -> ChimeraFullState:
     
-    print(f"[SUPERVISOR] {agent_name} complete, updates merged\n")
+    log.debug("[SUPERVISOR] Calling %d agents in parallel", len(agent_names))
+    
+    for wave in plan_waves(agent_names):
+        if len(wave) == 1:
+            full_state = call_agent_filtered(full_state, wave[0])
+            continue
+        
+        log.debug("[SUPERVISOR] Wave: %s", ", ".join(wave))
+        # Each agent gets its own filtered snapshot of the state before the wave.
+        resolved = [(name, resolve_agent(full_state, name)) for name in wave]
+        # Run in a copy of this context so the agents' spans nest under the current one.
+        futures = [
+            (name, agent_pool().submit(contextvars.copy_context().run, run_agent, full_state, name, *snapshot))
+            for name, snapshot in resolved if snapshot is not None
+        ]
+        # Merge in routing order, not completion order, so the result is deterministic.
+        for agent_name, future in futures:
+            agent_result = future.result()
+            if agent_result is not None:
+                full_state = merge_agent_result(full_state, agent_name, agent_result)
     
     return full_state
 
-def call_agents_parallel_filtered(
+async def acall_agents_parallel_filtered(
     full_state: ChimeraFullState,
     agent_names: List[str]
 ) -> ChimeraFullState:
     
-    print(f"\n[SUPERVISOR] Calling {len(agent_names)} agents in parallel")
-    
-    for agent_name in agent_names:
-        full_state = call_agent_filtered(full_state, agent_name)
+    log.debug("[SUPERVISOR] Calling %d agents in parallel (async)", len(agent_names))
+    
+    for wave in plan_waves(agent_names):
+        if len(wave) == 1:
+            full_state = await acall_agent_filtered(full_state, wave[0])
+            continue
+        
+        log.debug("[SUPERVISOR] Wave: %s", ", ".join(wave))
+        resolved = [(name, resolve_agent(full_state, name, prefer_async=True)) for name in wave]
+        resolved = [(name, snapshot) for name, snapshot in resolved if snapshot is not None]
+        results = await asyncio.gather(*(
+            arun_agent(full_state, name, *snapshot, offload=True) for name, snapshot in resolved
+        ))
+        for (agent_name, _), agent_result in zip(resolved, results):
+            if agent_result is not None:
+                full_state = merge_agent_result(full_state, agent_name, agent_result)
     
     return full_state
 
@@ -124,39 +362,24 @@ def merge_agent_result(
     agent_result: Dict
 ) -> ChimeraFullState:
     
-    allowed_updates = {
-        "lead_agent": [
-            "lead_data", "crm_payload", "lead_status", "analytics_events"
-        ],
-        "scheduler_agent": [
-            "meeting_slots", "provisional_reply", "analytics_events"
-        ],
-        "stylist_agent": [
-            "sanitized_output"
-        ],
-        "compliance_agent": [
-            "sanitized_output", "compliance_flags", "analytics_events"
-        ],
-        "integration_agent": [
-            "analytics_events"
-        ],
-        "analytics_agent": [
-            "conversation_metrics"
-        ]
-    }
-    
-    allowed_fields = allowed_updates.get(agent_name, [])
+    allowed_fields = ALLOWED_UPDATES.get(agent_name, [])
     
     merged_count = 0
     for field in agent_result.keys():
         if field in allowed_fields:
-            full_state[field] = agent_result[field]
-            print(f"  ✓ Merged: {field}")
+            value = agent_result[field]
+            if isinstance(value, (FrozenMapping, FrozenSequence)):
+                # Never store an agent's read-only view back into the full state.
+                value = thaw(value)
+            if field in APPEND_FIELDS:
+                full_state[field] = list(full_state.get(field) or []) + list(value)
+            else:
+                full_state[field] = value
             merged_count += 1
         else:
-            print(f"  ✗ BLOCKED: {agent_name} tried to update '{field}' (not allowed)")
+            log.warning("[SUPERVISOR] BLOCKED: %s tried to update '%s' (not allowed)", agent_name, field)
     
-    print(f"  Total merged: {merged_count} fields")
+    log.debug("[SUPERVISOR] %s: merged %d fields", agent_name, merged_count)
     
     return full_state
 
@@ -164,7 +387,7 @@ def phase_1_initial_analysis(full_state: ChimeraFullState) -> Dict:
     intent = full_state["current_intent"]
     has_email = bool(full_state["entities"].get("email"))
     
-    print(f"[PHASE 1] Intent: {intent}, Has email: {has_email}")
+    log.debug("[PHASE 1] Intent: %s, Has email: %s", intent, has_email)
     
     if intent == "demo" and has_email:
         return {
@@ -195,7 +418,17 @@ def phase_1_initial_analysis(full_state: ChimeraFullState) -> Dict:
         }
 
 def phase_2_result_collection(full_state: ChimeraFullState) -> Dict:
-    print(f"[PHASE 2] Reviewing specialist results")
+    log.debug("[PHASE 2] Reviewing specialist results")
+    
+    if generation_mode_for_state(full_state) == "fused":
+        # The draft is already in brand voice: hand it to compliance as the stylist would.
+        log.debug("[PHASE 2] Fused generation, skipping stylist")
+        return {
+            "agents": ["compliance_agent"],
+            "mode": "sequential",
+            "next_phase": "finalization",
+            "promote_draft": True
+        }
     
     return {
         "agents": ["stylist_agent", "compliance_agent"],
@@ -204,7 +437,7 @@ def phase_2_result_collection(full_state: ChimeraFullState) -> Dict:
     }
 
 def phase_3_post_processing(full_state: ChimeraFullState) -> Dict:
-    print(f"[PHASE 3] All processing complete")
+    log.debug("[PHASE 3] All processing complete")
     
     return {
         "agents": [],
@@ -1,33 +1,32 @@
 import os
-import faiss
-import numpy as np
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 import google.generativeai as genai
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
+from core.knowledge_base import DEFAULT_TENANT, KnowledgeBase as BaseKnowledgeBase
+from core.llm_clients import get_llm_provider
+from core.llm_dispatch import coalesce_key, get_llm_dispatcher
+from core.response_cache import get_response_cache, lookup_reply
+from core.tenant_manager import TenantKnowledgeBaseManager
+from core.tracing import end_span, start_span
 
 load_dotenv()
 genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
 
 
-class KnowledgeBase:
-    def __init__(self, docs: List[str]):
-        self.docs = docs
-        self.model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-        self.embeddings = np.array(self.model.encode(docs, show_progress_bar=True)).astype("float32")
-        self.index = faiss.IndexFlatL2(self.embeddings.shape[1])
-        self.index.add(self.embeddings)
-
-    def search(self, query: str, n: int = 3, db=None) -> List[str]:
-        query_emb = np.array(self.model.encode([query])).astype("float32")
-        distances, indices = self.index.search(query_emb, n)
-        return [self.docs[i] for i in indices[0] if i < len(self.docs)]
+class KnowledgeBase(BaseKnowledgeBase):
+    def __init__(self, docs: List[str], snapshot_dir: Optional[str] = None, model=None, index_config=None, retrieval_mode: Optional[str] = None):
+        super().__init__(model=model, index_config=index_config, retrieval_mode=retrieval_mode)
+        self.sync(docs, snapshot_dir=snapshot_dir or os.getenv("CHIMERA_KB_DIR"))
 
 
 class ChimeraAI:
-    def __init__(self, knowledge_base):
+    def __init__(self, knowledge_base, tenant_id: str = DEFAULT_TENANT, response_cache=None):
         self.kb = knowledge_base
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.tenant_id = tenant_id
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        # Shared across sessions; each ChimeraAI used to build its own client.
+        self.model = get_llm_provider().generative_model('gemini-2.5-flash')
+        self.dispatcher = get_llm_dispatcher()
         self.conversations = {}
 
         self.system_prompt = """You are Chimera, an intelligent AI sales assistant.
@@ -106,13 +105,32 @@ If the lead seems qualified, gently suggest scheduling a call or demo."""
         score['qualification'] = 'hot' if total >= 60 else 'warm' if total >= 30 else 'cold'
         return score
 
-    def generate_response(self, message: str, session_id: str, db: Optional[object] = None, enable_lead_qualification: bool = False) -> Dict[str, any]:
-        history = self.get_conversation(session_id)
-        context_chunks = self.kb.search(message, n=3, db=db)
+    def _lane(self, message: str, history: List[Dict]) -> str:
+        # Score before the call so hot leads are queued ahead of everyone else.
+        return "hot" if self._analyze_lead_quality(message, history)['qualification'] == 'hot' else "normal"
+
+    def _knowledge_base(self):
+        # A tenant manager is resolved on every call; a KB held across calls goes stale once evicted.
+        if isinstance(self.kb, TenantKnowledgeBaseManager):
+            return self.kb.get(self.tenant_id)
+        return self.kb
+
+    def _prepare(self, message: str, history: List[Dict], db: Optional[object], enable_lead_qualification: bool):
+        kb = self._knowledge_base()
+        context_chunks = kb.search(message, n=3, db=db)
+
+        # Only first turns are cached: later replies depend on the conversation so far.
+        cached, cache_key = None, None
+        if not history:
+            scope = f"{self.tenant_id}:chimera:{int(enable_lead_qualification)}"
+            cached, cache_key = lookup_reply(self.response_cache, kb, scope, message, context_chunks)
+        return context_chunks, cached, cache_key
+
+    def _build_prompt(self, message: str, history: List[Dict], context_chunks: List[str], enable_lead_qualification: bool) -> str:
         context_str = self._build_context_string(context_chunks)
         history_str = self._build_history_string(history)
 
-        prompt = "\n".join([
+        return "\n".join([
             self.system_prompt,
             "",
             "RELEVANT KNOWLEDGE BASE CONTEXT:",
@@ -127,34 +145,107 @@ If the lead seems qualified, gently suggest scheduling a call or demo."""
             "Assistant (Chimera):"
         ])
 
+    @staticmethod
+    def _generation_config():
+        return genai.types.GenerationConfig(
+            temperature=0.7,
+            top_p=0.9,
+            top_k=40,
+            max_output_tokens=500,
+        )
+
+    def generate_response(self, message: str, session_id: str, db: Optional[object] = None, enable_lead_qualification: bool = False) -> Dict[str, any]:
+        history = self.get_conversation(session_id)
+        context_chunks, cached, cache_key = self._prepare(message, history, db, enable_lead_qualification)
+        if cached is not None:
+            return self._finish_response(message, cached, session_id, history, context_chunks, enable_lead_qualification, cached=True)
+
+        prompt = self._build_prompt(message, history, context_chunks, enable_lead_qualification)
+
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    top_p=0.9,
-                    top_k=40,
-                    max_output_tokens=500,
-                ),
+            response = self.dispatcher.call(
+                lambda: self.model.generate_content(prompt, generation_config=self._generation_config()),
+                key=coalesce_key(self.model, prompt),
+                lane=self._lane(message, history),
+                name="llm.chat",
+                prompt_chars=len(prompt),
             )
 
             reply = response.text.strip()
-            history.append({"role": "user", "content": message})
-            history.append({"role": "assistant", "content": reply})
 
-            result = {
-                "response": reply,
-                "session_id": session_id,
-                "context_used": len(context_chunks) > 0,
-            }
+        except Exception as e:
+            raise Exception(f"AI generation failed: {str(e)}")
 
-            if enable_lead_qualification:
-                result["lead_score"] = self._analyze_lead_quality(message, history)
+        if cache_key is not None:
+            self.response_cache.put(*cache_key, reply)
+        return self._finish_response(message, reply, session_id, history, context_chunks, enable_lead_qualification)
 
-            return result
+    def generate_response_stream(self, message: str, session_id: str, db: Optional[object] = None, enable_lead_qualification: bool = False) -> "StreamingReply":
+        # Same as generate_response, but the reply is yielded chunk by chunk as the
+        # model produces it; the final dict is on `.result` once iteration ends.
+        history = self.get_conversation(session_id)
+        context_chunks, cached, cache_key = self._prepare(message, history, db, enable_lead_qualification)
+
+        def chunks() -> Iterator[str]:
+            if cached is not None:
+                yield cached
+                return
+            prompt = self._build_prompt(message, history, context_chunks, enable_lead_qualification)
+            try:
+                # The slot is held until the stream is drained; streams are never coalesced.
+                lane = self._lane(message, history)
+                current = start_span("llm.chat_stream", kind="llm", lane=lane, prompt_chars=len(prompt))
+                streamed, error = 0, None
+                try:
+                    with self.dispatcher.slot(lane):
+                        for part in self.model.generate_content(prompt, generation_config=self._generation_config(), stream=True):
+                            text = part.text
+                            if text:
+                                streamed += len(text)
+                                yield text
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    current.set("llm.output_chars", streamed)
+                    end_span(current, error)
+            except Exception as e:
+                raise Exception(f"AI generation failed: {str(e)}")
+
+        def finish(reply: str) -> Dict[str, any]:
+            reply = reply.strip()
+            if cached is None and cache_key is not None:
+                self.response_cache.put(*cache_key, reply)
+            return self._finish_response(
+                message, reply, session_id, history, context_chunks, enable_lead_qualification, cached=cached is not None
+            )
 
-        except Exception as e:
-            raise Exception(f"AI generation failed: {str(e)}")
+        return StreamingReply(chunks(), finish)
+
+    def _finish_response(
+        self,
+        message: str,
+        reply: str,
+        session_id: str,
+        history: List[Dict],
+        context_chunks: List[str],
+        enable_lead_qualification: bool,
+        cached: bool = False,
+    ) -> Dict[str, any]:
+        history.append({"role": "user", "content": message})
+        history.append({"role": "assistant", "content": reply})
+
+        result = {
+            "response": reply,
+            "session_id": session_id,
+            "context_used": len(context_chunks) > 0,
+            "cached": cached,
+        }
+
+        if enable_lead_qualification:
+            result["lead_score"] = self._analyze_lead_quality(message, history)
+
+        return result
 
     def generate_summary(self, session_id: str) -> str:
         history = self.get_conversation(session_id)
@@ -175,7 +266,10 @@ Conversation:
 Provide a short, clear summary:"""
 
         try:
-            response = self.model.generate_content(summary_prompt)
+            response = self.dispatcher.call(
+                lambda: self.model.generate_content(summary_prompt), lane="background",
+                name="llm.summary", prompt_chars=len(summary_prompt)
+            )
             return response.text.strip()
         except Exception as e:
             return f"Summary generation failed: {str(e)}"
@@ -192,5 +286,21 @@ Provide a short, clear summary:"""
         }
 
 
-def create_ai_assistant(knowledge_base) -> ChimeraAI:
-    return ChimeraAI(knowledge_base)
+class StreamingReply:
+    # Iterable of reply chunks; `result` holds the generate_response dict once exhausted.
+    def __init__(self, chunks: Iterator[str], finish):
+        self._chunks = chunks
+        self._finish = finish
+        self.result: Optional[Dict[str, any]] = None
+
+    def __iter__(self) -> Iterator[str]:
+        parts = []
+        for chunk in self._chunks:
+            parts.append(chunk)
+            yield chunk
+        # History and cache are only updated once the whole reply has arrived.
+        self.result = self._finish("".join(parts))
+
+
+def create_ai_assistant(knowledge_base, tenant_id: str = DEFAULT_TENANT) -> ChimeraAI:
+    return ChimeraAI(knowledge_base, tenant_id=tenant_id)
@@ -0,0 +1,61 @@
+"""
+benchmarks/bench_ann.py
+
+Recall@3 against the exact flat index plus p50/p99 single-query latency for
+each index type at 10k, 100k and 1M synthetic 384-d vectors.
+
+    python -m benchmarks.bench_ann [--sizes 10000 100000 1000000] [--queries 500]
+"""
+
+import argparse
+
+import faiss
+import numpy as np
+
+from benchmarks.common import Timer, percentiles, print_table, synthetic_vectors
+from core.vector_index import INDEX_TYPES, IndexConfig, create_index
+
+
+def recall_at_k(truth: np.ndarray, found: np.ndarray) -> float:
+    hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+    return hits / truth.size
+
+
+def run(sizes, n_queries: int, k: int, nprobe: int, ef_search: int):
+    rows = []
+    for size in sizes:
+        vectors = synthetic_vectors(size, seed=size)
+        queries = synthetic_vectors(n_queries, seed=size + 1)
+        truth = None
+        for kind in INDEX_TYPES:
+            config = IndexConfig(kind=kind, train_threshold=0, nprobe=nprobe, ef_search=ef_search)
+            with Timer() as build:
+                index = create_index(vectors, config)
+            latencies = []
+            found = np.empty((n_queries, k), dtype="int64")
+            for i in range(n_queries):
+                with Timer() as t:
+                    _, ids = index.search(queries[i:i + 1], k)
+                latencies.append(1000 * t.elapsed)
+                found[i] = ids[0]
+            if kind == "flat":
+                truth = found.copy()
+            stats = percentiles(latencies)
+            rows.append([size, kind, build.elapsed, recall_at_k(truth, found), stats["p50"], stats["p99"]])
+            del index
+    print_table(
+        f"ANN index comparison (k={k}, nprobe={nprobe}, efSearch={ef_search}, threads={faiss.omp_get_max_threads()})",
+        ["vectors", "index", "build_s", f"recall@{k}", "p50_ms", "p99_ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--ef-search", type=int, default=64)
+    args = parser.parse_args()
+    run(args.sizes, args.queries, args.k, args.nprobe, args.ef_search)
@@ -0,0 +1,127 @@
+"""
+benchmarks/bench_async_graph.py
+
+Turn throughput of the sync supervisor graph vs the async one, using a stub
+chat model with a fixed latency in place of Gemini (conversation + stylist =
+two calls per turn). The sync graph runs turns one after another, as a
+worker does today; the async graph runs N sessions concurrently on a single
+event loop with asyncio.gather. Agent logging is suppressed during the runs.
+Both go through the LLM dispatcher, so async throughput is bounded by
+CHIMERA_LLM_MAX_IN_FLIGHT / latency.
+
+    python -m benchmarks.bench_async_graph [--latency-ms 100] [--sync-turns 10] [--concurrency 1 10 100 500]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+
+import core.response_cache as response_cache
+from benchmarks.common import Timer, load_encoder, percentiles, print_table, synthetic_chunks
+from core.graph import arun_turn, build_async_supervisor_graph, build_supervisor_graph, initial_state
+from core.knowledge_base import KnowledgeBase
+from core.llm_clients import get_llm_provider
+from core.llm_dispatch import get_llm_dispatcher
+
+REPLY = (
+    "Chimera connects to HubSpot and Salesforce out of the box, and the Growth "
+    "plan adds webhooks for everything else."
+)
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FixedLatencyChatModel:
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        time.sleep(self.latency)
+        return _Message(REPLY)
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return _Message(REPLY)
+
+
+def _state(i: int):
+    return initial_state(
+        f"bench-{i}",
+        # Demo request: routes through the scheduler and into phase 2, so the stylist runs too.
+        [{"role": "user", "content": f"Can we book a demo to see the CRM sync? ({i})"}],
+        brand_profile={"tone": "friendly", "voice": "helpful"},
+    )
+
+
+def run_sync(graph, turns: int):
+    latencies = []
+    with Timer() as total:
+        for i in range(turns):
+            with Timer() as t:
+                graph.invoke(_state(i))
+            latencies.append(1000 * t.elapsed)
+    return latencies, total.elapsed
+
+
+async def run_async(graph, sessions: int):
+    async def one(i):
+        start = time.perf_counter()
+        await arun_turn(graph, _state(i))
+        return 1000 * (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one(i) for i in range(sessions)))
+    return list(latencies), time.perf_counter() - start
+
+
+def run(latency_ms: float, sync_turns: int, concurrency):
+    kb = KnowledgeBase(model=load_encoder("hash"))
+    kb.add_chunks(synthetic_chunks(2000))
+
+    model = FixedLatencyChatModel(latency_ms)
+    provider = get_llm_provider()
+    provider.chat_model = lambda *args, **kwargs: model
+    # Every session asks a near-identical first question; keep the reply cache
+    # out of it so each turn really makes both calls.
+    response_cache.RESPONSE_CACHE_ENABLED = False
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        sync_graph = build_supervisor_graph(kb)
+        async_graph = build_async_supervisor_graph(kb)
+
+        model.calls = 0
+        latencies, elapsed = run_sync(sync_graph, sync_turns)
+        calls_per_turn = model.calls / sync_turns
+        stats = percentiles(latencies)
+        rows.append(["sync (sequential)", sync_turns, sync_turns / elapsed, stats["p50"], stats["p99"]])
+
+        for sessions in concurrency:
+            latencies, elapsed = asyncio.run(run_async(async_graph, sessions))
+            stats = percentiles(latencies)
+            rows.append([f"async x{sessions}", sessions, sessions / elapsed, stats["p50"], stats["p99"]])
+
+    del provider.chat_model
+    print_table(
+        f"Supervisor graph turns (stub LLM {latency_ms:.0f} ms/call, {calls_per_turn:.0f} calls/turn, "
+        f"max {get_llm_dispatcher().max_in_flight} LLM calls in flight)",
+        ["path", "turns", "turns_per_s", "p50_ms", "p99_ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--sync-turns", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100, 500])
+    args = parser.parse_args()
+    run(args.latency_ms, args.sync_turns, args.concurrency)
@@ -0,0 +1,134 @@
+"""
+benchmarks/bench_audit_log.py
+
+Audit overhead per turn: the 5 StateFilter calls of a demo+email turn, for
+sessions of 10, 100 and 1000 messages, with
+  legacy    - len(str(filtered_state)) + 4 prints (stdout to /dev/null)
+  off       - CHIMERA_AUDIT_MODE=off
+  buffered  - ring buffer + background JSONL writer (default)
+  sync      - compliance-strict tenant: write + fsync in the calling thread
+Checks afterwards that every buffered/sync event reached the file, and that
+rotation keeps the configured number of backups.
+
+    python -m benchmarks.bench_audit_log [--sizes 10 100 1000] [--turns 200]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import core.audit_log as audit_log
+from benchmarks.common import Timer, percentiles, print_table
+from core.graph import initial_state
+from core.state_filter import StateFilter
+
+FILTERS = [
+    StateFilter.for_conversation_agent,
+    StateFilter.for_lead_agent,
+    StateFilter.for_scheduler_agent,
+    StateFilter.for_stylist_agent,
+    StateFilter.for_compliance_agent,
+]
+
+
+def legacy_log_access(agent_name, filtered_state, full_state=None):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    fields = list(filtered_state.keys())
+    data_size = len(str(filtered_state))
+
+    print(f"[SECURITY AUDIT] {timestamp}")
+    print(f"  Agent: {agent_name}")
+    print(f"  Fields accessed: {fields}")
+    print(f"  Data size: {data_size} bytes")
+
+
+def session_state(n_messages: int, audit_mode: str):
+    messages = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i}: " + "enterprise plan details " * 8}
+        for i in range(n_messages)
+    ]
+    state = initial_state(
+        "bench", messages,
+        brand_profile={"tone": "friendly", "voice": "helpful"},
+        tenant_config={"tenant_id": "bench", "audit_mode": audit_mode},
+    )
+    state["entities"] = {"email": "sam@acme.io"}
+    return state
+
+
+def time_turns(state, turns: int):
+    latencies = []
+    for _ in range(turns):
+        with Timer() as t:
+            for build in FILTERS:
+                build(state)
+        latencies.append(1000 * t.elapsed)
+    return latencies
+
+
+def count_lines(path: str) -> int:
+    total = 0
+    for name in os.listdir(os.path.dirname(path)):
+        if name.startswith(os.path.basename(path)):
+            with open(os.path.join(os.path.dirname(path), name), encoding="utf-8") as f:
+                for line in f:
+                    json.loads(line)
+                    total += 1
+    return total
+
+
+def check_rotation(directory: str):
+    path = os.path.join(directory, "rotate", "audit.jsonl")
+    sink = audit_log.AuditSink(path=path, max_bytes=4096, backups=2)
+    for i in range(500):
+        sink.record({"event": "state_access", "i": i}, sync=i % 50 == 0)
+    sink.close()
+    files = sorted(os.listdir(os.path.dirname(path)))
+    assert files == ["audit.jsonl", "audit.jsonl.1", "audit.jsonl.2"], files
+
+
+def run(sizes, turns: int):
+    original_log_access = StateFilter._log_access
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state_access.jsonl")
+        audit_log._sink = audit_log.AuditSink(path=path)
+        expected_events = 0
+
+        for n in sizes:
+            for mode in ("legacy", "off", "buffered", "sync"):
+                state = session_state(n, "sync" if mode == "sync" else "buffered")
+                audit_log.AUDIT_MODE = "off" if mode == "off" else "buffered"
+                if mode == "legacy":
+                    StateFilter._log_access = staticmethod(legacy_log_access)
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    latencies = time_turns(state, turns)
+                StateFilter._log_access = original_log_access
+                if mode in ("buffered", "sync"):
+                    expected_events += turns * len(FILTERS)
+                stats = percentiles(latencies)
+                rows.append([n, mode, sum(latencies) / turns, stats["p50"], stats["p99"]])
+
+        audit_log.AUDIT_MODE = "buffered"
+        sink = audit_log._sink
+        sink.close()
+        assert sink.dropped == 0 and count_lines(path) == expected_events, (sink.stats(), expected_events)
+        check_rotation(directory)
+
+    print_table(
+        f"Audit overhead per turn ({len(FILTERS)} agent state filters, {turns} turns)",
+        ["messages", "audit", "mean_ms", "p50_ms", "p99_ms"],
+        rows,
+    )
+    print(f"{expected_events} events written and parsed back; rotation kept 2 backups")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+    run(args.sizes, args.turns)
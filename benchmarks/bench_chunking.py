@@ -0,0 +1,94 @@
+"""
+benchmarks/bench_chunking.py
+
+Chunking throughput (MB/s) over a synthetic multi-MB PDF-like document, and
+the resulting chunk sizes: mean/max tokens per chunk, the mean and p95 top-n
+prompt context, and how many one-line answers survive. Compares the old
+blank-line splitter with TextChunker.
+
+    python -m benchmarks.bench_chunking [--mb 8] [--max-tokens 200] [--overlap 32]
+"""
+
+import argparse
+import random
+from typing import List
+
+import numpy as np
+
+from benchmarks.common import WORDS, Timer, print_table
+from core.chunker import TextChunker, count_tokens
+
+LEGACY_MIN_CHARS = 40
+ANSWER = "Yes, the Pro plan includes it."
+
+
+def legacy_split(text: str) -> List[str]:
+    return [c.strip() for c in text.split("\n\n") if c.strip() and len(c.strip()) > LEGACY_MIN_CHARS]
+
+
+def synthetic_document(megabytes: float, seed: int = 0) -> List[str]:
+    # Pages mix normal paragraphs, short one-line answers and long unbroken
+    # walls of text, with hard line wraps the way PDF extraction returns them.
+    rng = random.Random(seed)
+    pages, size = [], 0
+    while size < megabytes * 2**20:
+        paragraphs = []
+        for _ in range(rng.randint(3, 8)):
+            kind = rng.random()
+            if kind < 0.2:
+                paragraphs.append(ANSWER)
+                continue
+            n_sentences = rng.randint(15, 40) if kind > 0.85 else rng.randint(2, 6)
+            sentences = [
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 24))).capitalize() + "."
+                for _ in range(n_sentences)
+            ]
+            words = " ".join(sentences).split(" ")
+            paragraphs.append("\n".join(" ".join(words[i:i + 12]) for i in range(0, len(words), 12)))
+        page = "\n\n".join(paragraphs)
+        pages.append(page)
+        size += len(page)
+    return pages
+
+
+def run(megabytes: float, max_tokens: int, overlap: int, min_tokens: int, top_n: int):
+    pages = synthetic_document(megabytes)
+    total_chars = sum(len(p) for p in pages)
+    total_mb = total_chars / 2**20
+    answers = sum(p.count(ANSWER) for p in pages)
+    chunker = TextChunker(max_tokens=max_tokens, overlap_tokens=overlap, min_tokens=min_tokens)
+
+    rows = []
+    for name, split in [
+        ("split(\\n\\n)", lambda: [c for page in pages for c in legacy_split(page)]),
+        ("TextChunker", lambda: list(chunker.chunk_stream(pages))),
+    ]:
+        with Timer() as t:
+            chunks = split()
+        tokens = np.array([count_tokens(c) for c in chunks])
+        kept_answers = sum(c.count(ANSWER) for c in chunks)
+        # Expected context size of n chunks drawn from the index.
+        prompts = np.random.default_rng(0).choice(tokens, size=(2000, top_n)).sum(axis=1)
+        rows.append([
+            name, t.elapsed, total_mb / t.elapsed, len(chunks), tokens.mean(), int(tokens.max()),
+            prompts.mean(), np.percentile(prompts, 95), int((tokens > 256).sum()),
+            # Overlap can repeat an answer, so cap at 1.
+            min(1.0, kept_answers / answers),
+        ])
+    print_table(
+        f"Chunking {total_mb:.1f} MB ({len(pages)} pages, max_tokens={max_tokens}, overlap={overlap})",
+        ["splitter", "seconds", "MB_per_s", "chunks", "mean_tok", "max_tok", f"top{top_n}_mean_tok",
+         f"top{top_n}_p95_tok", "over_256", "answers_kept"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=float, default=8)
+    parser.add_argument("--max-tokens", type=int, default=200)
+    parser.add_argument("--overlap", type=int, default=32)
+    parser.add_argument("--min-tokens", type=int, default=8)
+    parser.add_argument("--top-n", type=int, default=3)
+    args = parser.parse_args()
+    run(args.mb, args.max_tokens, args.overlap, args.min_tokens, args.top_n)
@@ -0,0 +1,69 @@
+"""
+benchmarks/bench_cold_start.py
+
+Compares process start-up paths for a corpus of N chunks:
+encode-and-build (no snapshot), load-and-mmap (unchanged snapshot), the
+same load reading the index into memory, and a partial refresh where 5% of the chunks changed since the snapshot.
+
+    python -m benchmarks.bench_cold_start [--encoder hash|minilm] [--sizes 10000 50000]
+"""
+
+import argparse
+import shutil
+import tempfile
+
+from benchmarks.common import Timer, load_encoder, print_table, synthetic_chunks
+from core.knowledge_base import KnowledgeBase
+
+
+def run(sizes, encoder_name: str):
+    rows = []
+    for size in sizes:
+        docs = synthetic_chunks(size, seed=size)
+        snapshot = tempfile.mkdtemp(prefix="kb_snapshot_")
+        try:
+            encoder = load_encoder(encoder_name)
+            with Timer() as build:
+                kb = KnowledgeBase(model=encoder)
+                kb.sync(docs)
+            kb.save_snapshot(snapshot)
+
+            encoder = load_encoder(encoder_name)
+            with Timer() as load:
+                kb = KnowledgeBase(model=encoder)
+                kb.sync(docs, snapshot_dir=snapshot)
+            with Timer() as first_query:
+                kb.search("enterprise pricing plan", n=3)
+            encoded_on_load = encoder.encoded - 1 if hasattr(encoder, "encoded") else "-"
+            with Timer() as copy_load:
+                KnowledgeBase(model=encoder).load_snapshot(snapshot, mmap=False)
+
+            changed = list(docs)
+            for i in range(0, size, 20):
+                changed[i] = changed[i] + " (updated)"
+            encoder = load_encoder(encoder_name)
+            with Timer() as refresh:
+                kb = KnowledgeBase(model=encoder)
+                kb.sync(changed, snapshot_dir=snapshot)
+            encoded_on_refresh = encoder.encoded if hasattr(encoder, "encoded") else "-"
+        finally:
+            shutil.rmtree(snapshot, ignore_errors=True)
+
+        rows.append([
+            size, build.elapsed, load.elapsed, copy_load.elapsed, 1000 * first_query.elapsed,
+            encoded_on_load, refresh.elapsed, encoded_on_refresh,
+        ])
+    print_table(
+        f"Cold start ({encoder_name} encoder)",
+        ["chunks", "build_s", "mmap_load_s", "copy_load_s", "first_query_ms", "encoded_on_load",
+         "refresh_5pct_s", "encoded_on_refresh"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--encoder", default="hash", choices=["hash", "minilm"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    args = parser.parse_args()
+    run(args.sizes, args.encoder)
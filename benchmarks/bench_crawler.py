@@ -0,0 +1,90 @@
+"""
+benchmarks/bench_crawler.py
+
+Crawls a generated fixture site served by a local threaded http.server and
+reports pages/sec at different concurrency levels. A per-request delay
+stands in for real network latency.
+
+    python -m benchmarks.bench_crawler [--pages 500] [--latency-ms 20] [--concurrency 1 4 16]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.common import Timer, WORDS, print_table
+from utils.web_crawler import WebCrawler
+
+
+def build_site(root: str, pages: int):
+    for i in range(pages):
+        body = "".join(
+            f"<p>Page {i} section {s}: " + " ".join(WORDS[(i + s * 5 + k) % len(WORDS)] for k in range(20)) + "</p>"
+            for s in range(4)
+        )
+        links = "".join(f'<a href="/page{(i * 7 + j) % pages}.html">next</a>' for j in range(1, 4))
+        with open(os.path.join(root, f"page{i}.html"), "w") as f:
+            f.write(f"<html><body><nav>{links}</nav><main><h1>Page {i}</h1>{body}</main></body></html>")
+    with open(os.path.join(root, "sitemap.xml"), "w") as f:
+        f.write("<urlset>" + "".join(f"<url><loc>{{base}}/page{i}.html</loc></url>" for i in range(pages)) + "</urlset>")
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(root: str, latency: float):
+    handler = type("Handler", (SlowHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(pages: int, latency_ms: float, concurrency_levels):
+    root = tempfile.mkdtemp(prefix="crawl_site_")
+    build_site(root, pages)
+    server = serve(root, latency_ms / 1000)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    with open(os.path.join(root, "sitemap.xml")) as f:
+        sitemap = f.read().replace("{base}", base)
+    with open(os.path.join(root, "sitemap.xml"), "w") as f:
+        f.write(sitemap)
+
+    rows = []
+    try:
+        for seeds, label in (([f"{base}/page0.html"], "links"), ([f"{base}/sitemap.xml"], "sitemap")):
+            for concurrency in concurrency_levels:
+                crawler = WebCrawler(max_pages=pages, max_depth=pages, concurrency=concurrency, per_host=concurrency)
+                with Timer() as t:
+                    fetched = sum(1 for _ in crawler.crawl(seeds))
+                rows.append([label, concurrency, fetched, len(crawler.errors), t.elapsed, fetched / t.elapsed])
+    finally:
+        server.shutdown()
+        shutil.rmtree(root, ignore_errors=True)
+    print_table(
+        f"Crawler throughput ({pages} pages, {latency_ms:.0f} ms server latency)",
+        ["seed", "concurrency", "pages", "errors", "seconds", "pages_per_s"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+    run(args.pages, args.latency_ms, args.concurrency)
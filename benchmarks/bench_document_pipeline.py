@@ -0,0 +1,79 @@
+"""
+benchmarks/bench_document_pipeline.py
+
+Pages/sec for PDF ingestion through the streaming pipeline, serial vs a
+process pool, plus peak traced Python memory. The PDF is generated here so
+the benchmark needs nothing beyond the app's own dependencies.
+
+    python -m benchmarks.bench_document_pipeline [--pages 2000] [--workers 1 4]
+"""
+
+import argparse
+import io
+import os
+import tracemalloc
+
+from benchmarks.common import HashingEncoder, Timer, WORDS, print_table
+from core.knowledge_base import KnowledgeBase
+from utils.document_pipeline import ingest_stream, pdf_page_stream
+
+
+def build_pdf(pages: int, paragraphs_per_page: int = 6) -> bytes:
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for p in range(pages):
+        lines = []
+        y = 760
+        for para in range(paragraphs_per_page):
+            words = " ".join(WORDS[(p * 7 + para * 3 + k) % len(WORDS)] for k in range(14))
+            lines.append(f"BT /F1 10 Tf 40 {y} Td (Page {p} paragraph {para}: {words}) Tj ET")
+            y -= 40
+        stream = "\n".join(lines).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def run(pages: int, worker_counts):
+    data = build_pdf(pages)
+    rows = []
+    for workers in worker_counts:
+        kb = KnowledgeBase(model=HashingEncoder())
+        tracemalloc.start()
+        with Timer() as t:
+            total, units = pdf_page_stream(data, workers=workers)
+            chunks = ingest_stream(kb, units, total, {"source": "bench.pdf", "type": "pdf"})
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append([pages, workers, chunks, t.elapsed, pages / t.elapsed, peak / 2**20])
+    print_table(
+        f"PDF pipeline throughput ({len(data) / 2**20:.1f} MB PDF, hash encoder)",
+        ["pages", "workers", "chunks", "seconds", "pages_per_s", "peak_py_mb"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=2_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+    run(args.pages, args.workers)
@@ -0,0 +1,119 @@
+"""
+benchmarks/bench_fused_generation.py
+
+A/B of the two generation modes on the sync supervisor graph, with a stub
+chat model that charges a fixed latency per call. "two_pass" drafts in the
+conversation agent and rewrites in the brand stylist; "fused" puts the brand
+tone/voice into the conversation prompt and skips the stylist. Reports LLM
+calls, prompt tokens and latency per turn.
+
+Also asserts that in both modes the final reply still goes through
+compliance_agent (tests/test_generation_modes.py covers the same check):
+the stub's reply carries an SSN, which must come out redacted with an
+ssn_removed flag.
+
+    python -m benchmarks.bench_fused_generation [--turns 30] [--latency-ms 300]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import core.response_cache as response_cache
+from benchmarks.common import Timer, load_encoder, percentiles, print_table, synthetic_chunks
+from core.chunker import count_tokens
+from core.graph import build_supervisor_graph, initial_state
+from core.knowledge_base import KnowledgeBase
+from core.llm_clients import get_llm_provider
+
+REPLY = (
+    "Thanks Sam! Growth includes the HubSpot and Salesforce sync and webhooks, "
+    "and for the record your reference is 123-45-6789."
+)
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FixedLatencyChatModel:
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+        self.stylist_calls = 0
+        self.prompt_tokens = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        self.prompt_tokens += count_tokens(prompt)
+        time.sleep(self.latency)
+        if prompt.startswith("Rewrite this message"):
+            # Stylist: keep the facts, change the wording.
+            self.stylist_calls += 1
+            return _Message(prompt.split("Original: ", 1)[1].split("\n", 1)[0] + " Looking forward to it!")
+        return _Message(REPLY)
+
+
+def run_mode(graph, model, mode: str, turns: int):
+    model.calls = model.stylist_calls = model.prompt_tokens = 0
+    latencies = []
+    for i in range(turns):
+        state = initial_state(
+            f"{mode}-{i}",
+            # Lead with an email: reaches phase 2 and, unlike a demo request, keeps the LLM's reply.
+            [{"role": "user", "content": f"I'm sam{i}@acme.io, what does the Growth plan include?"}],
+            brand_profile={"tone": "friendly", "voice": "confident"},
+            tenant_config={"tenant_id": "bench", "generation_mode": mode},
+        )
+        with Timer() as t:
+            final = graph.invoke(state)
+        latencies.append(1000 * t.elapsed)
+
+        assert "123-45-6789" not in final["sanitized_output"], final["sanitized_output"]
+        assert "[REDACTED]" in final["sanitized_output"]
+        assert "ssn_removed" in final["compliance_flags"]
+
+    if mode == "fused":
+        assert model.stylist_calls == 0, "stylist ran in fused mode"
+    else:
+        assert model.stylist_calls == turns
+    return latencies, model.calls / turns, model.prompt_tokens / turns
+
+
+def run(turns: int, latency_ms: float):
+    kb = KnowledgeBase(model=load_encoder("hash"))
+    kb.add_chunks(synthetic_chunks(1000))
+
+    model = FixedLatencyChatModel(latency_ms)
+    provider = get_llm_provider()
+    provider.chat_model = lambda *args, **kwargs: model
+    cache_enabled, response_cache.RESPONSE_CACHE_ENABLED = response_cache.RESPONSE_CACHE_ENABLED, False
+
+    rows = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            graph = build_supervisor_graph(kb)
+            for mode in ("two_pass", "fused"):
+                latencies, calls, prompt_tokens = run_mode(graph, model, mode, turns)
+                stats = percentiles(latencies)
+                rows.append([mode, calls, prompt_tokens, stats["p50"], stats["p99"]])
+    finally:
+        del provider.chat_model
+        response_cache.RESPONSE_CACHE_ENABLED = cache_enabled
+
+    print_table(
+        f"Generation modes ({turns} lead turns, stub LLM {latency_ms:.0f} ms/call)",
+        ["mode", "llm_calls_per_turn", "prompt_tokens_per_turn", "p50_ms", "p99_ms"],
+        rows,
+    )
+    print("compliance_agent redacted the reply in both modes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    args = parser.parse_args()
+    run(args.turns, args.latency_ms)
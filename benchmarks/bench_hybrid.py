@@ -0,0 +1,69 @@
+"""
+benchmarks/bench_hybrid.py
+
+BM25 inverted-index build time and memory, query latency for dense vs
+hybrid retrieval, and hit@n for exact-match (SKU style) queries.
+
+    python -m benchmarks.bench_hybrid [--encoder hash|minilm] [--sizes 10000 50000]
+"""
+
+import argparse
+import random
+import tracemalloc
+
+from benchmarks.common import Timer, load_encoder, percentiles, print_table, synthetic_chunks
+from core.knowledge_base import KnowledgeBase
+from core.lexical_index import BM25Index
+
+
+def sku_corpus(size: int, seed: int):
+    rng = random.Random(seed)
+    chunks = synthetic_chunks(size, seed=seed)
+    skus = {}
+    for i in rng.sample(range(size), min(200, size)):
+        sku = f"SKU-{rng.randint(10000, 99999)}-{rng.choice('ABCDEFGH')}"
+        chunks[i] = f"{chunks[i]} Part number {sku} ships with the enterprise plan."
+        skus[sku] = i
+    return chunks, skus
+
+
+def run(sizes, encoder: str, n: int):
+    build_rows, query_rows = [], []
+    for size in sizes:
+        chunks, skus = sku_corpus(size, seed=size)
+
+        tracemalloc.start()
+        with Timer() as build:
+            lexical = BM25Index()
+            lexical.add_many(chunks)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        build_rows.append([size, build.elapsed, current / 2**20, len(lexical._postings)])
+
+        kb = KnowledgeBase(model=load_encoder(encoder))
+        kb.add_chunks(chunks)
+        for mode in ("dense", "hybrid"):
+            latencies, hits = [], 0
+            for sku, row in skus.items():
+                with Timer() as t:
+                    results = kb.search(f"do you stock {sku}", n=n, mode=mode)
+                latencies.append(1000 * t.elapsed)
+                hits += chunks[row] in results
+            stats = percentiles(latencies)
+            query_rows.append([size, mode, hits / len(skus), stats["p50"], stats["p99"]])
+
+    print_table("BM25 index build", ["chunks", "build_s", "memory_mb", "terms"], build_rows)
+    print_table(
+        f"Exact-match retrieval ({encoder} encoder, n={n})",
+        ["chunks", "mode", f"hit@{n}", "p50_ms", "p99_ms"],
+        query_rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--encoder", default="hash", choices=["hash", "minilm"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--n", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.encoder, args.n)
@@ -0,0 +1,49 @@
+"""
+benchmarks/bench_ingest.py
+
+Ingests 1k, 10k and 50k chunks into KnowledgeBase in fixed-size batches and
+reports per-chunk cost for the first and last batch. With append-only
+indexing the two should stay flat as the corpus grows.
+
+    python -m benchmarks.bench_ingest [--encoder hash|minilm] [--batch 200]
+"""
+
+import argparse
+
+from benchmarks.common import Timer, load_encoder, print_table, synthetic_chunks
+from core.knowledge_base import KnowledgeBase
+
+
+def run(sizes, batch: int, encoder: str):
+    rows = []
+    for size in sizes:
+        kb = KnowledgeBase(model=load_encoder(encoder))
+        chunks = synthetic_chunks(size, seed=size)
+        batch_costs = []
+        with Timer() as total:
+            for start in range(0, size, batch):
+                part = chunks[start:start + batch]
+                with Timer() as t:
+                    kb.add_text("\n\n".join(part), {"source": "bench", "type": "text"})
+                batch_costs.append(t.elapsed / len(part))
+        rows.append([
+            size,
+            total.elapsed,
+            1000 * total.elapsed / size,
+            1000 * batch_costs[0],
+            1000 * batch_costs[-1],
+        ])
+    print_table(
+        f"Append-only ingestion ({encoder} encoder, batch={batch})",
+        ["chunks", "total_s", "ms/chunk", "first_batch_ms/chunk", "last_batch_ms/chunk"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--encoder", default="hash", choices=["hash", "minilm"])
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args()
+    run(args.sizes, args.batch, args.encoder)
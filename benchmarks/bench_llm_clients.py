@@ -0,0 +1,138 @@
+"""
+benchmarks/bench_llm_clients.py
+
+Per-turn client overhead against a local fake LLM endpoint (HTTP/1.1,
+keep-alive, fixed think time). A turn makes two calls, conversation then
+stylist, as in the graph. Compares building a fresh client per call with
+the pooled LLMClientProvider, and counts TCP connections the server saw.
+If langchain_google_genai is installed, the real ChatGoogleGenerativeAI
+constructor is timed as well.
+
+    python -m benchmarks.bench_llm_clients [--turns 300] [--think-ms 0]
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from benchmarks.common import Timer, percentiles, print_table
+from core.llm_clients import LLMClientProvider
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # One write per response and no Nagle; otherwise delayed ACKs add ~40 ms on reused connections.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    connections = 0
+    think_seconds = 0.0
+    _lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with FakeLLMHandler._lock:
+            FakeLLMHandler.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.think_seconds:
+            time.sleep(self.think_seconds)
+        body = json.dumps({"candidates": [{"content": "Chimera connects to HubSpot and Salesforce."}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeChatClient:
+    # Stands in for a Gemini chat client: session, auth headers and pool set up in the constructor.
+    def __init__(self, base_url: str, model: str, temperature: float, api_key: str):
+        self.url = f"{base_url}/v1beta/models/{model}:generateContent"
+        self.temperature = temperature
+        self.session = requests.Session()
+        self.session.headers.update({"x-goog-api-key": api_key, "Content-Type": "application/json"})
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+    def invoke(self, prompt: str) -> str:
+        payload = {"contents": [{"parts": [{"text": prompt}]}], "generationConfig": {"temperature": self.temperature}}
+        response = self.session.post(self.url, json=payload, timeout=10)
+        response.raise_for_status()
+        return response.json()["candidates"][0]["content"]
+
+
+def run_turns(base_url: str, turns: int, pooled: bool):
+    provider = LLMClientProvider()
+    FakeLLMHandler.connections = 0
+    latencies = []
+
+    def client(temperature: float) -> FakeChatClient:
+        factory = lambda: FakeChatClient(base_url, "gemini-2.0-flash", temperature, "test-key")
+        if pooled:
+            return provider.get(("fake", "gemini-2.0-flash", temperature), factory)
+        return factory()
+
+    for i in range(turns):
+        with Timer() as t:
+            reply = client(0.7).invoke(f"visitor question {i}")
+            client(0.3).invoke(f"restyle: {reply}")
+        latencies.append(1000 * t.elapsed)
+    return latencies, FakeLLMHandler.connections
+
+
+def real_constructor_ms(samples: int = 20):
+    try:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+    except ImportError:
+        return None
+    with Timer() as t:
+        for _ in range(samples):
+            ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.7, google_api_key="test-key")
+    return 1000 * t.elapsed / samples
+
+
+def run(turns: int, think_ms: float):
+    FakeLLMHandler.think_seconds = think_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        rows = []
+        baseline = None
+        for pooled in (False, True):
+            latencies, connections = run_turns(base_url, turns, pooled)
+            stats = percentiles(latencies)
+            mean = sum(latencies) / len(latencies)
+            baseline = mean if baseline is None else baseline
+            rows.append([
+                "pooled" if pooled else "per_call", turns, connections, mean, stats["p50"], stats["p99"],
+                baseline - mean,
+            ])
+        print_table(
+            f"LLM client overhead per turn (2 calls/turn, fake endpoint think={think_ms:.0f} ms)",
+            ["clients", "turns", "tcp_connections", "mean_ms", "p50_ms", "p99_ms", "saved_ms_per_turn"],
+            rows,
+        )
+        constructor = real_constructor_ms()
+        if constructor is None:
+            print("langchain_google_genai not installed; real constructor cost not measured")
+        else:
+            print(f"ChatGoogleGenerativeAI() construction: {constructor:.2f} ms each, 2 per turn before pooling")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=300)
+    parser.add_argument("--think-ms", type=float, default=0)
+    args = parser.parse_args()
+    run(args.turns, args.think_ms)
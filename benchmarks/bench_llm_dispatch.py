@@ -0,0 +1,119 @@
+"""
+benchmarks/bench_llm_dispatch.py
+
+Peak-traffic burst against a fake provider with a requests-per-second quota.
+Over quota it answers 429 and the caller backs off and retries, the way the
+Gemini client does. Compares sessions calling the provider directly with
+sessions going through LLMDispatcher, which is configured at the quota.
+A share of the sessions are hot leads (priority lane), and a share ask the
+same canned question at the same moment (coalesced into one call).
+
+    python -m benchmarks.bench_llm_dispatch [--sessions 300] [--quota 60] [--latency-ms 200] [--hot 0.1] [--duplicate 0.3]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import deque
+
+from benchmarks.common import percentiles, print_table
+from core.llm_dispatch import LLMDispatcher, use_lane
+
+BACKOFF_S = 1.0
+MAX_RETRIES = 8
+
+
+class RateLimited(Exception):
+    pass
+
+
+class FakeQuotaProvider:
+    def __init__(self, quota_per_s: int, latency_ms: float):
+        self.quota = quota_per_s
+        self.latency = latency_ms / 1000
+        self.window = deque()
+        self.calls = 0
+        self.rejected = 0
+
+    async def generate(self, prompt: str) -> str:
+        now = time.monotonic()
+        while self.window and now - self.window[0] >= 1.0:
+            self.window.popleft()
+        if len(self.window) >= self.quota:
+            self.rejected += 1
+            await asyncio.sleep(0.02)
+            raise RateLimited()
+        self.window.append(now)
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return f"reply to {prompt}"
+
+
+async def with_retries(provider: FakeQuotaProvider, prompt: str) -> str:
+    for attempt in range(MAX_RETRIES):
+        try:
+            return await provider.generate(prompt)
+        except RateLimited:
+            await asyncio.sleep(BACKOFF_S * (1.5 ** attempt) * random.uniform(0.5, 1.0))
+    raise RuntimeError("gave up after retries")
+
+
+async def burst(sessions, provider: FakeQuotaProvider, dispatcher=None):
+    async def one(prompt: str, lane: str):
+        start = time.perf_counter()
+        if dispatcher is None:
+            await with_retries(provider, prompt)
+        else:
+            with use_lane(lane):
+                await dispatcher.acall(lambda: with_retries(provider, prompt), key=prompt)
+        return lane, 1000 * (time.perf_counter() - start)
+
+    results = await asyncio.gather(*(one(prompt, lane) for prompt, lane in sessions))
+    by_lane = {"hot": [], "normal": []}
+    for lane, ms in results:
+        by_lane[lane].append(ms)
+    return by_lane
+
+
+def run(n_sessions: int, quota: int, latency_ms: float, hot: float, duplicate: float):
+    rng = random.Random(7)
+    sessions = []
+    for i in range(n_sessions):
+        prompt = "What does the Growth plan cost?" if rng.random() < duplicate else f"question {i}"
+        sessions.append((prompt, "hot" if rng.random() < hot else "normal"))
+
+    rows = []
+    for name in ("direct", "dispatcher"):
+        random.seed(11)
+        provider = FakeQuotaProvider(quota, latency_ms)
+        dispatcher = None
+        if name == "dispatcher":
+            in_flight = max(1, int(quota * latency_ms / 1000))
+            dispatcher = LLMDispatcher(rate_per_s=quota, burst=max(1, quota // 10), max_in_flight=in_flight)
+        by_lane = asyncio.run(burst(sessions, provider, dispatcher))
+        everyone = percentiles(by_lane["hot"] + by_lane["normal"])
+        hot_stats = percentiles(by_lane["hot"]) if by_lane["hot"] else {"p50": 0.0, "p99": 0.0}
+        stats = dispatcher.stats() if dispatcher else {}
+        rows.append([
+            name, provider.calls, provider.rejected, stats.get("coalesced", 0), stats.get("max_queue_depth", 0),
+            everyone["p50"], everyone["p99"], hot_stats["p50"], hot_stats["p99"],
+        ])
+
+    print_table(
+        f"Burst of {n_sessions} sessions, provider quota {quota}/s, {latency_ms:.0f} ms/call, "
+        f"{hot:.0%} hot, {duplicate:.0%} duplicate prompt",
+        ["path", "provider_calls", "429s", "coalesced", "max_queue", "p50_ms", "p99_ms", "hot_p50_ms", "hot_p99_ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--quota", type=int, default=60)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--hot", type=float, default=0.1)
+    parser.add_argument("--duplicate", type=float, default=0.3)
+    args = parser.parse_args()
+    run(args.sessions, args.quota, args.latency_ms, args.hot, args.duplicate)
@@ -0,0 +1,114 @@
+"""
+benchmarks/bench_parallel_agents.py
+
+Supervisor "parallel" mode with injected agent latency (standing in for CRM
+lookups and calendar APIs). Runs the phase-1 pass for a demo request with an
+email, which routes lead_agent + scheduler_agent in parallel, three ways:
+serial, thread pool (sync supervisor) and asyncio tasks (async supervisor).
+Checks that all three merge to the same state, with both agents' analytics
+events appended in routing order, and that phase 2 still runs the stylist
+before compliance.
+
+    python -m benchmarks.bench_parallel_agents [--passes 20] [--lead-ms 120] [--scheduler-ms 80]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import io
+import time
+
+import agents.lead_agent
+import agents.scheduler_agent
+import agents.stylist_agent
+from agents import supervisor_agent as supervisor
+from benchmarks.common import Timer, percentiles, print_table
+from core.graph import initial_state
+
+
+def with_latency(fn, seconds: float):
+    @functools.wraps(fn)
+    def slow(state):
+        time.sleep(seconds)
+        return fn(state)
+    return slow
+
+
+def phase_1_state():
+    state = initial_state(
+        "bench",
+        [{"role": "user", "content": "We need a demo this week, budget approved. sam@acme.io"}],
+    )
+    state["current_intent"] = "demo"
+    state["entities"] = {"email": "sam@acme.io", "company": "Acme", "timeline": "urgent"}
+    return state
+
+
+def serial(state, names):
+    for name in names:
+        state = supervisor.call_agent_filtered(state, name)
+    return state
+
+
+def fingerprint(state):
+    return (
+        state["lead_status"],
+        state["provisional_reply"],
+        [event["event"] for event in state["analytics_events"]],
+    )
+
+
+def run(passes: int, lead_ms: float, scheduler_ms: float):
+    agents.lead_agent.lead_qualification_agent = with_latency(agents.lead_agent.lead_qualification_agent, lead_ms / 1000)
+    agents.scheduler_agent.scheduler_agent = with_latency(agents.scheduler_agent.scheduler_agent, scheduler_ms / 1000)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        routing = supervisor.phase_1_initial_analysis(phase_1_state())
+    assert routing["mode"] == "parallel", routing
+    names = routing["agents"]
+    assert supervisor.plan_waves(names) == [names]
+    assert supervisor.plan_waves(["stylist_agent", "compliance_agent"]) == [["stylist_agent"], ["compliance_agent"]]
+
+    paths = {
+        "serial": lambda: serial(phase_1_state(), names),
+        "thread_pool": lambda: supervisor.call_agents_parallel_filtered(phase_1_state(), names),
+        "asyncio": lambda: asyncio.run(supervisor.acall_agents_parallel_filtered(phase_1_state(), names)),
+    }
+
+    rows = []
+    expected = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, path in paths.items():
+            latencies = []
+            for _ in range(passes):
+                with Timer() as t:
+                    state = path()
+                latencies.append(1000 * t.elapsed)
+                expected = expected or fingerprint(state)
+                assert fingerprint(state) == expected, (name, fingerprint(state), expected)
+            stats = percentiles(latencies)
+            rows.append([name, " + ".join(names), stats["p50"], stats["p99"]])
+
+        # Phase 2 is routed "parallel" too, but compliance must see the stylist's output.
+        state = phase_1_state()
+        state["provisional_reply"] = "Your code is 123-45-6789, and the demo is booked for Tuesday morning."
+        agents.stylist_agent.brand_stylist_agent = lambda s: {"sanitized_output": s["provisional_reply"] + " Cheers!"}
+        state = supervisor.call_agents_parallel_filtered(state, ["stylist_agent", "compliance_agent"])
+        assert state["sanitized_output"].endswith("Cheers!") and "[REDACTED]" in state["sanitized_output"]
+
+    print_table(
+        f"Supervisor parallel mode ({passes} passes, lead {lead_ms:.0f} ms, scheduler {scheduler_ms:.0f} ms)",
+        ["path", "agents", "p50_ms", "p99_ms"],
+        rows,
+    )
+    print(f"merged events (all paths): {expected[2]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--passes", type=int, default=20)
+    parser.add_argument("--lead-ms", type=float, default=120)
+    parser.add_argument("--scheduler-ms", type=float, default=80)
+    args = parser.parse_args()
+    run(args.passes, args.lead_ms, args.scheduler_ms)
@@ -0,0 +1,84 @@
+"""
+benchmarks/bench_response_cache.py
+
+Replays a stream of first-turn visitor questions (a handful of intents with
+casing, punctuation and filler variations) through retrieval + the semantic
+response cache, with a fake LLM of fixed latency. Reports hit rate, LLM calls
+avoided, mean turn time and the cache lookup overhead at several thresholds.
+A mid-stream ingest checks that KB changes invalidate cached replies.
+
+    python -m benchmarks.bench_response_cache [--encoder hash|minilm] [--visitors 2000] [--llm-ms 900]
+"""
+
+import argparse
+import random
+
+from benchmarks.common import Timer, load_encoder, print_table, synthetic_chunks
+from core.knowledge_base import KnowledgeBase
+from core.response_cache import SemanticResponseCache, lookup_reply
+
+QUESTIONS = [
+    "how much does chimera cost",
+    "what does chimera do",
+    "does chimera integrate with hubspot",
+    "can i book a demo",
+    "is there a free trial",
+    "do you support salesforce",
+    "what languages does the assistant speak",
+    "how do i add my website to the knowledge base",
+]
+PREFIXES = ["", "", "hi ", "hello, ", "hey there "]
+SUFFIXES = ["", "?", "??", " please", "!"]
+
+
+def visitor_question(rng: random.Random) -> str:
+    # Skewed towards the first few intents, like real landing-page traffic.
+    base = QUESTIONS[min(int(rng.expovariate(0.5)), len(QUESTIONS) - 1)]
+    text = rng.choice(PREFIXES) + base + rng.choice(SUFFIXES)
+    return text.upper() if rng.random() < 0.1 else text
+
+
+def run(encoder: str, visitors: int, llm_ms: float, thresholds):
+    kb = KnowledgeBase(model=load_encoder(encoder))
+    kb.add_chunks(synthetic_chunks(2_000) + [f"Chimera answer sheet: {q}." for q in QUESTIONS])
+    rows = []
+    for threshold in thresholds:
+        cache = SemanticResponseCache(threshold=threshold)
+        rng = random.Random(0)
+        llm_calls = 0
+        lookup_s = 0.0
+        stale_hits = 0
+        for i in range(visitors):
+            if i == visitors // 2:
+                kb.add_text(f"Pricing update {threshold}: every plan now includes a free onboarding session.")
+            question = visitor_question(rng)
+            chunks = kb.search(question, n=3)
+            with Timer() as t:
+                cached, key = lookup_reply(cache, kb, "bench:conversation", question, chunks)
+            lookup_s += t.elapsed
+            if cached is None:
+                llm_calls += 1
+                cache.put(*key, f"reply@{kb.cache_token}")
+            elif not cached.endswith(kb.cache_token):
+                stale_hits += 1
+        stats = cache.stats()
+        turn_ms = (llm_calls * llm_ms + 1000 * lookup_s) / visitors
+        rows.append([
+            threshold, stats["hit_rate"], llm_calls, visitors - llm_calls, stats["invalidated"], stale_hits,
+            turn_ms, 1e6 * lookup_s / visitors,
+        ])
+    print_table(
+        f"Semantic response cache ({encoder} encoder, {visitors} first turns, fake LLM {llm_ms:.0f} ms)",
+        ["threshold", "hit_rate", "llm_calls", "avoided", "invalidated", "stale_hits", "mean_turn_ms", "lookup_us"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--encoder", default="hash", choices=["hash", "minilm"])
+    parser.add_argument("--visitors", type=int, default=2_000)
+    parser.add_argument("--llm-ms", type=float, default=900)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.9, 0.95, 0.98])
+    args = parser.parse_args()
+    run(args.encoder, args.visitors, args.llm_ms, args.thresholds)
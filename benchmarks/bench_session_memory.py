@@ -0,0 +1,82 @@
+"""
+benchmarks/bench_session_memory.py
+
+Resident memory as browser sessions scale, comparing one KnowledgeBase (and
+embedding model) per session against the process-wide registry. Each
+configuration runs in a fresh subprocess so RSS numbers do not bleed over.
+
+    python -m benchmarks.bench_session_memory [--encoder minilm|hash] [--sessions 1 10 50]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.common import print_table
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(mode: str, sessions: int, chunks: int, encoder: str):
+    from benchmarks.common import load_encoder, synthetic_chunks
+    from core import knowledge_base
+    from core.knowledge_base import KnowledgeBase, get_knowledge_base
+
+    if encoder == "hash":
+        knowledge_base._shared_model = load_encoder("hash")
+    corpus = synthetic_chunks(chunks)
+    baseline = rss_mb()
+    held = []
+    for _ in range(sessions):
+        if mode == "per_session":
+            kb = KnowledgeBase(model=load_encoder(encoder))
+            kb.add_chunks(corpus)
+        else:
+            kb = get_knowledge_base("bench")
+            if not kb.get_count():
+                kb.add_chunks(corpus)
+        held.append(kb)
+    print(json.dumps({"baseline_mb": baseline, "rss_mb": rss_mb(), "models": len({id(k.model) for k in held})}))
+
+
+def run(session_counts, chunks: int, encoder: str):
+    rows = []
+    for sessions in session_counts:
+        for mode in ("per_session", "shared"):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_session_memory", "--child", mode,
+                 "--sessions", str(sessions), "--chunks", str(chunks), "--encoder", encoder],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(out)
+            grown = result["rss_mb"] - result["baseline_mb"]
+            rows.append([sessions, mode, result["models"], result["rss_mb"], grown, grown / sessions])
+    print_table(
+        f"RSS vs sessions ({encoder} encoder, {chunks} chunks per KB)",
+        ["sessions", "mode", "models", "rss_mb", "growth_mb", "mb_per_session"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--encoder", default="minilm", choices=["hash", "minilm"])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--chunks", type=int, default=2_000)
+    parser.add_argument("--child", choices=["per_session", "shared"])
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.sessions[0], args.chunks, args.encoder)
+    else:
+        run(args.sessions, args.chunks, args.encoder)
@@ -0,0 +1,132 @@
+"""
+benchmarks/bench_state_views.py
+
+Cost of isolating agent state: the old copy.deepcopy filters vs the
+read-only views StateFilter hands out now. For sessions of 10, 100 and 1000
+messages it times the filters a demo+email turn builds (conversation, lead,
+scheduler, stylist, compliance). Views pay a little on access instead, so
+the extra cost of one agent-side read of the transcript (extract_entities)
+through a view is shown separately. "session" replays the filters over a
+whole conversation growing 2 messages per turn, where deepcopy is quadratic
+overall. Audit logging is switched off here so only the isolation
+step is measured. Also checks that views reject writes.
+
+    python -m benchmarks.bench_state_views [--sizes 10 100 1000] [--repeats 20]
+"""
+
+import argparse
+import copy
+
+from benchmarks.common import Timer, percentiles, print_table
+from core.graph import initial_state
+from core.state_filter import StateFilter
+from utils.entity_extractor import extract_entities
+
+
+def deepcopy_filters(full_state):
+    # StateFilter as it was: every agent call deep-copies what it hands out.
+    return [
+        {"session_id": full_state["session_id"], "messages": copy.deepcopy(full_state["messages"]),
+         "brand_profile": copy.deepcopy(full_state["brand_profile"])},
+        {"entities": copy.deepcopy(full_state["entities"]), "messages": copy.deepcopy(full_state["messages"])},
+        {"entities": copy.deepcopy(full_state["entities"]), "current_intent": full_state["current_intent"]},
+        {"provisional_reply": full_state["provisional_reply"], "brand_profile": copy.deepcopy(full_state["brand_profile"])},
+        {"sanitized_output": full_state["sanitized_output"]},
+    ]
+
+
+def view_filters(full_state):
+    return [
+        StateFilter.for_conversation_agent(full_state),
+        StateFilter.for_lead_agent(full_state),
+        StateFilter.for_scheduler_agent(full_state),
+        StateFilter.for_stylist_agent(full_state),
+        StateFilter.for_compliance_agent(full_state),
+    ]
+
+
+def session_state(n_messages: int):
+    messages = []
+    for i in range(n_messages):
+        role = "user" if i % 2 == 0 else "assistant"
+        messages.append({"role": role, "content": f"Message {i}: " + "tell me more about the enterprise plan " * 5})
+    state = initial_state(
+        "bench", messages,
+        brand_profile={"tone": "friendly", "voice": "helpful", "keywords": ["fast", "secure", "simple"]},
+    )
+    state["entities"] = {"email": "sam@acme.io", "company": "Acme Inc"}
+    return state
+
+
+def turn_ms(state, filters, repeats: int):
+    with Timer() as t:
+        for _ in range(repeats):
+            filters(state)
+    return 1000 * t.elapsed / repeats
+
+
+def read_overhead_ms(state, repeats: int):
+    # Interleaved, median of each: the regex work dominates and is noisy.
+    view = StateFilter.for_lead_agent(state)["messages"]
+    plain, viewed = [], []
+    for _ in range(repeats):
+        for messages, samples in ((state["messages"], plain), (view, viewed)):
+            with Timer() as t:
+                extract_entities(messages)
+            samples.append(1000 * t.elapsed)
+    return percentiles(viewed)["p50"] - percentiles(plain)["p50"]
+
+
+def session_ms(n_messages: int, filters):
+    full = session_state(n_messages)
+    # The transcript is append-only, so each turn sees a longer prefix of the same list.
+    states = [dict(full, messages=full["messages"][:length]) for length in range(2, n_messages + 1, 2)]
+    with Timer() as t:
+        for state in states:
+            filters(state)
+    return 1000 * t.elapsed
+
+
+def check_isolation():
+    state = session_state(4)
+    view = StateFilter.for_lead_agent(state)
+    for attempt in (
+        lambda: view["messages"].append({"role": "user", "content": "x"}),
+        lambda: view["messages"][0].__setitem__("content", "tampered"),
+        lambda: view["entities"].__setitem__("email", "evil@example.com"),
+    ):
+        try:
+            attempt()
+        except (TypeError, AttributeError):
+            continue
+        raise AssertionError("view accepted a write")
+    assert state["messages"][0]["content"].startswith("Message 0") and state["entities"]["email"] == "sam@acme.io"
+
+
+def run(sizes, repeats: int):
+    StateFilter._log_access = staticmethod(lambda *args: None)
+    check_isolation()
+
+    rows = []
+    for n in sizes:
+        state = session_state(n)
+        copied = turn_ms(state, deepcopy_filters, repeats)
+        viewed = turn_ms(state, view_filters, repeats)
+        copied_session = session_ms(n, deepcopy_filters)
+        viewed_session = session_ms(n, view_filters)
+        rows.append([n, copied, viewed, copied / viewed, read_overhead_ms(state, repeats), copied_session, viewed_session])
+
+    print_table(
+        "Agent state isolation per turn (5 filters)",
+        ["messages", "deepcopy_ms", "views_ms", "speedup", "view_read_overhead_ms", "session_deepcopy_ms", "session_views_ms"],
+        rows,
+    )
+    print("views rejected every write; full state unchanged")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.repeats)
@@ -0,0 +1,65 @@
+"""
+benchmarks/bench_storage.py
+
+Resident vector memory, p50/p99 single-query latency and recall@3 for each
+vector storage mode, per index type. The knowledge base keeps no numpy copy
+next to the index, so the index is the whole footprint; "vs_float32" compares
+it with a plain float32 matrix of the same vectors.
+
+    python -m benchmarks.bench_storage [--size 100000] [--kinds flat hnsw] [--queries 500]
+"""
+
+import argparse
+
+import faiss
+import numpy as np
+
+from benchmarks.bench_ann import recall_at_k
+from benchmarks.common import Timer, percentiles, print_table, synthetic_vectors
+from core.vector_index import STORAGE_TYPES, IndexConfig, create_index, index_memory_bytes
+
+
+def run(size: int, kinds, n_queries: int, k: int):
+    vectors = synthetic_vectors(size, seed=size)
+    queries = synthetic_vectors(n_queries, seed=size + 1)
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+    del exact
+
+    rows = []
+    for kind in kinds:
+        for storage in STORAGE_TYPES:
+            config = IndexConfig(kind=kind, storage=storage, train_threshold=0)
+            with Timer() as build:
+                index = create_index(vectors, config)
+            # The only copy the knowledge base keeps; _get_vectors reconstructs from it.
+            resident_bytes = index_memory_bytes(index)
+            latencies = []
+            found = np.empty((n_queries, k), dtype="int64")
+            for i in range(n_queries):
+                with Timer() as t:
+                    _, ids = index.search(queries[i:i + 1], k)
+                latencies.append(1000 * t.elapsed)
+                found[i] = ids[0]
+            stats = percentiles(latencies)
+            rows.append([
+                kind, storage, build.elapsed, resident_bytes / 2**20, resident_bytes / vectors.nbytes,
+                recall_at_k(truth, found), stats["p50"], stats["p99"],
+            ])
+            del index
+    print_table(
+        f"Vector storage comparison ({size} x {vectors.shape[1]}-d, k={k})",
+        ["index", "storage", "build_s", "resident_mb", "vs_float32", f"recall@{k}", "p50_ms", "p99_ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--kinds", nargs="+", default=["flat", "hnsw"])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+    run(args.size, args.kinds, args.queries, args.k)
@@ -0,0 +1,86 @@
+"""
+benchmarks/bench_streaming.py
+
+Time-to-first-chunk vs time-to-full-reply for ChimeraAI, using a fake Gemini
+model that emits tokens at a fixed rate after a fixed first-token delay.
+The blocking generate_response only shows text once the whole reply is done;
+generate_response_stream shows the first chunk after roughly the model's
+first-token latency. Also checks the streamed reply lands in history.
+
+    python -m benchmarks.bench_streaming [--turns 20] [--first-token-ms 400] [--token-ms 15] [--tokens 80]
+"""
+
+import argparse
+import time
+
+from benchmarks.common import Timer, load_encoder, percentiles, print_table, synthetic_chunks
+from core.knowledge_base import KnowledgeBase
+from core.response_cache import SemanticResponseCache
+
+
+class _Part:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeStreamingModel:
+    def __init__(self, first_token_ms: float, token_ms: float, tokens: int):
+        self.first_token = first_token_ms / 1000
+        self.per_token = token_ms / 1000
+        self.tokens = tokens
+
+    def _parts(self):
+        time.sleep(self.first_token)
+        for i in range(self.tokens):
+            if i:
+                time.sleep(self.per_token)
+            yield _Part(f"tok{i} ")
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        if stream:
+            return self._parts()
+        return _Part("".join(p.text for p in self._parts()))
+
+
+def run(turns: int, first_token_ms: float, token_ms: float, tokens: int):
+    from ai import ChimeraAI
+
+    kb = KnowledgeBase(model=load_encoder("hash"))
+    kb.add_chunks(synthetic_chunks(500))
+    ai = ChimeraAI(kb, response_cache=SemanticResponseCache(max_entries=0))
+    ai.model = FakeStreamingModel(first_token_ms, token_ms, tokens)
+
+    blocking, first_chunk, full = [], [], []
+    for i in range(turns):
+        with Timer() as t:
+            ai.generate_response(f"question {i}", f"blocking-{i}")
+        blocking.append(1000 * t.elapsed)
+
+        start = time.perf_counter()
+        stream = ai.generate_response_stream(f"question {i}", f"stream-{i}")
+        for n, _ in enumerate(stream):
+            if n == 0:
+                first_chunk.append(1000 * (time.perf_counter() - start))
+        full.append(1000 * (time.perf_counter() - start))
+        assert ai.get_conversation(f"stream-{i}")[-1]["content"] == stream.result["response"]
+
+    rows = []
+    for name, visible, done in [("generate_response", blocking, blocking), ("generate_response_stream", first_chunk, full)]:
+        v, d = percentiles(visible), percentiles(done)
+        rows.append([name, v["p50"], v["p99"], d["p50"], d["p99"]])
+    print_table(
+        f"Reply latency ({turns} turns, fake model: first token {first_token_ms:.0f} ms, "
+        f"{tokens} tokens x {token_ms:.0f} ms)",
+        ["path", "first_text_p50_ms", "first_text_p99_ms", "full_reply_p50_ms", "full_reply_p99_ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--first-token-ms", type=float, default=400)
+    parser.add_argument("--token-ms", type=float, default=15)
+    parser.add_argument("--tokens", type=int, default=80)
+    args = parser.parse_args()
+    run(args.turns, args.first_token_ms, args.token_ms, args.tokens)
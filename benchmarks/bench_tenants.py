@@ -0,0 +1,76 @@
+"""
+benchmarks/bench_tenants.py
+
+Many tenants, one process: builds a snapshot per tenant, then replays a
+Zipf-skewed stream of (tenant, query) requests through the tenant manager at
+several memory budgets. Reports hit rate, loads/evictions, load time and
+get+search latency, and the resident footprint against the budget.
+
+    python -m benchmarks.bench_tenants [--tenants 200] [--chunks 500] [--budgets-mb 16 64 256]
+"""
+
+import argparse
+import shutil
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import Timer, load_encoder, percentiles, print_table, synthetic_chunks
+from core import knowledge_base
+from core.knowledge_base import KnowledgeBase, tenant_snapshot_dir
+from core.tenant_manager import TenantKnowledgeBaseManager
+
+
+def build_snapshots(root: str, tenants: int, chunks: int):
+    for t in range(tenants):
+        kb = KnowledgeBase()
+        # Skewed corpus sizes: a few large brands, a long tail of small ones.
+        kb.add_chunks(synthetic_chunks(max(20, chunks // (1 + t % 10)), seed=t), {"source": f"tenant-{t}"})
+        kb.save_snapshot(tenant_snapshot_dir(root, f"tenant-{t}"))
+
+
+def run(tenants: int, chunks: int, requests: int, budgets_mb, zipf: float):
+    knowledge_base._shared_model = load_encoder("hash")
+    root = tempfile.mkdtemp(prefix="chimera-tenants-")
+    try:
+        with Timer() as build:
+            build_snapshots(root, tenants, chunks)
+        rng = np.random.default_rng(0)
+        stream = (rng.zipf(zipf, size=requests) - 1) % tenants
+        queries = synthetic_chunks(64, seed=10_000)
+
+        rows = []
+        for budget in budgets_mb:
+            manager = TenantKnowledgeBaseManager(snapshot_root=root, memory_budget_bytes=budget * 2**20)
+            latencies = []
+            peak = 0
+            for i, t in enumerate(stream):
+                with Timer() as timer:
+                    manager.get(f"tenant-{t}").search(queries[i % len(queries)], n=3)
+                latencies.append(1000 * timer.elapsed)
+                peak = max(peak, manager.stats()["resident_bytes"])
+            stats = manager.stats()
+            lat = percentiles(latencies)
+            rows.append([
+                budget, stats["resident_tenants"], peak / 2**20, stats["hit_rate"], stats["loads"],
+                stats["evictions"], stats["avg_load_ms"], lat["p50"], lat["p99"],
+            ])
+        print(f"built {tenants} tenant snapshots in {build.elapsed:.1f}s")
+        print_table(
+            f"Tenant LRU ({tenants} tenants, {requests} requests, zipf a={zipf})",
+            ["budget_mb", "resident", "peak_mb", "hit_rate", "loads", "evictions", "avg_load_ms", "p50_ms", "p99_ms"],
+            rows,
+        )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tenants", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--budgets-mb", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--zipf", type=float, default=1.3)
+    args = parser.parse_args()
+    run(args.tenants, args.chunks, args.requests, args.budgets_mb, args.zipf)
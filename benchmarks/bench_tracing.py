@@ -0,0 +1,168 @@
+"""
+benchmarks/bench_tracing.py
+
+Observability cost and output. Part 1 times sync graph turns with an instant
+LLM and fixed retrieval (so only orchestration remains) under every mix of
+log level and trace mode, interleaved in rounds to even out noise; "debug"
+emits every line the old prints did, to /dev/null as under a process
+manager. Part 2 runs turns against a real (hash-encoded) KB and a stub LLM
+with a fixed latency and prints the per-span p50/p99 the tracer collects out
+of the box, then checks that the span file parses as OTLP/JSON with agent
+spans nested under graph nodes, and that /metrics serves Prometheus text.
+
+    python -m benchmarks.bench_tracing [--turns 300] [--latency-ms 20]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import time
+import urllib.request
+
+import core.response_cache as response_cache
+import core.tracing as tracing
+from benchmarks.common import Timer, load_encoder, percentiles, print_table, synthetic_chunks
+from core.graph import build_supervisor_graph, initial_state
+from core.knowledge_base import KnowledgeBase
+from core.llm_clients import get_llm_provider
+from core.log import LOG_LEVEL, set_log_level
+
+MESSAGES = [
+    "What integrations do you support?",
+    "Can we book a demo next week?",
+    "Book a demo for me, sam@acme.io, we need it urgently",
+    "Please email me the details at lee@globex.com",
+]
+
+REPLY = "Chimera syncs with HubSpot and Salesforce and ships a webhook API for anything else you use."
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FixedLatencyChatModel:
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+
+    def invoke(self, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+        return _Message(REPLY)
+
+
+class FixedContextKB:
+    def search(self, query, n=3, **kwargs):
+        return [f"Chimera documentation chunk {i}." for i in range(n)]
+
+
+def run_turns(graph, turns: int, vary: bool = False):
+    latencies = []
+    for i in range(turns):
+        message = MESSAGES[i % len(MESSAGES)]
+        state = initial_state(
+            f"bench-{i}",
+            # vary=True makes every query new, so it is embedded rather than served from the query cache.
+            [{"role": "user", "content": f"{message} (ref {i})" if vary else message}],
+            brand_profile={"tone": "friendly", "voice": "helpful"},
+        )
+        with Timer() as t:
+            graph.invoke(state)
+        latencies.append(1000 * t.elapsed)
+    return latencies
+
+
+def check_spans(path: str):
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            for resource in json.loads(line)["resourceSpans"]:
+                for scope in resource["scopeSpans"]:
+                    spans.extend(scope["spans"])
+    kinds = {}
+    for record in spans:
+        attributes = {a["key"]: a["value"] for a in record["attributes"]}
+        kinds[record["spanId"]] = attributes["chimera.kind"]["stringValue"]
+    orphans = [
+        record for record in spans
+        if kinds[record["spanId"]] == "agent" and kinds.get(record.get("parentSpanId")) != "node"
+    ]
+    assert spans and not orphans, f"{len(orphans)} agent spans outside a graph node"
+    return len(spans)
+
+
+def check_metrics_endpoint():
+    server = tracing.start_metrics_server(0, host="127.0.0.1")
+    url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+    body = urllib.request.urlopen(url, timeout=5).read().decode("utf-8")
+    assert 'chimera_span_duration_seconds_count{kind="agent",name="lead_agent"}' in body, body[:500]
+    assert 'chimera_llm_tokens_total{name="llm.conversation",direction="output"}' in body, body[:500]
+    return url
+
+
+def run(turns: int, latency_ms: float, rounds: int = 10):
+    kb = KnowledgeBase(model=load_encoder("hash"))
+    kb.add_chunks(synthetic_chunks(2000))
+    model = FixedLatencyChatModel(0)
+    provider = get_llm_provider()
+    provider.chat_model = lambda *args, **kwargs: model
+    # Identical first questions would otherwise be answered from the reply cache.
+    response_cache.RESPONSE_CACHE_ENABLED = False
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory, \
+            open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        graph = build_supervisor_graph(FixedContextKB(), supervisor_mode="planned")
+        run_turns(graph, 20)  # compile plans, warm caches
+
+        configs = [(level, mode) for level in ("debug", "info", "off") for mode in ("off", "metrics", "on")]
+        tracers = {
+            (level, mode): tracing.Tracer(mode=mode, path=os.path.join(directory, f"{level}-{mode}.jsonl"))
+            for level, mode in configs
+        }
+        latencies = {config: [] for config in configs}
+        for _ in range(rounds):
+            for level, mode in configs:
+                set_log_level(level)
+                tracing._tracer = tracers[(level, mode)]
+                latencies[(level, mode)] += run_turns(graph, turns // rounds)
+        for config in configs:
+            tracers[config].close()
+            stats = percentiles(latencies[config])
+            rows.append([*config, sum(latencies[config]) / len(latencies[config]), stats["p50"], stats["p99"]])
+
+        set_log_level("off")
+        model.latency = latency_ms / 1000
+        graph = build_supervisor_graph(kb, supervisor_mode="planned")
+        span_path = os.path.join(directory, "spans.jsonl")
+        tracer = tracing._tracer = tracing.Tracer(mode="on", path=span_path)
+        run_turns(graph, max(20, turns // 10), vary=True)
+        tracer.close()
+        exported = check_spans(span_path)
+        url = check_metrics_endpoint()
+    set_log_level(LOG_LEVEL)
+    del provider.chat_model
+
+    print_table(
+        f"Per-turn cost of logging and tracing ({turns} turns, instant LLM, planned supervisor)",
+        ["log_level", "trace", "mean_ms", "p50_ms", "p99_ms"],
+        rows,
+    )
+    summary = tracer.latency_summary()
+    print_table(
+        f"Latency by span (stub LLM {latency_ms:.0f} ms/call)",
+        ["span", "count", "p50_ms", "p99_ms", "errors"],
+        [[name, s["count"], s["p50_ms"], s["p99_ms"], s["errors"]] for name, s in summary.items()],
+    )
+    print(f"{exported} spans exported as OTLP/JSON, every agent span nested in a node span; {url} OK")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+    run(args.turns, args.latency_ms)
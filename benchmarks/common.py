@@ -0,0 +1,102 @@
+"""
+benchmarks/common.py
+
+Shared helpers for the benchmark scripts. Run any benchmark from the repo
+root as a module, e.g. ``python -m benchmarks.bench_ingest``.
+"""
+
+import random
+import time
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+WORDS = (
+    "chimera assistant pricing plan enterprise starter growth demo schedule "
+    "integration crm hubspot salesforce webhook api latency onboarding team "
+    "analytics dashboard report export security compliance sso audit brand "
+    "voice tone widget website visitor lead qualify budget timeline support "
+    "knowledge base document upload pdf docx crawl index search answer"
+).split()
+
+
+class HashingEncoder:
+    """Deterministic, model-free stand-in for SentenceTransformer.encode.
+
+    Lets the benchmarks measure indexing/search overhead without the cost
+    (and variance) of running MiniLM.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.calls = 0
+        self.encoded = 0
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts, show_progress_bar: bool = False, batch_size: int = 32, **kwargs):
+        self.calls += 1
+        self.encoded += len(texts)
+        out = np.zeros((len(texts), self.dim), dtype="float32")
+        for i, text in enumerate(texts):
+            for token in text.lower().split():
+                out[i, zlib.crc32(token.encode()) % self.dim] += 1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+def load_encoder(name: str):
+    if name == "hash":
+        return HashingEncoder()
+    from sentence_transformers import SentenceTransformer
+    from core.knowledge_base import EMBEDDING_MODEL
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+def synthetic_chunks(n: int, seed: int = 0, words: int = 40) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        f"Chunk {i}: " + " ".join(rng.choice(WORDS) for _ in range(words))
+        for i in range(n)
+    ]
+
+
+def synthetic_vectors(n: int, dim: int = 384, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((64, dim)).astype("float32")
+    labels = rng.integers(0, len(centers), size=n)
+    vectors = centers[labels] + 0.5 * rng.standard_normal((n, dim)).astype("float32")
+    return np.ascontiguousarray(vectors, dtype="float32")
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p99": 0.0}
+    arr = np.asarray(samples)
+    return {"p50": float(np.percentile(arr, 50)), "p99": float(np.percentile(arr, 99))}
+
+
+def print_table(title: str, headers: List[str], rows: List[List]):
+    print(f"\n{title}")
+    widths = [max(len(str(h)), *(len(_fmt(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(_fmt(v).rjust(w) for v, w in zip(row, widths)))
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    return str(value)
@@ -49,6 +49,12 @@ Return JSON:
 }}
 """
 
+# FUSED MODE: brand style applied while drafting, replaces the stylist pass
+FUSED_STYLE_PROMPT = """Brand Style:
+Write the reply in {tone} tone with {voice} voice.
+Apply tone and voice consistently and keep a natural, conversational flow.
+"""
+
 #  BRAND STYLIST PROMPT 
 BRAND_STYLIST_PROMPT = """Rewrite this message in {tone} tone with {voice} voice.
 
@@ -0,0 +1,241 @@
+"""
+core/audit_log.py
+
+Structured audit trail of which agent saw which state fields. Events go into
+an in-memory ring buffer; a background thread drains it in batches to a
+JSONL file that rotates by size. Recording an event is a dict plus a deque
+append, so agent calls no longer pay for stringifying the state and printing.
+
+Tenants that need every access on disk before the agent runs set
+`_tenant_config["audit_mode"] = "sync"`: their events are written and
+fsynced in the calling thread, after anything already buffered so the file
+stays in order. CHIMERA_AUDIT_MODE=off disables auditing entirely.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+from core.log import get_logger
+from core.state_view import FrozenMapping, FrozenSequence, unwrap
+
+AUDIT_MODES = ("buffered", "sync", "off")
+AUDIT_MODE = os.getenv("CHIMERA_AUDIT_MODE", "buffered")
+AUDIT_LOG_PATH = os.getenv("CHIMERA_AUDIT_LOG", os.path.join("audit_logs", "state_access.jsonl"))
+AUDIT_MAX_BYTES = int(os.getenv("CHIMERA_AUDIT_MAX_MB", "50")) * 2**20
+AUDIT_BACKUPS = int(os.getenv("CHIMERA_AUDIT_BACKUPS", "5"))
+AUDIT_BUFFER_EVENTS = int(os.getenv("CHIMERA_AUDIT_BUFFER", "10000"))
+AUDIT_FLUSH_MS = float(os.getenv("CHIMERA_AUDIT_FLUSH_MS", "250"))
+
+SIZE_SAMPLE = 4
+WRITE_CHUNK = 16
+
+log = get_logger(__name__)
+
+
+def estimate_size(value) -> int:
+    # Approximate serialized size in characters. Long sequences (the transcript)
+    # are sampled at SIZE_SAMPLE evenly spaced items and scaled, so the cost is
+    # bounded no matter how long the session gets. Strings are inlined below
+    # because nearly every leaf is one.
+    kind = type(value)
+    if kind is FrozenMapping or kind is FrozenSequence:
+        value = unwrap(value)
+        kind = type(value)
+    if kind is str or kind is bytes:
+        return len(value)
+    if value is None or kind is int or kind is float or kind is bool:
+        return 8
+    if kind is dict:
+        total = 0
+        for key, item in value.items():
+            total += len(key) if type(key) is str else 8
+            total += len(item) if type(item) is str else estimate_size(item)
+        return total
+    if kind is list or kind is tuple or kind is FrozenSequence:
+        n = len(value)
+        if n <= SIZE_SAMPLE:
+            return sum(estimate_size(item) for item in value)
+        step = n / SIZE_SAMPLE
+        sampled = 0
+        for i in range(SIZE_SAMPLE):
+            sampled += estimate_size(value[int(i * step)])
+        return sampled * n // SIZE_SAMPLE
+    return len(str(value)) if isinstance(value, (set, frozenset)) else 64
+
+
+def _json_line(event) -> str:
+    return json.dumps(event, default=str)
+
+
+def audit_mode_for_state(state: Optional[Dict]) -> str:
+    if AUDIT_MODE == "off":
+        return "off"
+    mode = ((state or {}).get("_tenant_config") or {}).get("audit_mode") or AUDIT_MODE
+    if mode not in AUDIT_MODES:
+        raise ValueError(f"unknown audit_mode {mode!r}, expected one of {AUDIT_MODES}")
+    return mode
+
+
+class AuditSink:
+    def __init__(
+        self,
+        path: str = AUDIT_LOG_PATH,
+        max_bytes: int = AUDIT_MAX_BYTES,
+        backups: int = AUDIT_BACKUPS,
+        buffer_events: int = AUDIT_BUFFER_EVENTS,
+        flush_ms: float = AUDIT_FLUSH_MS,
+        thread_name: str = "chimera-audit",
+        encode: Callable[[object], str] = None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_ms / 1000
+        self.thread_name = thread_name
+        # Turns a recorded event into one JSON line; runs on the writer thread.
+        self.encode = encode or _json_line
+        self._buffer = deque(maxlen=buffer_events)
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._writer: Optional[threading.Thread] = None
+        self._file = None
+
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.sync_writes = 0
+
+    def record(self, event: Dict, sync: bool = False):
+        if sync:
+            with self._write_lock:
+                self._write(self._drain() + [event], durable=True)
+                self.sync_writes += 1
+            with self._buffer_lock:
+                self.recorded += 1
+            return
+        with self._buffer_lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                # Ring buffer: under sustained overload the oldest events go first.
+                self.dropped += 1
+            self._buffer.append(event)
+            self.recorded += 1
+        if self._writer is None:
+            self._start_writer()
+
+    def flush(self):
+        with self._write_lock:
+            self._write(self._drain())
+
+    def close(self):
+        self._stopped = True
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _start_writer(self):
+        with self._buffer_lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._writer.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                log.warning("[AUDIT] Write failed: %s", e)
+
+    def _drain(self):
+        with self._buffer_lock:
+            batch = list(self._buffer)
+            self._buffer.clear()
+        return batch
+
+    def _write(self, batch, durable: bool = False):
+        # Write lock held.
+        if not batch:
+            return
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        encode = self.encode
+        for start in range(0, len(batch), WRITE_CHUNK):
+            if start:
+                # Hand the GIL back between chunks so a large batch doesn't stall request threads.
+                time.sleep(0)
+            self._file.write("".join([encode(event) + "\n" for event in batch[start:start + WRITE_CHUNK]]))
+        self._file.flush()
+        if durable:
+            os.fsync(self._file.fileno())
+        self.written += len(batch)
+        self.batches += 1
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def stats(self) -> Dict:
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "buffered": len(self._buffer),
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "sync_writes": self.sync_writes,
+            "path": self.path,
+        }
+
+
+_sink: Optional[AuditSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_audit_sink() -> AuditSink:
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = AuditSink()
+            atexit.register(_sink.close)
+        return _sink
+
+
+def record_state_access(agent_name: str, filtered_state: Dict, full_state: Optional[Dict] = None):
+    mode = audit_mode_for_state(full_state)
+    if mode == "off":
+        return
+    config = ((full_state or {}).get("_tenant_config") or {})
+    get_audit_sink().record({
+        "ts": time.time(),
+        "event": "state_access",
+        "agent": agent_name,
+        "session_id": (full_state or {}).get("session_id"),
+        "tenant_id": config.get("tenant_id"),
+        "fields": list(filtered_state.keys()),
+        "size_estimate": estimate_size(filtered_state),
+    }, sync=mode == "sync")
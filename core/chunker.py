@@ -0,0 +1,159 @@
+"""
+core/chunker.py
+
+Token-budgeted chunking with sentence boundaries and overlap. Text is split
+into paragraphs and sentences, sentences are packed up to `max_tokens`, and
+the tail of each chunk (up to `overlap_tokens`) is repeated at the start of
+the next one. Fragments below `min_tokens` are merged into a neighbour
+rather than dropped. `chunk_stream` carries state across input units, so
+pages of a multi-MB document can be fed through one at a time.
+
+Token counts are a word/punctuation estimate, which tracks the embedding
+model's word-piece count closely enough for budgeting without paying for a
+real tokenizer on every sentence.
+"""
+
+import os
+import re
+from collections import deque
+from typing import Iterable, Iterator, List, Tuple
+
+DEFAULT_MAX_TOKENS = 200
+DEFAULT_OVERLAP_TOKENS = 32
+DEFAULT_MIN_TOKENS = 8
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])")
+_WORD = re.compile(r"\w")
+
+
+def count_tokens(text: str) -> int:
+    return len(_TOKEN.findall(text))
+
+
+class TextChunker:
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+        min_tokens: int = DEFAULT_MIN_TOKENS,
+    ):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be in [0, max_tokens)")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.min_tokens = min_tokens
+
+    @classmethod
+    def from_env(cls) -> "TextChunker":
+        return cls(
+            max_tokens=int(os.getenv("CHIMERA_CHUNK_TOKENS", str(DEFAULT_MAX_TOKENS))),
+            overlap_tokens=int(os.getenv("CHIMERA_CHUNK_OVERLAP", str(DEFAULT_OVERLAP_TOKENS))),
+            min_tokens=int(os.getenv("CHIMERA_CHUNK_MIN_TOKENS", str(DEFAULT_MIN_TOKENS))),
+        )
+
+    def _sentences(self, text: str) -> Iterator[Tuple[str, int, bool]]:
+        # Yields (sentence, tokens, starts_paragraph); PDF line wraps are folded into spaces.
+        for paragraph in _PARAGRAPH.split(text):
+            paragraph = " ".join(paragraph.split())
+            if not paragraph:
+                continue
+            first = True
+            for sentence in _SENTENCE.split(paragraph):
+                tokens = count_tokens(sentence)
+                if tokens > self.max_tokens:
+                    for piece, piece_tokens in self._hard_split(sentence):
+                        yield piece, piece_tokens, first
+                        first = False
+                elif tokens:
+                    yield sentence, tokens, first
+                    first = False
+
+    def _hard_split(self, sentence: str) -> Iterator[Tuple[str, int]]:
+        # A run-on "sentence" (tables, code, missing punctuation) is cut on word boundaries.
+        words, tokens = [], 0
+        for word in sentence.split(" "):
+            n = count_tokens(word)
+            if words and tokens + n > self.max_tokens:
+                yield " ".join(words), tokens
+                words, tokens = [], 0
+            words.append(word)
+            tokens += n
+        if words:
+            yield " ".join(words), tokens
+
+    def chunk_stream(self, units: Iterable[str]) -> Iterator[str]:
+        return merge_small(self._pack(units), self.min_tokens, self.max_tokens)
+
+    def split(self, text: str) -> List[str]:
+        return list(self.chunk_stream([text]))
+
+    def _pack(self, units: Iterable[str]) -> Iterator[Tuple[str, int, str, int]]:
+        # Yields (chunk, tokens, fresh, fresh_tokens) where `fresh` excludes the carried overlap.
+        current: deque = deque()
+        current_tokens = 0
+        fresh = 0  # sentences in `current` that were not carried over as overlap
+
+        for text in units:
+            for item in self._sentences(text):
+                tokens = item[1]
+                if current and current_tokens + tokens > self.max_tokens:
+                    yield self._emit(current, current_tokens, fresh)
+                    # Carry the tail of the chunk forward as overlap.
+                    carried, carried_tokens = deque(), 0
+                    while current and carried_tokens + current[-1][1] <= self.overlap_tokens:
+                        last = current.pop()
+                        carried.appendleft(last)
+                        carried_tokens += last[1]
+                    while carried and carried_tokens + tokens > self.max_tokens:
+                        carried_tokens -= carried.popleft()[1]
+                    current, current_tokens, fresh = carried, carried_tokens, 0
+                current.append(item)
+                current_tokens += tokens
+                fresh += 1
+        if fresh:
+            yield self._emit(current, current_tokens, fresh)
+
+    def _emit(self, current: deque, tokens: int, fresh: int) -> Tuple[str, int, str, int]:
+        parts = list(current)
+        new = parts[len(parts) - fresh:]
+        return _render(parts), tokens, _render(new), sum(p[1] for p in new)
+
+
+def _render(parts) -> str:
+    out = []
+    for sentence, _, starts_paragraph in parts:
+        if out:
+            out.append("\n\n" if starts_paragraph else " ")
+        out.append(sentence)
+    return "".join(out)
+
+
+def merge_small(chunks: Iterable[Tuple[str, int, str, int]], min_tokens: int, max_tokens: int) -> Iterator[str]:
+    # Fragments under min_tokens join the previous chunk while that stays within budget;
+    # otherwise they are kept as-is rather than thrown away. Only the non-overlap part
+    # is appended, so merged text is never repeated.
+    previous, previous_tokens = None, 0
+    for chunk, tokens, fresh, fresh_tokens in chunks:
+        if previous is not None:
+            small = tokens < min_tokens or previous_tokens < min_tokens
+            if small and previous_tokens + fresh_tokens <= max_tokens:
+                previous, previous_tokens = previous + " " + fresh, previous_tokens + fresh_tokens
+                continue
+            yield previous
+        previous, previous_tokens = chunk, tokens
+    if previous is not None and _WORD.search(previous):
+        yield previous
+
+
+_default_chunker = None
+
+
+def default_chunker() -> TextChunker:
+    global _default_chunker
+    if _default_chunker is None:
+        _default_chunker = TextChunker.from_env()
+    return _default_chunker
@@ -0,0 +1,164 @@
+"""
+core/dedup.py
+
+Ingest-time duplicate filtering: exact matches on normalised text, and
+near-duplicates via 64-bit SimHash over word shingles. Candidate lookup uses
+four 16-bit bands, so any fingerprint within 3 bits shares at least one band.
+filter_with_owners() also says which kept chunk each dropped one duplicates,
+so the caller can restore it if that chunk is later removed.
+"""
+
+import hashlib
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEDUP_MODES = ("off", "exact", "near")
+SHINGLE_SIZE = 3
+BANDS = 4
+BAND_BITS = 64 // BANDS
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def dedup_key(text: str) -> str:
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    words = _WORD.findall(text.lower())
+    if len(words) > shingle_size:
+        features = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    else:
+        features = words or [text]
+    digests = b"".join(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest() for f in features)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(len(features), 8), axis=1)
+    # Majority vote per bit position across all shingles.
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 > len(features)
+    return int.from_bytes(np.packbits(votes).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class ChunkDeduplicator:
+    def __init__(self, mode: str = "near", max_hamming: int = 3):
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode '{mode}', expected one of {DEDUP_MODES}")
+        if max_hamming >= BANDS:
+            # Banding only guarantees recall while the threshold is below the band count.
+            raise ValueError(f"max_hamming must be < {BANDS}")
+        self.mode = mode
+        self.max_hamming = max_hamming
+        self._exact: set = set()
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+        # fingerprint -> dedup key of the kept chunk it came from
+        self._owners: Dict[int, str] = {}
+        self.reset_stats()
+
+    @classmethod
+    def from_env(cls) -> "ChunkDeduplicator":
+        return cls(
+            mode=os.getenv("CHIMERA_DEDUP", "near"),
+            max_hamming=int(os.getenv("CHIMERA_DEDUP_MAX_HAMMING", "3")),
+        )
+
+    def reset_stats(self):
+        self.chunks_seen = 0
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+        self.bytes_saved = 0
+
+    def clear(self):
+        self._exact = set()
+        self._bands = [{} for _ in range(BANDS)]
+        self._owners = {}
+
+    def _band_keys(self, fingerprint: int):
+        mask = (1 << BAND_BITS) - 1
+        return [(fingerprint >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+    def _near_match(self, fingerprint: int) -> Optional[int]:
+        for band, key in zip(self._bands, self._band_keys(fingerprint)):
+            for other in band.get(key, ()):
+                if hamming(fingerprint, other) <= self.max_hamming:
+                    return other
+        return None
+
+    def _remember(self, key: str, fingerprint: Optional[int]):
+        self._exact.add(key)
+        if fingerprint is not None:
+            for band, band_key in zip(self._bands, self._band_keys(fingerprint)):
+                band.setdefault(band_key, []).append(fingerprint)
+            self._owners[fingerprint] = key
+
+    def forget(self, chunks: List[str]):
+        # Removed chunks must not block identical text from being re-added later.
+        if self.mode == "off":
+            return
+        for chunk in chunks:
+            key = dedup_key(chunk)
+            self._exact.discard(key)
+            if self.mode == "near":
+                fingerprint = simhash(chunk)
+                for band, band_key in zip(self._bands, self._band_keys(fingerprint)):
+                    bucket = band.get(band_key)
+                    if bucket and fingerprint in bucket:
+                        bucket.remove(fingerprint)
+                if self._owners.get(fingerprint) == key:
+                    del self._owners[fingerprint]
+
+    def prime(self, chunks: List[str]):
+        # Register an existing corpus without counting it in the stats.
+        if self.mode == "off":
+            return
+        for chunk in chunks:
+            self._remember(dedup_key(chunk), simhash(chunk) if self.mode == "near" else None)
+
+    def filter(self, chunks: List[str]) -> List[str]:
+        return self.filter_with_owners(chunks)[0]
+
+    def filter_with_owners(self, chunks: List[str]) -> Tuple[List[str], List[Tuple[str, str]]]:
+        # Returns the kept chunks and, for each dropped one, (chunk, dedup key of the kept chunk it matched).
+        if self.mode == "off":
+            self.chunks_seen += len(chunks)
+            return list(chunks), []
+        kept, dropped = [], []
+        for chunk in chunks:
+            self.chunks_seen += 1
+            key = dedup_key(chunk)
+            if key in self._exact:
+                self.exact_duplicates += 1
+                self.bytes_saved += len(chunk.encode("utf-8"))
+                dropped.append((chunk, key))
+                continue
+            fingerprint = None
+            if self.mode == "near":
+                fingerprint = simhash(chunk)
+                match = self._near_match(fingerprint)
+                if match is not None:
+                    self.near_duplicates += 1
+                    self.bytes_saved += len(chunk.encode("utf-8"))
+                    dropped.append((chunk, self._owners.get(match, key)))
+                    continue
+            self._remember(key, fingerprint)
+            kept.append(chunk)
+        return kept, dropped
+
+    def stats(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "max_hamming": self.max_hamming,
+            "chunks_seen": self.chunks_seen,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "chunks_saved": self.exact_duplicates + self.near_duplicates,
+            "bytes_saved": self.bytes_saved,
+        }
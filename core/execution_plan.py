@@ -0,0 +1,134 @@
+"""
+core/execution_plan.py
+
+Precompiled supervisor routing. The phase rules only look at the intent,
+whether an email is known and the tenant's generation mode, so the multi-pass
+supervisor walk is resolved once per such key into a fixed list of stages and
+cached. A turn then runs all stages inside a single graph node instead of
+looping through the supervisor node once per phase.
+
+CHIMERA_SUPERVISOR_MODE=iterative keeps the original pass-by-pass loop, which
+logs every decision and is easier to follow when debugging routing.
+"""
+
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, NamedTuple, Tuple
+
+from agents.supervisor_agent import (
+    arun_stage,
+    phase_1_initial_analysis,
+    phase_2_result_collection,
+    phase_3_post_processing,
+    run_stage,
+)
+from core.log import get_logger
+from core.state import ChimeraFullState
+from core.tenant_config import generation_mode_for_state
+
+log = get_logger(__name__)
+
+SUPERVISOR_MODES = ("planned", "iterative")
+SUPERVISOR_MODE = os.getenv("CHIMERA_SUPERVISOR_MODE", "planned")
+
+MAX_PASSES = 10
+
+PHASES = {
+    "initial_analysis": phase_1_initial_analysis,
+    "result_collection": phase_2_result_collection,
+    "post_processing": phase_3_post_processing,
+}
+
+
+class ExecutionPlan(NamedTuple):
+    key: Tuple[str, bool, str]
+    # Read-only routing dicts, in the shape run_stage takes.
+    stages: Tuple[MappingProxyType, ...]
+
+    def describe(self) -> str:
+        if not self.stages:
+            return "no agents"
+        parts = []
+        for stage in self.stages:
+            sep = " | " if stage["mode"] == "parallel" else ", "
+            parts.append("[" + sep.join(stage["agents"]) + "]")
+        return " -> ".join(parts)
+
+
+def plan_key(state: Dict) -> Tuple[str, bool, str]:
+    return (
+        state["current_intent"],
+        bool(state["entities"].get("email")),
+        generation_mode_for_state(state),
+    )
+
+
+@lru_cache(maxsize=128)
+def compile_plan(intent: str, has_email: bool, generation_mode: str) -> ExecutionPlan:
+    # Walks the same phases the iterative supervisor would, against a probe state
+    # that only carries the inputs the rules read.
+    probe = {
+        "current_intent": intent,
+        "entities": {"email": "probe"} if has_email else {},
+        "_tenant_config": {"generation_mode": generation_mode},
+    }
+    stages = []
+    phase = "initial_analysis"
+    for _ in range(MAX_PASSES):
+        rule = PHASES.get(phase)
+        if rule is None:
+            break
+        routing = rule(probe)
+        if routing.get("agents") or routing.get("promote_draft"):
+            stages.append(MappingProxyType({
+                "agents": tuple(routing.get("agents", [])),
+                "mode": routing.get("mode", "sequential"),
+                "promote_draft": bool(routing.get("promote_draft")),
+            }))
+        if routing.get("mode") == "done":
+            break
+        phase = routing.get("next_phase", "finalization")
+
+    plan = ExecutionPlan((intent, has_email, generation_mode), tuple(stages))
+    log.info("[PLAN] Compiled %s: %s", plan.key, plan.describe())
+    return plan
+
+
+def plan_for_state(state: Dict) -> ExecutionPlan:
+    return compile_plan(*plan_key(state))
+
+
+def _start(full_state: ChimeraFullState) -> ExecutionPlan:
+    plan = plan_for_state(full_state)
+    log.debug("[SUPERVISOR] Planned execution: %s", plan.describe())
+    return plan
+
+
+def _finish(full_state: ChimeraFullState) -> ChimeraFullState:
+    full_state["supervisor_phase"] = "finalization"
+    full_state["previous_agent"] = "supervisor"
+    full_state["iteration_count"] += 1
+    full_state["next_action"] = "analytics"
+    return full_state
+
+
+def planned_supervisor_agent(full_state: ChimeraFullState) -> ChimeraFullState:
+    plan = _start(full_state)
+    for stage in plan.stages:
+        full_state = run_stage(full_state, stage)
+    return _finish(full_state)
+
+
+async def aplanned_supervisor_agent(full_state: ChimeraFullState) -> ChimeraFullState:
+    plan = _start(full_state)
+    for stage in plan.stages:
+        full_state = await arun_stage(full_state, stage)
+    return _finish(full_state)
+
+
+def resolve_supervisor_mode(mode: str = None) -> str:
+    mode = mode or SUPERVISOR_MODE
+    if mode not in SUPERVISOR_MODES:
+        raise ValueError(f"unknown supervisor mode {mode!r}, expected one of {SUPERVISOR_MODES}")
+    return mode
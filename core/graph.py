@@ -2,28 +2,84 @@
 core/graph_builder.py
 """
 
+import asyncio
+from typing import Dict, List, Optional
+
 from langgraph.graph import StateGraph, END
 from core.state import ChimeraFullState
-from agents.supervisor_agent import supervisor_agent
-from agents.conversation_agent import conversation_agent
+from agents.supervisor_agent import agent_span, supervisor_agent, asupervisor_agent
+from agents.conversation_agent import conversation_agent, aconversation_agent
+from core.execution_plan import aplanned_supervisor_agent, planned_supervisor_agent, resolve_supervisor_mode
+from core.llm_dispatch import lane_for_state, use_lane
+from core.log import get_logger
+from core.tracing import traced_node
+from core.tenant_config import generation_mode_for_state, tenant_id_for_state
+from core.tenant_manager import TenantKnowledgeBaseManager
+
+log = get_logger(__name__)
 
 
-def build_supervisor_graph(knowledge_base):
-    print("\n" + "="*60)
-    print("BUILDING SECURE SUPERVISOR GRAPH")
-    print("="*60 + "\n")
+def build_supervisor_graph(knowledge_base, supervisor_mode: Optional[str] = None):
+    # `knowledge_base` is either a single KB or a TenantKnowledgeBaseManager, in
+    # which case each turn retrieves from the KB of the state's tenant.
+    # `supervisor_mode` is "planned" (one node runs the precompiled plan) or
+    # "iterative" (supervisor loops once per phase); CHIMERA_SUPERVISOR_MODE by default.
+    supervisor_mode = resolve_supervisor_mode(supervisor_mode)
+    log.info("[GRAPH] Building secure supervisor graph (%s)", supervisor_mode)
     
     workflow = StateGraph(ChimeraFullState)
     
     workflow.add_node(
         "conversation",
-        lambda state: conversation_agent_wrapper(state, knowledge_base)
+        traced_node("conversation", lambda state: conversation_agent_wrapper(state, knowledge_base))
     )
     
-    workflow.add_node("supervisor", supervisor_agent)
+    workflow.set_entry_point("conversation")
+    
+    add_supervisor(workflow, supervisor_mode, supervisor_agent, planned_supervisor_agent)
+    
+    compiled = workflow.compile()
+    
+    log.info("[GRAPH] Secure graph compiled")
+    
+    return compiled
+
+
+def build_async_supervisor_graph(knowledge_base, supervisor_mode: Optional[str] = None):
+    # Same topology as build_supervisor_graph, but every node is a coroutine: LLM
+    # calls use ainvoke and KB work runs in worker threads, so one event loop can
+    # carry many sessions. Run turns with `await arun_turn(graph, state)`.
+    supervisor_mode = resolve_supervisor_mode(supervisor_mode)
+    log.info("[GRAPH] Building async supervisor graph (%s)", supervisor_mode)
+    
+    workflow = StateGraph(ChimeraFullState)
+    
+    async def conversation_node(state):
+        return await aconversation_agent_wrapper(state, knowledge_base)
+    
+    workflow.add_node("conversation", traced_node("conversation", conversation_node))
     
     workflow.set_entry_point("conversation")
     
+    add_supervisor(workflow, supervisor_mode, asupervisor_agent, aplanned_supervisor_agent)
+    
+    compiled = workflow.compile()
+    
+    log.info("[GRAPH] Async graph compiled")
+    
+    return compiled
+
+
+def add_supervisor(workflow, supervisor_mode: str, iterative_node, planned_node):
+    # Every node runs inside a "node" span; agent, KB and LLM spans nest under it.
+    if supervisor_mode == "planned":
+        workflow.add_node("supervisor", traced_node("supervisor", planned_node))
+        workflow.add_edge("conversation", "supervisor")
+        workflow.add_edge("supervisor", END)
+        return
+    
+    workflow.add_node("supervisor", traced_node("supervisor", iterative_node))
+    
     workflow.add_edge("conversation", "supervisor")
     
     workflow.add_conditional_edges(
@@ -34,22 +90,82 @@ def build_supervisor_graph(knowledge_base):
             "analytics": END
         }
     )
+
+
+def initial_state(
+    session_id: str,
+    messages: List[Dict],
+    brand_profile: Optional[Dict] = None,
+    tenant_config: Optional[Dict] = None
+) -> ChimeraFullState:
+    return {
+        "session_id": session_id,
+        "messages": messages,
+        "current_intent": "question",
+        "confidence_score": 0.0,
+        "next_action": "conversation",
+        "previous_agent": "",
+        "iteration_count": 0,
+        "entities": {},
+        "lead_data": None,
+        "lead_status": "unknown",
+        "crm_payload": None,
+        "meeting_slots": None,
+        "provisional_reply": "",
+        "sanitized_output": "",
+        "brand_profile": brand_profile or {},
+        "compliance_flags": [],
+        "analytics_events": [],
+        "conversation_metrics": {},
+        "retrieved_context": [],
+        "context_used": False,
+        "agent_queue": [],
+        "execution_mode": "sequential",
+        "supervisor_phase": "initial_analysis",
+        "parallel_results": {},
+        "_api_credentials": None,
+        "_tenant_config": tenant_config,
+    }
+
+
+async def arun_turn(graph, state: ChimeraFullState) -> ChimeraFullState:
+    return await graph.ainvoke(state)
+
+
+def conversation_agent_wrapper(full_state: ChimeraFullState, knowledge_base):
+    from core.state_filter import StateFilter
     
-    compiled = workflow.compile()
+    filtered_state = StateFilter.for_conversation_agent(full_state)
     
-    print("✅ Secure graph compiled!")
-    print("="*60 + "\n")
+    tenant_id = tenant_id_for_state(full_state)
+    if isinstance(knowledge_base, TenantKnowledgeBaseManager):
+        knowledge_base = knowledge_base.get(tenant_id)
     
-    return compiled
+    fused = generation_mode_for_state(full_state) == "fused"
+    with use_lane(lane_for_state(full_state)), agent_span("conversation_agent", filtered_state):
+        result = conversation_agent(filtered_state, knowledge_base, tenant_id=tenant_id, fused=fused)
+    
+    return apply_conversation_result(full_state, result)
 
 
-def conversation_agent_wrapper(full_state: ChimeraFullState, knowledge_base):
+async def aconversation_agent_wrapper(full_state: ChimeraFullState, knowledge_base):
     from core.state_filter import StateFilter
     
     filtered_state = StateFilter.for_conversation_agent(full_state)
     
-    result = conversation_agent(filtered_state, knowledge_base)
+    tenant_id = tenant_id_for_state(full_state)
+    if isinstance(knowledge_base, TenantKnowledgeBaseManager):
+        # A cold tenant is loaded from disk; don't block the loop on it.
+        knowledge_base = await asyncio.to_thread(knowledge_base.get, tenant_id)
+    
+    fused = generation_mode_for_state(full_state) == "fused"
+    with use_lane(lane_for_state(full_state)), agent_span("conversation_agent", filtered_state):
+        result = await aconversation_agent(filtered_state, knowledge_base, tenant_id=tenant_id, fused=fused)
     
+    return apply_conversation_result(full_state, result)
+
+
+def apply_conversation_result(full_state: ChimeraFullState, result: Dict) -> ChimeraFullState:
     full_state["provisional_reply"] = result.get("provisional_reply", "")
     full_state["current_intent"] = result.get("current_intent", "question")
     full_state["confidence_score"] = result.get("confidence_score", 0.0)
@@ -58,7 +174,7 @@ def conversation_agent_wrapper(full_state: ChimeraFullState, knowledge_base):
     full_state["context_used"] = result.get("context_used", False)
     
     if "analytics_events" in result:
-        full_state["analytics_events"].extend(result["analytics_events"])
+        full_state["analytics_events"] = [*full_state["analytics_events"], *result["analytics_events"]]
     
     full_state["next_action"] = "supervisor"
     full_state["previous_agent"] = "conversation"
@@ -0,0 +1,680 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+import faiss
+import numpy as np
+from typing import List, Dict, Optional, Tuple
+from sentence_transformers import SentenceTransformer
+from core.vector_index import (
+    IndexConfig,
+    allowed_selector,
+    apply_search_params,
+    create_index,
+    enable_reconstruct,
+    index_memory_bytes,
+    is_flat,
+    own_index,
+    read_index,
+    search_parameters,
+)
+from core.lexical_index import BM25Index, reciprocal_rank_fusion
+from core.dedup import ChunkDeduplicator, dedup_key
+from core.metadata_index import MetadataIndex
+from core.chunker import default_chunker
+from core.log import get_logger
+from core.tenant_config import DEFAULT_TENANT
+from core.tracing import span
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+QUERY_CACHE_SIZE = 2048
+RETRIEVAL_MODES = ("dense", "hybrid")
+HYBRID_CANDIDATES = 20
+FILTER_SCAN_THRESHOLD = 256
+COMPACTION_THRESHOLD = float(os.getenv("CHIMERA_COMPACTION_THRESHOLD", "0.25"))
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MANIFEST = "manifest.json"
+SNAPSHOT_EMBEDDINGS = "embeddings.npy"
+SNAPSHOT_INDEX = "index.faiss"
+SNAPSHOT_DOCS = "docs.jsonl"
+
+log = get_logger(__name__)
+
+
+def split_chunks(text: str) -> List[str]:
+    return default_chunker().split(text)
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+_shared_model = None
+_shared_model_lock = threading.Lock()
+
+
+def get_embedding_model():
+    # One SentenceTransformer per process; encode() is safe to call from many threads.
+    global _shared_model
+    if _shared_model is None:
+        with _shared_model_lock:
+            if _shared_model is None:
+                log.info("[KB] Loading embedding model %s", EMBEDDING_MODEL)
+                _shared_model = SentenceTransformer(EMBEDDING_MODEL)
+    return _shared_model
+
+
+def get_knowledge_base(tenant_id: str = DEFAULT_TENANT, factory=None, snapshot_root: Optional[str] = None) -> "KnowledgeBase":
+    # Every session of a tenant shares one index; cold tenants may be evicted, so
+    # callers should resolve the KB per request rather than holding on to it.
+    from core.tenant_manager import get_tenant_manager
+    return get_tenant_manager(snapshot_root, factory).get(tenant_id)
+
+
+def tenant_snapshot_dir(snapshot_root: str, tenant_id: str = DEFAULT_TENANT) -> str:
+    return os.path.join(snapshot_root, tenant_id)
+
+
+def registered_tenants(snapshot_root: Optional[str] = None, factory=None) -> List[str]:
+    from core.tenant_manager import get_tenant_manager
+    return get_tenant_manager(snapshot_root, factory).resident_tenants()
+
+
+def reset_registry():
+    from core.tenant_manager import reset_tenant_managers
+    reset_tenant_managers()
+
+
+def _synchronized(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def normalize_query(query: str) -> str:
+    # MiniLM's tokenizer is uncased, so case and spacing never change the embedding.
+    return " ".join(query.lower().split())
+
+
+class QueryEmbeddingCache:
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key: str, vector: np.ndarray):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class KnowledgeBase:
+    def __init__(
+        self,
+        model=None,
+        index_config: Optional[IndexConfig] = None,
+        retrieval_mode: Optional[str] = None,
+        deduplicator: Optional[ChunkDeduplicator] = None,
+    ):
+        self.docs: List[str] = []
+        self.metadatas: List[Dict] = []
+        self.model = model or get_embedding_model()
+        self.index_config = index_config or IndexConfig.from_env()
+        self.index = None
+        self.lexical = BM25Index()
+        self.metadata_index = MetadataIndex()
+        self.retrieval_mode = retrieval_mode or os.getenv("CHIMERA_RETRIEVAL_MODE", "dense")
+        if self.retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{self.retrieval_mode}', expected one of {RETRIEVAL_MODES}")
+        self.query_cache = QueryEmbeddingCache()
+        self.deduplicator = deduplicator or ChunkDeduplicator.from_env()
+        # Fingerprints for a loaded snapshot are built on the first add, not at start-up.
+        self._dedup_primed = True
+        # Chunks dropped as duplicates, keyed by the dedup key of the stored chunk that
+        # stands in for them. If that chunk's source is removed they are re-added under
+        # their own, so text shared by several sources survives removing any one of them.
+        self._shadows: Dict[str, List[Tuple[str, dict]]] = {}
+        self._shadow_keys: Dict[Optional[str], set] = {}
+        self._source_hash: Optional[str] = None
+        # Rows in the FAISS index, which is the only copy of the vectors.
+        self._size = 0
+        # True while self.index is mmapped from a snapshot (read-only until the next add).
+        self._index_mapped = False
+        self._hashes: List[str] = []
+        # Tombstoned rows stay in FAISS until compaction and are excluded at search time.
+        self._deleted: set = set()
+        self._deleted_ids = np.empty(0, dtype=np.int64)
+        self.compaction_threshold = COMPACTION_THRESHOLD
+        self._compacting = False
+        self._generation = 0
+        # Bumped on every content change; compared against the last saved/loaded version.
+        self._version = 0
+        self._saved_version = 0
+        self._uid = uuid.uuid4().hex
+        # hash -> row of the vectors reconstructed from the previous index (usually a loaded snapshot)
+        self._reusable: Dict[str, int] = {}
+        self._reusable_matrix: Optional[np.ndarray] = None
+        # Shared across sessions: writers and FAISS searches go through this lock.
+        self._lock = threading.RLock()
+
+    def _get_vectors(self, rows: np.ndarray) -> np.ndarray:
+        # Every index type can reconstruct (exactly for flat/fp16, approximately for sq8/pq).
+        return self.index.reconstruct_batch(np.asarray(rows, dtype=np.int64))
+
+    def _all_vectors(self) -> np.ndarray:
+        return self._get_vectors(np.arange(self._size, dtype=np.int64))
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        with span("embedding.encode", kind="embedding", texts=len(texts), chars=sum(map(len, texts))):
+            return np.ascontiguousarray(
+                self.model.encode(texts, show_progress_bar=False), dtype="float32"
+            )
+
+    def _embed_chunks(self, chunks: List[str], hashes: List[str]) -> np.ndarray:
+        # Unchanged chunks come straight from the snapshot; only new text is encoded.
+        missing = [i for i, h in enumerate(hashes) if h not in self._reusable]
+        if len(missing) == len(chunks):
+            return self._encode(chunks)
+        dim = self._reusable_matrix.shape[1]
+        out = np.empty((len(chunks), dim), dtype="float32")
+        for i, h in enumerate(hashes):
+            if h in self._reusable:
+                out[i] = self._reusable_matrix[self._reusable[h]]
+        if missing:
+            out[missing] = self._encode([chunks[i] for i in missing])
+        return out
+
+    def _add_to_index(self, new: np.ndarray):
+        if self.index is None:
+            self.index = faiss.IndexFlatL2(new.shape[1])
+        elif self._index_mapped:
+            self.index = own_index(self.index)
+            apply_search_params(self.index, self.index_config)
+            enable_reconstruct(self.index)
+            self._index_mapped = False
+        staged = self._size
+        self._size += len(new)
+        if is_flat(self.index) and self.index_config.wants_ann(self._size):
+            # Corpus just crossed the threshold: train the ANN index once on everything stored.
+            log.info("[KB] Training %s/%s index on %d vectors", self.index_config.kind, self.index_config.storage, self._size)
+            vectors = np.vstack([self.index.reconstruct_n(0, staged), new])
+            self.index = create_index(vectors, self.index_config)
+            return
+        self.index.add(new)
+
+    def set_search_params(self, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        if nprobe is not None:
+            self.index_config.nprobe = nprobe
+        if ef_search is not None:
+            self.index_config.ef_search = ef_search
+        if self.index is not None:
+            apply_search_params(self.index, self.index_config)
+
+    @_synchronized
+    def add_chunks(self, chunks: List[str], metadata: dict = None) -> int:
+        if not self._dedup_primed:
+            self.deduplicator.prime(self._live_docs())
+            self._dedup_primed = True
+        chunks, duplicates = self.deduplicator.filter_with_owners(chunks)
+        if duplicates:
+            self._add_shadows(duplicates, metadata)
+        if not chunks:
+            return 0
+        self._source_hash = None
+        hashes = [chunk_hash(c) for c in chunks]
+        new = self._embed_chunks(chunks, hashes)
+        self._add_to_index(new)
+        self.lexical.add_many(chunks)
+        first_row = len(self.docs)
+        self.docs.extend(chunks)
+        self.metadatas.extend(dict(metadata or {}) for _ in chunks)
+        for row in range(first_row, len(self.docs)):
+            self.metadata_index.add(row, self.metadatas[row])
+        self._hashes.extend(hashes)
+        self._version += 1
+        return len(chunks)
+
+    def _add_shadows(self, duplicates: List[Tuple[str, str]], metadata: Optional[dict]):
+        source = (metadata or {}).get("source")
+        for chunk, owner in duplicates:
+            self._shadows.setdefault(owner, []).append((chunk, dict(metadata or {})))
+            self._shadow_keys.setdefault(source, set()).add(owner)
+        self._version += 1
+
+    def _drop_shadows(self, source: str) -> bool:
+        owners = self._shadow_keys.pop(source, ())
+        for owner in owners:
+            kept = [s for s in self._shadows.get(owner, ()) if s[1].get("source") != source]
+            if kept:
+                self._shadows[owner] = kept
+            else:
+                self._shadows.pop(owner, None)
+        return bool(owners)
+
+    def _revive_shadows(self, removed_docs: List[str]) -> int:
+        # The first revived copy becomes the stored chunk; add_chunks shadows the rest under it again.
+        revived = 0
+        for doc in removed_docs:
+            for chunk, metadata in self._shadows.pop(dedup_key(doc), ()):
+                revived += self.add_chunks([chunk], metadata)
+        return revived
+
+    def add_text(self, text: str, metadata: dict = None) -> int:
+        return self.add_chunks(split_chunks(text), metadata)
+
+    def _live_docs(self) -> List[str]:
+        if not self._deleted:
+            return self.docs
+        return [doc for row, doc in enumerate(self.docs) if row not in self._deleted]
+
+    def _set_deleted(self, deleted: set):
+        self._deleted = deleted
+        self._deleted_ids = np.array(sorted(deleted), dtype=np.int64)
+
+    def source_rows(self, source: str) -> np.ndarray:
+        rows = self.metadata_index.match({"source": source})
+        if self._deleted:
+            rows = np.setdiff1d(rows, self._deleted_ids, assume_unique=True)
+        return rows
+
+    def sources(self) -> List[str]:
+        return [s for s in self.metadata_index.values("source") if len(self.source_rows(s))]
+
+    @_synchronized
+    def remove_source(self, source: str, compact: bool = True) -> int:
+        rows = self.source_rows(source)
+        if self._drop_shadows(source):
+            self._version += 1
+        if not len(rows):
+            return 0
+        removed = [self.docs[i] for i in rows]
+        if self._dedup_primed:
+            self.deduplicator.forget(removed)
+        self._set_deleted(self._deleted | set(rows.tolist()))
+        self._source_hash = None
+        self._version += 1
+        revived = self._revive_shadows(removed)
+        log.info("[KB] Removed %d chunks for source %s (%d restored under other sources)", len(rows), source, revived)
+        if compact:
+            self.maybe_compact()
+        return len(rows)
+
+    @_synchronized
+    def replace_source(self, source: str, text: str, metadata: dict = None) -> int:
+        rows = self.source_rows(source)
+        if metadata is None:
+            metadata = dict(self.metadatas[rows[0]]) if len(rows) else {}
+        metadata = {**metadata, "source": source}
+        self.remove_source(source, compact=False)
+        added = self.add_text(text, metadata)
+        self.maybe_compact()
+        return added
+
+    def tombstone_ratio(self) -> float:
+        return len(self._deleted) / len(self.docs) if self.docs else 0.0
+
+    def maybe_compact(self, background: bool = True) -> bool:
+        if self._compacting or self.tombstone_ratio() < self.compaction_threshold:
+            return False
+        if background:
+            threading.Thread(target=self.compact, name="kb-compaction", daemon=True).start()
+        else:
+            self.compact()
+        return True
+
+    def compact(self) -> bool:
+        # Rebuild without tombstoned rows. The expensive index build runs outside
+        # the lock; rows added or removed meanwhile are reconciled at swap time.
+        with self._lock:
+            if self._compacting or not self._deleted:
+                return False
+            self._compacting = True
+            generation = self._generation
+            n_rows = len(self.docs)
+            live = np.setdiff1d(np.arange(n_rows, dtype=np.int64), self._deleted_ids, assume_unique=True)
+            vectors = self._get_vectors(live)
+            docs = [self.docs[i] for i in live]
+            metadatas = [self.metadatas[i] for i in live]
+            hashes = [self._hashes[i] for i in live]
+        try:
+            index = create_index(vectors, self.index_config)
+            lexical = BM25Index(self.lexical.k1, self.lexical.b)
+            lexical.add_many(docs)
+            metadata_index = MetadataIndex()
+            for row, meta in enumerate(metadatas):
+                metadata_index.add(row, meta)
+
+            with self._lock:
+                if generation != self._generation:
+                    return False
+                tail = np.arange(n_rows, len(self.docs), dtype=np.int64)
+                if len(tail):
+                    tail_vectors = self._get_vectors(tail)
+                    index.add(tail_vectors)
+                    for i in tail:
+                        metadata_index.add(len(docs), self.metadatas[i])
+                        lexical.add(self.docs[i])
+                        docs.append(self.docs[i])
+                        metadatas.append(self.metadatas[i])
+                        hashes.append(self._hashes[i])
+                remap = {int(old): new for new, old in enumerate(np.concatenate([live, tail]))}
+                deleted = {remap[i] for i in self._deleted if i in remap}
+
+                before = len(self.docs)
+                self.docs, self.metadatas, self._hashes = docs, metadatas, hashes
+                self._size = len(docs)
+                self.index, self.lexical, self.metadata_index = index, lexical, metadata_index
+                self._index_mapped = False
+                self._set_deleted(deleted)
+                self._generation += 1
+                log.info("[KB] Compacted %d -> %d rows", before, len(self.docs))
+                return True
+        finally:
+            self._compacting = False
+
+    @_synchronized
+    def rebuild_index(self):
+        # Rebuilds from the vectors the current index holds; never re-encodes.
+        if self._size:
+            self.index = create_index(self._all_vectors(), self.index_config)
+            self._index_mapped = False
+        else:
+            self.index = None
+
+    @_synchronized
+    def clear(self, keep_embeddings: bool = True):
+        if keep_embeddings and self._size:
+            self._reusable = {h: i for i, h in enumerate(self._hashes)}
+            self._reusable_matrix = self._all_vectors()
+        else:
+            self._reusable, self._reusable_matrix = {}, None
+        self.docs, self.metadatas, self._hashes = [], [], []
+        self.index = None
+        self._index_mapped = False
+        self.lexical.clear()
+        self.metadata_index.clear()
+        self.deduplicator.clear()
+        self._dedup_primed = True
+        self._shadows, self._shadow_keys = {}, {}
+        self._source_hash = None
+        self._set_deleted(set())
+        self._generation += 1
+        self._version += 1
+        self._size = 0
+
+    @_synchronized
+    def save_snapshot(self, path: str):
+        os.makedirs(path, exist_ok=True)
+
+        def target(name):
+            return os.path.join(path, name)
+
+        # Write everything to temp names first so a crash never leaves a mixed snapshot.
+        if self._size:
+            faiss.write_index(self.index, target(SNAPSHOT_INDEX + ".tmp"))
+        with open(target(SNAPSHOT_DOCS + ".tmp"), "w", encoding="utf-8") as f:
+            for doc, meta in zip(self.docs, self.metadatas):
+                f.write(json.dumps({"text": doc, "metadata": meta}, ensure_ascii=False) + "\n")
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "model": EMBEDDING_MODEL,
+            "count": self._size,
+            "dim": 0 if self.index is None else int(self.index.d),
+            "storage": self.index_config.storage,
+            # Vectors are read back from the index; older readers check this before loading a matrix.
+            "has_vectors": False,
+            "hashes": self._hashes,
+            "source_hash": self._source_hash,
+            "deleted": sorted(self._deleted),
+            "shadows": [[owner, chunk, meta] for owner, shadows in self._shadows.items() for chunk, meta in shadows],
+        }
+        with open(target(SNAPSHOT_MANIFEST + ".tmp"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        names = [SNAPSHOT_DOCS, SNAPSHOT_MANIFEST]
+        if self._size:
+            names = [SNAPSHOT_INDEX] + names
+        for name in names:
+            os.replace(target(name + ".tmp"), target(name))
+        if os.path.exists(target(SNAPSHOT_EMBEDDINGS)):
+            # Left over from a snapshot written when the matrix was stored alongside the index.
+            os.remove(target(SNAPSHOT_EMBEDDINGS))
+        self._saved_version = self._version
+
+    @_synchronized
+    def load_snapshot(self, path: str, mmap: bool = True) -> bool:
+        manifest_path = os.path.join(path, SNAPSHOT_MANIFEST)
+        if not os.path.exists(manifest_path):
+            return False
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != SNAPSHOT_VERSION or manifest.get("model") != EMBEDDING_MODEL:
+            log.warning("[KB] Ignoring incompatible snapshot at %s", path)
+            return False
+
+        docs, metadatas = [], []
+        with open(os.path.join(path, SNAPSHOT_DOCS), encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                docs.append(record["text"])
+                metadatas.append(record["metadata"])
+
+        self.clear(keep_embeddings=False)
+        self.docs, self.metadatas = docs, metadatas
+        self.lexical.add_many(docs)
+        for row, meta in enumerate(metadatas):
+            self.metadata_index.add(row, meta)
+        self._hashes = list(manifest["hashes"])
+        self._size = manifest["count"]
+        self._source_hash = manifest.get("source_hash")
+        self._set_deleted(set(manifest.get("deleted", [])))
+        for owner, chunk, meta in manifest.get("shadows", []):
+            self._shadows.setdefault(owner, []).append((chunk, meta))
+            self._shadow_keys.setdefault(meta.get("source"), set()).add(owner)
+        self._dedup_primed = False
+        if self._size:
+            # An embeddings.npy from an older snapshot is ignored; the index holds the same vectors.
+            self.index, self._index_mapped = read_index(os.path.join(path, SNAPSHOT_INDEX), mmap=mmap)
+            apply_search_params(self.index, self.index_config)
+            enable_reconstruct(self.index)
+        self._saved_version = self._version
+        log.info("[KB] Loaded snapshot: %d chunks from %s", self._size, path)
+        return True
+
+    @_synchronized
+    def sync(self, docs: List[str], snapshot_dir: Optional[str] = None):
+        # Make the corpus exactly `docs` (after dedup), reusing any snapshot embeddings.
+        docs = list(docs)
+        source_hash = chunk_hash("\n".join(chunk_hash(d) for d in docs))
+        if snapshot_dir and self.load_snapshot(snapshot_dir) and self._source_hash == source_hash:
+            return
+        self.clear(keep_embeddings=True)
+        self.add_chunks(docs)
+        self._source_hash = source_hash
+        self._reusable, self._reusable_matrix = {}, None
+        if snapshot_dir:
+            self.save_snapshot(snapshot_dir)
+
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        keys = [normalize_query(q) for q in queries]
+        vectors: List[Optional[np.ndarray]] = [self.query_cache.get(k) for k in keys]
+        missing = sorted({k for k, v in zip(keys, vectors) if v is None})
+        if missing:
+            encoded = dict(zip(missing, self._encode(missing)))
+            for key, vector in encoded.items():
+                self.query_cache.put(key, vector)
+            vectors = [encoded[k] if v is None else v for k, v in zip(keys, vectors)]
+        return np.ascontiguousarray(np.vstack(vectors), dtype="float32")
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return self._embed_queries([query])[0]
+
+    def search(self, query: str, n: int = 3, db=None, mode: Optional[str] = None, where: Optional[Dict] = None) -> List[str]:
+        return self.search_many([query], n=n, mode=mode, where=where)[0]
+
+    def search_many(
+        self,
+        queries: List[str],
+        n: int = 3,
+        mode: Optional[str] = None,
+        where: Optional[Dict] = None,
+    ) -> List[List[str]]:
+        if not queries:
+            return []
+        if self.index is None or not self.docs:
+            return [[] for _ in queries]
+        mode = mode or self.retrieval_mode
+        with span("kb.search", kind="kb", queries=len(queries), k=n, mode=mode, filtered=where is not None) as current:
+            rows = self._search_rows(queries, n, mode, where)
+            current.set("kb.results", sum(map(len, rows)))
+            return rows
+
+    def _search_rows(self, queries: List[str], n: int, mode: str, where: Optional[Dict]) -> List[List[str]]:
+        query_embs = self._embed_queries(queries)
+        with self._lock:
+            allowed = self.metadata_index.match(where)
+            if allowed is not None and self._deleted:
+                allowed = np.setdiff1d(allowed, self._deleted_ids, assume_unique=True)
+            if allowed is not None and not len(allowed):
+                return [[] for _ in queries]
+            if mode == "hybrid":
+                rows = self._hybrid_ids(queries, query_embs, n, allowed)
+            else:
+                rows = self._dense_ids(query_embs, n, allowed)
+            return [[self.docs[i] for i in row] for row in rows]
+
+    def _dense_ids(self, query_embs: np.ndarray, k: int, allowed: Optional[np.ndarray] = None) -> List[List[int]]:
+        if allowed is None and not self._deleted:
+            distances, indices = self.index.search(query_embs, min(k, len(self.docs)))
+            return [[int(i) for i in row if 0 <= i < len(self.docs)] for row in indices]
+        if allowed is None:
+            live = len(self.docs) - len(self._deleted)
+            if not live:
+                return [[] for _ in query_embs]
+            k = min(k, live)
+            selector = faiss.IDSelectorNot(faiss.IDSelectorBatch(self._deleted_ids))
+            params = search_parameters(self.index, self.index_config, selector)
+            distances, indices = self.index.search(query_embs, k, params=params)
+            rows = [[int(i) for i in row if 0 <= i < len(self.docs)] for row in indices]
+            short = [q for q, row in enumerate(rows) if len(row) < k]
+            if short:
+                all_live = np.setdiff1d(np.arange(len(self.docs), dtype=np.int64), self._deleted_ids, assume_unique=True)
+                for q, row in zip(short, self._scan_ids(query_embs[short], k, all_live)):
+                    rows[q] = row
+            return rows
+
+        k = min(k, len(allowed))
+        # Only a handful of rows is cheaper to reconstruct and score here; beyond that the
+        # index searches with an ID selector, which for flat indexes is exact.
+        if len(allowed) <= FILTER_SCAN_THRESHOLD:
+            return self._scan_ids(query_embs, k, allowed)
+        params = search_parameters(self.index, self.index_config, allowed_selector(allowed, self.index.ntotal))
+        distances, indices = self.index.search(query_embs, k, params=params)
+        rows = [[int(i) for i in row if 0 <= i < len(self.docs)] for row in indices]
+        # Graph/IVF probes can come back short under a tight filter; finish those exactly.
+        short = [q for q, row in enumerate(rows) if len(row) < k]
+        if short:
+            for q, row in zip(short, self._scan_ids(query_embs[short], k, allowed)):
+                rows[q] = row
+        return rows
+
+    def _scan_ids(self, query_embs: np.ndarray, k: int, allowed: np.ndarray) -> List[List[int]]:
+        # Exact L2 over just the allowed rows; ||q||^2 is constant per query and dropped.
+        subset = self._get_vectors(allowed)
+        scores = (subset * subset).sum(axis=1)[None, :] - 2.0 * query_embs @ subset.T
+        if k < len(allowed):
+            top = np.argpartition(scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(len(allowed)), scores.shape)
+        rows = []
+        for q, candidates in enumerate(top):
+            ordered = candidates[np.argsort(scores[q, candidates], kind="stable")]
+            rows.append([int(allowed[i]) for i in ordered])
+        return rows
+
+    def _hybrid_ids(
+        self,
+        queries: List[str],
+        query_embs: np.ndarray,
+        n: int,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[List[int]]:
+        # Reciprocal rank fusion of the dense and BM25 candidate lists.
+        candidates = max(HYBRID_CANDIDATES, 4 * n)
+        dense = self._dense_ids(query_embs, candidates, allowed)
+        allowed_set = None if allowed is None else set(allowed.tolist())
+        fused = []
+        for query, dense_row in zip(queries, dense):
+            lexical_row = [
+                doc_id for doc_id, _ in self.lexical.search(query, candidates, allowed=allowed_set, excluded=self._deleted)
+            ]
+            fused.append(reciprocal_rank_fusion([dense_row, lexical_row], n))
+        return fused
+
+    def cache_stats(self) -> Dict:
+        return self.query_cache.stats()
+
+    def dedup_stats(self) -> Dict:
+        return self.deduplicator.stats()
+
+    @property
+    def cache_token(self) -> str:
+        # Changes whenever the content does; a reloaded instance gets a new one.
+        return f"{self._uid}:{self._version}"
+
+    @property
+    def dirty(self) -> bool:
+        return self._version != self._saved_version
+
+    def memory_usage(self) -> Dict:
+        # Approximate resident bytes; the index is the only copy of the vectors, and
+        # a mmapped one counts in full once it has been paged in.
+        usage = {
+            "index": index_memory_bytes(self.index),
+            "docs": sum(len(d) for d in self.docs) + 100 * len(self.docs),
+            "shadows": sum(len(c) + 100 for shadows in self._shadows.values() for c, _ in shadows),
+            "lexical": self.lexical.memory_bytes(),
+        }
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def get_count(self) -> int:
+        return len(self.docs) - len(self._deleted)
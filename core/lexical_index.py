@@ -0,0 +1,105 @@
+"""
+core/lexical_index.py
+
+In-memory BM25 inverted index kept alongside the FAISS index so exact-match
+queries (SKUs, plan names, error codes) are retrievable at small n.
+"""
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+RRF_K = 60
+TERM_OVERHEAD_BYTES = 200  # dict slot, term string and two array headers
+
+
+def tokenize(text: str) -> List[str]:
+    # Keeps "sku-1234", "v2.1" and "err_503" whole, and also indexes their parts.
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if not token.isalnum():
+            tokens.extend(t for t in re.split(r"[-_.]", token) if t)
+    return tokens
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # term -> parallel arrays of doc ids and term frequencies
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_lengths = array("I")
+        self._total_length = 0
+        self._n_postings = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, text: str) -> int:
+        doc_id = len(self._doc_lengths)
+        counts = Counter(tokenize(text))
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("I"))
+            postings[0].append(doc_id)
+            postings[1].append(tf)
+        self._n_postings += len(counts)
+        length = sum(counts.values())
+        self._doc_lengths.append(length)
+        self._total_length += length
+        return doc_id
+
+    def add_many(self, texts: List[str]):
+        for text in texts:
+            self.add(text)
+
+    def clear(self):
+        self._postings.clear()
+        self._doc_lengths = array("I")
+        self._total_length = 0
+        self._n_postings = 0
+
+    def memory_bytes(self) -> int:
+        return 8 * self._n_postings + 4 * len(self._doc_lengths) + TERM_OVERHEAD_BYTES * len(self._postings)
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        allowed: Optional[Set[int]] = None,
+        excluded: Optional[Set[int]] = None,
+    ) -> List[Tuple[int, float]]:
+        n_docs = len(self._doc_lengths)
+        if not n_docs:
+            return []
+        avg_length = self._total_length / n_docs
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            doc_ids, tfs = postings
+            idf = math.log(1 + (n_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            for doc_id, tf in zip(doc_ids, tfs):
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                if excluded and doc_id in excluded:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], n: int, k: int = RRF_K) -> List[int]:
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    # Ties break on doc id so results are deterministic.
+    return [doc_id for doc_id, _ in sorted(fused.items(), key=lambda item: (-item[1], item[0]))[:n]]
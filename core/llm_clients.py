@@ -0,0 +1,79 @@
+"""
+core/llm_clients.py
+
+Process-wide LLM client cache. Clients are built once per (backend, model,
+temperature, API key) and reused by every agent and session, so auth setup
+and the underlying keep-alive connection are paid once per process instead
+of on every call.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, Hashable, Optional
+
+DEFAULT_CHAT_MODEL = "gemini-2.0-flash"
+
+
+def _key_id(api_key: Optional[str]) -> str:
+    # Cache keys and stats never hold the raw key.
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+class LLMClientProvider:
+    def __init__(self):
+        self._clients: Dict[Hashable, object] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def get(self, key: Hashable, factory: Callable[[], object]):
+        client = self._clients.get(key)
+        if client is not None:
+            self.reused += 1
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = factory()
+                self.created += 1
+            else:
+                self.reused += 1
+        return client
+
+    def chat_model(self, model: str = DEFAULT_CHAT_MODEL, temperature: float = 0.7, api_key: Optional[str] = None):
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+
+        def build():
+            from langchain_google_genai import ChatGoogleGenerativeAI
+            return ChatGoogleGenerativeAI(model=model, temperature=temperature, google_api_key=api_key)
+
+        return self.get(("langchain", model, float(temperature), _key_id(api_key)), build)
+
+    def generative_model(self, model: str, api_key: Optional[str] = None):
+        # google.generativeai is configured once at import time by the caller.
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+
+        def build():
+            import google.generativeai as genai
+            return genai.GenerativeModel(model)
+
+        return self.get(("genai", model, _key_id(api_key)), build)
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> Dict:
+        return {"clients": len(self._clients), "created": self.created, "reused": self.reused}
+
+
+_provider = LLMClientProvider()
+
+
+def get_llm_provider() -> LLMClientProvider:
+    return _provider
+
+
+def get_chat_model(model: str = DEFAULT_CHAT_MODEL, temperature: float = 0.7, api_key: Optional[str] = None):
+    return _provider.chat_model(model=model, temperature=temperature, api_key=api_key)
@@ -0,0 +1,301 @@
+"""
+core/llm_dispatch.py
+
+Single admission point for every LLM call in the process, sync or async.
+A token bucket keeps us under the provider's request rate, a max in-flight
+cap bounds concurrency, and waiting calls are served by priority lane so
+turns for hot leads go first. Identical prompts already in flight on the
+same client are coalesced into one call.
+
+The lane is taken from a context variable: the graph sets it from
+`lead_status` around each node, and ChimeraAI from its lead score.
+Each call is traced as an "llm" span carrying its lane, queue wait and
+token counts.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+from core.tracing import record_llm_usage, span
+
+LANES = {"hot": 0, "normal": 1, "background": 2}
+DEFAULT_LANE = "normal"
+
+LLM_RATE_PER_S = float(os.getenv("CHIMERA_LLM_RATE_PER_S", "0"))  # 0 = no rate limit
+LLM_BURST = int(os.getenv("CHIMERA_LLM_BURST", "0"))  # 0 = one second's worth of rate
+LLM_MAX_IN_FLIGHT = int(os.getenv("CHIMERA_LLM_MAX_IN_FLIGHT", "32"))
+
+_lane: contextvars.ContextVar = contextvars.ContextVar("chimera_llm_lane", default=DEFAULT_LANE)
+
+
+def lane_for_state(state: Dict) -> str:
+    return "hot" if state.get("lead_status") == "hot" else DEFAULT_LANE
+
+
+def current_lane() -> str:
+    return _lane.get()
+
+
+@contextlib.contextmanager
+def use_lane(lane: str):
+    if lane not in LANES:
+        raise ValueError(f"unknown lane {lane!r}, expected one of {tuple(LANES)}")
+    token = _lane.set(lane)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def coalesce_key(client, prompt) -> Hashable:
+    # Pooled clients live for the process, so identity is a stable model/temperature/key id.
+    return (id(client), prompt)
+
+
+class _Waiter:
+    __slots__ = ("lane", "enqueued", "wake", "granted")
+
+    def __init__(self, lane: str, wake: Callable[[], None]):
+        self.lane = lane
+        self.enqueued = time.perf_counter()
+        self.wake = wake
+        self.granted = False
+
+
+class LLMDispatcher:
+    def __init__(
+        self,
+        rate_per_s: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        coalesce: bool = True,
+    ):
+        self.rate_per_s = LLM_RATE_PER_S if rate_per_s is None else rate_per_s
+        burst = LLM_BURST if burst is None else burst
+        self.burst = burst or max(1, int(self.rate_per_s))
+        self.max_in_flight = max(1, LLM_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight)
+        self.coalesce = coalesce
+
+        self._lock = threading.Lock()
+        self._queue = []
+        self._seq = itertools.count()
+        self._queued = {lane: 0 for lane in LANES}
+        self._in_flight = 0
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
+        self._pending: Dict[Hashable, Future] = {}
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self._waits = {lane: deque(maxlen=2048) for lane in LANES}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate_per_s)
+        self._refilled = now
+
+    def _pump(self):
+        # Lock held. Grant slots to the best waiters while capacity and tokens last.
+        while self._queue and self._in_flight < self.max_in_flight:
+            if self.rate_per_s > 0:
+                self._refill()
+                if self._tokens < 1:
+                    if self._timer is None:
+                        delay = (1 - self._tokens) / self.rate_per_s
+                        self._timer = threading.Timer(delay, self._on_timer)
+                        self._timer.daemon = True
+                        self._timer.start()
+                    return
+                self._tokens -= 1
+            _, _, waiter = heapq.heappop(self._queue)
+            self._queued[waiter.lane] -= 1
+            self._in_flight += 1
+            waiter.granted = True
+            self._waits[waiter.lane].append(1000 * (time.perf_counter() - waiter.enqueued))
+            waiter.wake()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            self._pump()
+
+    def _enqueue(self, lane: str, wake: Callable[[], None]) -> _Waiter:
+        waiter = _Waiter(lane, wake)
+        with self._lock:
+            heapq.heappush(self._queue, (LANES[lane], next(self._seq), waiter))
+            self._queued[lane] += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+            self._pump()
+        return waiter
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._pump()
+
+    def acquire(self, lane: Optional[str] = None):
+        ready = threading.Event()
+        self._enqueue(lane or current_lane(), ready.set)
+        ready.wait()
+
+    async def aacquire(self, lane: Optional[str] = None):
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        waiter = self._enqueue(lane or current_lane(), wake)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._in_flight -= 1
+                    self._pump()
+                else:
+                    self._queue = [entry for entry in self._queue if entry[2] is not waiter]
+                    heapq.heapify(self._queue)
+                    self._queued[waiter.lane] -= 1
+            raise
+
+    @contextlib.contextmanager
+    def slot(self, lane: Optional[str] = None):
+        # Holds one in-flight slot for the whole block, e.g. while a stream is consumed.
+        self.acquire(lane)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _join(self, key: Optional[Hashable]):
+        # Returns (future, leader). Followers wait on the leader's future.
+        with self._lock:
+            self.submitted += 1
+            if key is None or not self.coalesce:
+                return None, True
+            future = self._pending.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._pending[key] = Future()
+            return future, True
+
+    def _settle(self, key, future: Optional[Future], result=None, error: Optional[BaseException] = None):
+        with self._lock:
+            if error is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+            if future is not None:
+                self._pending.pop(key, None)
+        if future is not None:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def call(
+        self,
+        fn: Callable[[], object],
+        key: Optional[Hashable] = None,
+        lane: Optional[str] = None,
+        name: str = "llm.call",
+        prompt_chars: Optional[int] = None,
+    ):
+        lane = lane or current_lane()
+        with span(name, kind="llm", lane=lane) as current:
+            future, leader = self._join(key)
+            if not leader:
+                current.set("llm.coalesced", True)
+                return future.result()
+            try:
+                queued = time.perf_counter()
+                with self.slot(lane):
+                    current.set("llm.queue_ms", round(1000 * (time.perf_counter() - queued), 3))
+                    result = fn()
+            except BaseException as e:
+                self._settle(key, future, error=e)
+                raise
+            self._settle(key, future, result)
+            record_llm_usage(current, result, prompt_chars)
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[object]],
+        key: Optional[Hashable] = None,
+        lane: Optional[str] = None,
+        name: str = "llm.call",
+        prompt_chars: Optional[int] = None,
+    ):
+        lane = lane or current_lane()
+        with span(name, kind="llm", lane=lane) as current:
+            future, leader = self._join(key)
+            if not leader:
+                current.set("llm.coalesced", True)
+                return await asyncio.wrap_future(future)
+            try:
+                queued = time.perf_counter()
+                await self.aacquire(lane)
+                current.set("llm.queue_ms", round(1000 * (time.perf_counter() - queued), 3))
+                try:
+                    result = await fn()
+                finally:
+                    self._release()
+            except BaseException as e:
+                # Includes cancellation: followers must not hang on a leader that went away.
+                self._settle(key, future, error=e)
+                raise
+            self._settle(key, future, result)
+            record_llm_usage(current, result, prompt_chars)
+            return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            queued = dict(self._queued)
+            waits = {lane: sorted(samples) for lane, samples in self._waits.items()}
+            in_flight = self._in_flight
+        wait_ms = {}
+        for lane, samples in waits.items():
+            if samples:
+                wait_ms[lane] = {
+                    "p50": round(samples[len(samples) // 2], 2),
+                    "p99": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 2),
+                }
+        return {
+            "in_flight": in_flight,
+            "queue_depth": sum(queued.values()),
+            "queue_depth_by_lane": queued,
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_ms": wait_ms,
+        }
+
+
+_dispatcher: Optional[LLMDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_llm_dispatcher() -> LLMDispatcher:
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = LLMDispatcher()
+        return _dispatcher
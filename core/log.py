@@ -0,0 +1,58 @@
+"""
+core/log.py
+
+Leveled logging for the agents and core modules, replacing bare prints.
+Everything logs under the "chimera" logger; CHIMERA_LOG_LEVEL picks the
+level (debug, info, warning, error) or switches output off entirely.
+
+Per-turn chatter (state access, routing decisions, "complete" lines) is
+debug; business events and lifecycle (lead scored, CRM push, index loaded)
+are info; failures and redactions are warnings. Pass values as arguments, not
+f-strings, so lines below the level cost a level check and nothing else.
+"""
+
+import logging
+import os
+import sys
+
+LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "off": logging.CRITICAL + 1,
+}
+LOG_LEVEL = os.getenv("CHIMERA_LOG_LEVEL", "info").lower()
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(message)s"
+
+_root = logging.getLogger("chimera")
+
+
+class _StdoutHandler(logging.StreamHandler):
+    # Resolves sys.stdout on every write, like print did, so redirect_stdout works.
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def set_log_level(level: str):
+    if level.lower() not in LOG_LEVELS:
+        raise ValueError(f"unknown log level {level!r}, expected one of {tuple(LOG_LEVELS)}")
+    _root.setLevel(LOG_LEVELS[level.lower()])
+
+
+def get_logger(name: str) -> logging.Logger:
+    # `name` is the module's __name__; "agents.lead_agent" -> "chimera.agents.lead_agent".
+    return _root.getChild(name)
+
+
+if not _root.handlers:
+    _handler = _StdoutHandler()
+    _handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _root.addHandler(_handler)
+    _root.propagate = False
+    set_log_level(LOG_LEVEL)
@@ -0,0 +1,67 @@
+"""
+core/metadata_index.py
+
+Per-field inverted index over chunk metadata (source, type, tenant tags...).
+`match(where)` resolves a filter to a sorted array of row ids that can be
+handed to FAISS as an IDSelector before the top-k is taken.
+"""
+
+from array import array
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+class MetadataIndex:
+    def __init__(self):
+        self._fields: Dict[str, Dict[Any, array]] = {}
+
+    def clear(self):
+        self._fields.clear()
+
+    def add(self, row: int, metadata: Dict):
+        for field, value in (metadata or {}).items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            postings = self._fields.setdefault(field, {})
+            # A repeated list entry must not post the row twice: match() relies on unique postings.
+            for v in dict.fromkeys(v for v in values if isinstance(v, SCALAR_TYPES)):
+                postings.setdefault(v, array("q")).append(row)
+
+    def values(self, field: str):
+        return list(self._fields.get(field, {}).keys())
+
+    def match(self, where: Optional[Dict]) -> Optional[np.ndarray]:
+        # Fields are ANDed; a list/tuple/set of values is ORed within its field.
+        if not where:
+            return None
+        result = None
+        for field, wanted in where.items():
+            postings = self._fields.get(field, {})
+            options = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            lists = [postings[v] for v in options if v in postings]
+            if not lists:
+                return np.empty(0, dtype=np.int64)
+            # Gather into a fresh array: no buffer stays exported from the postings, so
+            # later appends can still resize them, and it's far cheaper than one numpy
+            # copy per value.
+            gathered = array("q")
+            for posting in lists:
+                gathered.extend(posting)
+            rows = np.frombuffer(gathered, dtype=np.int64)
+            if len(lists) > 1:
+                rows = _sorted_union(rows)
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+            if not len(result):
+                break
+        return result
+
+
+def _sorted_union(rows: np.ndarray) -> np.ndarray:
+    # Sort and drop repeats in place; np.unique hashes int64 input and is ~10x slower here.
+    rows.sort()
+    keep = np.empty(len(rows), dtype=bool)
+    keep[0] = True
+    np.not_equal(rows[1:], rows[:-1], out=keep[1:])
+    return rows[keep]
@@ -0,0 +1,168 @@
+"""
+core/response_cache.py
+
+Semantic cache for first-turn replies. Entries are scoped per tenant (and
+prompt variant), keyed on the fingerprint of the retrieved context, and
+matched by cosine similarity of the query embedding. Each entry remembers
+the KB content token it was generated against, so any ingest or removal
+invalidates it.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+RESPONSE_CACHE_ENABLED = os.getenv("CHIMERA_RESPONSE_CACHE", "on") != "off"
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("CHIMERA_RESPONSE_CACHE_THRESHOLD", "0.95"))
+RESPONSE_CACHE_TTL = float(os.getenv("CHIMERA_RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_SIZE = int(os.getenv("CHIMERA_RESPONSE_CACHE_SIZE", "4096"))
+
+
+def context_fingerprint(chunks: List[str]) -> str:
+    digest = hashlib.sha1()
+    for chunk in chunks:
+        digest.update(hashlib.sha1(chunk.encode("utf-8")).digest())
+    return digest.hexdigest()
+
+
+class _Entry:
+    __slots__ = ("vector", "reply", "token", "expires")
+
+    def __init__(self, vector: np.ndarray, reply: str, token: str, expires: float):
+        self.vector = vector
+        self.reply = reply
+        self.token = token
+        self.expires = expires
+
+
+class SemanticResponseCache:
+    def __init__(
+        self,
+        threshold: float = RESPONSE_CACHE_THRESHOLD,
+        ttl_seconds: float = RESPONSE_CACHE_TTL,
+        max_entries: int = RESPONSE_CACHE_SIZE,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # (scope, context fingerprint) -> entries; the LRU order is kept across all buckets.
+        self._buckets: Dict[Tuple[str, str], List[_Entry]] = {}
+        self._lru: "OrderedDict[int, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype="float32").ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _drop(self, key: Tuple[str, str], entry: _Entry):
+        # Caller holds the lock.
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket.remove(entry)
+            if not bucket:
+                del self._buckets[key]
+        self._lru.pop(id(entry), None)
+
+    def get(self, scope: str, query_vector: np.ndarray, context_fp: str, token: str) -> Optional[str]:
+        key = (scope, context_fp)
+        query = self._normalize(query_vector)
+        now = time.monotonic()
+        with self._lock:
+            best, best_score = None, self.threshold
+            for entry in list(self._buckets.get(key, ())):
+                if entry.expires <= now:
+                    self.expired += 1
+                    self._drop(key, entry)
+                    continue
+                if entry.token != token:
+                    self.invalidated += 1
+                    self._drop(key, entry)
+                    continue
+                score = float(entry.vector @ query)
+                if score >= best_score:
+                    best, best_score = entry, score
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._lru.move_to_end(id(best))
+            return best.reply
+
+    def put(self, scope: str, query_vector: np.ndarray, context_fp: str, token: str, reply: str):
+        if self.max_entries <= 0:
+            return
+        key = (scope, context_fp)
+        entry = _Entry(self._normalize(query_vector), reply, token, time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            self._buckets.setdefault(key, []).append(entry)
+            self._lru[id(entry)] = key
+            while len(self._lru) > self.max_entries:
+                old_id, old_key = self._lru.popitem(last=False)
+                for old in self._buckets.get(old_key, ()):
+                    if id(old) == old_id:
+                        self._drop(old_key, old)
+                        break
+                self.evictions += 1
+
+    def invalidate(self, scope: Optional[str] = None):
+        with self._lock:
+            for key in [k for k in self._buckets if scope is None or k[0] == scope]:
+                for entry in list(self._buckets[key]):
+                    self._drop(key, entry)
+                    self.invalidated += 1
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._lru),
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "invalidated": self.invalidated,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+def lookup_reply(
+    cache: Optional[SemanticResponseCache], kb, scope: str, message: str, context_chunks: List[str]
+) -> Tuple[Optional[str], Optional[tuple]]:
+    # Returns (cached reply or None, key to store the fresh reply under).
+    if cache is None or not hasattr(kb, "cache_token"):
+        return None, None
+    key = (scope, kb.embed_query(message), context_fingerprint(context_chunks), kb.cache_token)
+    return cache.get(*key), key
+
+
+_shared_cache: Optional[SemanticResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[SemanticResponseCache]:
+    # One cache per process; scopes keep tenants apart. None when disabled.
+    global _shared_cache
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SemanticResponseCache()
+        return _shared_cache
@@ -9,48 +9,51 @@ from core.state import (
     AnalyticsAgentState
 )
 
-from typing import Dict
+from core.audit_log import record_state_access
+from core.state_view import freeze
+from typing import Dict, Optional
 import copy
-from datetime import datetime
 
 
 class StateFilter:
+    # Agents get read-only views of the fields they may see, not deep copies: O(1)
+    # per call however long the session, and writes raise instead of being lost.
 
     @staticmethod
     def for_conversation_agent(full_state: ChimeraFullState) -> ConversationAgentState:
         filtered = {
             "session_id": full_state["session_id"],
-            "messages": copy.deepcopy(full_state["messages"]),
-            "brand_profile": copy.deepcopy(full_state["brand_profile"])
+            "messages": freeze(full_state["messages"]),
+            "brand_profile": freeze(full_state["brand_profile"])
         }
-        StateFilter._log_access("conversation_agent", filtered)
+        StateFilter._log_access("conversation_agent", filtered, full_state)
         return filtered
 
     @staticmethod
     def for_lead_agent(full_state: ChimeraFullState) -> LeadAgentState:
         filtered = {
-            "entities": copy.deepcopy(full_state["entities"]),
-            "messages": copy.deepcopy(full_state["messages"])
+            "entities": freeze(full_state["entities"]),
+            "messages": freeze(full_state["messages"])
         }
-        StateFilter._log_access("lead_agent", filtered)
+        StateFilter._log_access("lead_agent", filtered, full_state)
         return filtered
 
     @staticmethod
     def for_scheduler_agent(full_state: ChimeraFullState) -> SchedulerAgentState:
         filtered = {
-            "entities": copy.deepcopy(full_state["entities"]),
+            "entities": freeze(full_state["entities"]),
             "current_intent": full_state["current_intent"]
         }
-        StateFilter._log_access("scheduler_agent", filtered)
+        StateFilter._log_access("scheduler_agent", filtered, full_state)
         return filtered
 
     @staticmethod
     def for_stylist_agent(full_state: ChimeraFullState) -> StylistAgentState:
         filtered = {
             "provisional_reply": full_state["provisional_reply"],
-            "brand_profile": copy.deepcopy(full_state["brand_profile"])
+            "brand_profile": freeze(full_state["brand_profile"])
         }
-        StateFilter._log_access("stylist_agent", filtered)
+        StateFilter._log_access("stylist_agent", filtered, full_state)
         return filtered
 
     @staticmethod
@@ -58,38 +61,33 @@ class StateFilter:
         filtered = {
             "sanitized_output": full_state["sanitized_output"]
         }
-        StateFilter._log_access("compliance_agent", filtered)
+        StateFilter._log_access("compliance_agent", filtered, full_state)
         return filtered
 
     @staticmethod
     def for_integration_agent(full_state: ChimeraFullState) -> IntegrationAgentState:
         filtered = {
-            "crm_payload": copy.deepcopy(full_state.get("crm_payload")),
-            "meeting_slots": copy.deepcopy(full_state.get("meeting_slots"))
+            "crm_payload": freeze(full_state.get("crm_payload")),
+            "meeting_slots": freeze(full_state.get("meeting_slots"))
         }
-        StateFilter._log_access("integration_agent", filtered)
+        StateFilter._log_access("integration_agent", filtered, full_state)
         return filtered
 
     @staticmethod
     def for_analytics_agent(full_state: ChimeraFullState) -> AnalyticsAgentState:
         filtered = {
-            "analytics_events": copy.deepcopy(full_state["analytics_events"]),
-            "conversation_metrics": copy.deepcopy(full_state.get("conversation_metrics", {})),
+            "analytics_events": freeze(full_state["analytics_events"]),
+            "conversation_metrics": freeze(full_state.get("conversation_metrics", {})),
             "session_id": full_state["session_id"]
         }
-        StateFilter._log_access("analytics_agent", filtered)
+        StateFilter._log_access("analytics_agent", filtered, full_state)
         return filtered
 
     @staticmethod
-    def _log_access(agent_name: str, filtered_state: Dict):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        fields = list(filtered_state.keys())
-        data_size = len(str(filtered_state))
-
-        print(f"[SECURITY AUDIT] {timestamp}")
-        print(f"  Agent: {agent_name}")
-        print(f"  Fields accessed: {fields}")
-        print(f"  Data size: {data_size} bytes")
+    def _log_access(agent_name: str, filtered_state: Dict, full_state: Optional[Dict] = None):
+        # Structured event to the audit sink (core.audit_log); buffered unless the
+        # tenant asked for synchronous auditing.
+        record_state_access(agent_name, filtered_state, full_state)
 
     @staticmethod
     def mask_sensitive_for_logging(data: Dict) -> Dict:
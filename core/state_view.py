@@ -0,0 +1,120 @@
+"""
+core/state_view.py
+
+Read-only views over graph state, handed to agents instead of deep copies.
+A view wraps the original object and freezes nested dicts/lists lazily on
+access, so building one is O(1) however long the transcript is, and any
+attempt to mutate it raises TypeError/AttributeError instead of silently
+changing a private copy.
+
+Views are safe because the graph never mutates shared state in place: merges
+assign new objects, and a sequence view pins the length it was created with,
+so entries appended later (messages, analytics_events) don't show up in it.
+Agents that need a mutable or JSON-serialisable copy call thaw().
+"""
+
+from collections.abc import Mapping, Sequence
+
+
+_PASS_THROUGH = {str, int, float, bool, bytes, type(None)}
+
+
+def freeze(value):
+    # Exact type checks first: isinstance against the ABC-based views is slow,
+    # and this runs on every element an agent reads.
+    kind = type(value)
+    if kind in _PASS_THROUGH or kind is FrozenMapping or kind is FrozenSequence:
+        return value
+    if isinstance(value, dict):
+        return FrozenMapping(value)
+    if isinstance(value, (list, tuple)):
+        return FrozenSequence(value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def unwrap(value):
+    # The object behind a view, for read-only consumers that must not pay for
+    # freezing (e.g. audit size estimates). Don't hand the result to agents.
+    if type(value) is FrozenMapping:
+        return value._data
+    if type(value) is FrozenSequence and value._start == 0 and value._stop == len(value._data):
+        return value._data
+    return value
+
+
+def thaw(value):
+    # Deep, plain copy of a view (or of anything containing views).
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (FrozenSequence, list, tuple)):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
+
+
+class FrozenMapping(Mapping):
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key):
+        return freeze(self._data[key])
+
+    def get(self, key, default=None):
+        if key in self._data:
+            return freeze(self._data[key])
+        return default
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(self._data)
+
+
+class FrozenSequence(Sequence):
+    __slots__ = ("_data", "_start", "_stop")
+
+    def __init__(self, data, start: int = 0, stop: int = None):
+        self._data = data
+        self._start = start
+        self._stop = len(data) if stop is None else stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            positions = range(self._start, self._stop)[index]
+            if positions.step == 1:
+                return FrozenSequence(self._data, positions.start, positions.stop)
+            return FrozenSequence(tuple(self._data[i] for i in positions))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("state view index out of range")
+        return freeze(self._data[self._start + index])
+
+    def __iter__(self):
+        for i in range(self._start, self._stop):
+            yield freeze(self._data[i])
+
+    def __eq__(self, other):
+        if isinstance(other, (FrozenSequence, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._data[self._start:self._stop])
@@ -0,0 +1,41 @@
+"""
+core/tenant_config.py
+
+Per-tenant settings read from a turn's state (`_tenant_config`). Kept free of
+knowledge-base imports so the supervisor, graph and execution planner can
+resolve them without loading the tenant manager.
+"""
+
+import os
+from typing import Dict
+
+from core.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_TENANT = "default"
+
+# "two_pass": conversation drafts, stylist rewrites (two LLM calls).
+# "fused": brand tone/voice go into the conversation prompt; the stylist is skipped.
+GENERATION_MODES = ("two_pass", "fused")
+DEFAULT_GENERATION_MODE = os.getenv("CHIMERA_GENERATION_MODE", "two_pass")
+if DEFAULT_GENERATION_MODE not in GENERATION_MODES:
+    raise ValueError(
+        f"unknown CHIMERA_GENERATION_MODE {DEFAULT_GENERATION_MODE!r}, expected one of {GENERATION_MODES}"
+    )
+
+
+def tenant_id_for_state(state: Dict) -> str:
+    return (state.get("_tenant_config") or {}).get("tenant_id") or DEFAULT_TENANT
+
+
+def generation_mode_for_state(state: Dict) -> str:
+    mode = (state.get("_tenant_config") or {}).get("generation_mode") or DEFAULT_GENERATION_MODE
+    if mode not in GENERATION_MODES:
+        # One bad config value must not fail every turn for the tenant.
+        log.warning(
+            "[TENANTS] Unknown generation_mode %r for %s, using %r",
+            mode, tenant_id_for_state(state), DEFAULT_GENERATION_MODE,
+        )
+        return DEFAULT_GENERATION_MODE
+    return mode
@@ -0,0 +1,241 @@
+"""
+core/tenant_manager.py
+
+Per-tenant knowledge bases behind a memory-budgeted LRU. A tenant's index is
+loaded from `<snapshot_root>/<tenant_id>` on first use; when the resident
+tenants exceed the byte budget the coldest ones are evicted, and any that
+changed since their last snapshot are flushed to disk first. After an ingest,
+schedule_flush() saves the tenant at most once per CHIMERA_KB_FLUSH_SECONDS,
+so a burst of adds costs one full snapshot rather than one each; whatever is
+still unsaved is flushed at interpreter exit.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.knowledge_base import DEFAULT_TENANT, KnowledgeBase, tenant_snapshot_dir
+from core.log import get_logger
+from core.tenant_config import tenant_id_for_state
+
+log = get_logger(__name__)
+
+KB_MEMORY_BUDGET_MB = int(os.getenv("CHIMERA_KB_MEMORY_MB", "2048"))
+KB_FLUSH_SECONDS = float(os.getenv("CHIMERA_KB_FLUSH_SECONDS", "30"))
+
+
+class TenantKnowledgeBaseManager:
+    def __init__(
+        self,
+        snapshot_root: Optional[str] = None,
+        memory_budget_bytes: Optional[int] = None,
+        factory: Optional[Callable[[], KnowledgeBase]] = None,
+        flush_delay: Optional[float] = None,
+    ):
+        self.snapshot_root = snapshot_root
+        self.flush_delay = flush_delay if flush_delay is not None else KB_FLUSH_SECONDS
+        self.memory_budget_bytes = (
+            memory_budget_bytes if memory_budget_bytes is not None else KB_MEMORY_BUDGET_MB * 2**20
+        )
+        self.factory = factory or KnowledgeBase
+        self._tenants: "OrderedDict[str, KnowledgeBase]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        # Evicted but not yet flushed; a get() in that window revives the instance
+        # instead of reading a stale snapshot.
+        self._evicting: Dict[str, Tuple[KnowledgeBase, int]] = {}
+        self._lock = threading.Lock()
+        # One lock per tenant so a slow load or flush never blocks other tenants.
+        self._tenant_locks: Dict[str, threading.Lock] = {}
+        self._flush_timers: Dict[str, threading.Timer] = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.flushes = 0
+        self.load_seconds = 0.0
+
+    def _tenant_lock(self, tenant_id: str) -> threading.Lock:
+        with self._lock:
+            return self._tenant_locks.setdefault(tenant_id, threading.Lock())
+
+    def _snapshot_dir(self, tenant_id: str) -> Optional[str]:
+        return tenant_snapshot_dir(self.snapshot_root, tenant_id) if self.snapshot_root else None
+
+    def _hit(self, tenant_id: str) -> Optional[KnowledgeBase]:
+        with self._lock:
+            kb = self._tenants.get(tenant_id)
+            if kb is None and tenant_id in self._evicting:
+                kb, self._sizes[tenant_id] = self._evicting.pop(tenant_id)
+                self._tenants[tenant_id] = kb
+            if kb is not None:
+                self._tenants.move_to_end(tenant_id)
+                self.hits += 1
+            return kb
+
+    def get(self, tenant_id: str = DEFAULT_TENANT) -> KnowledgeBase:
+        kb = self._hit(tenant_id)
+        if kb is not None:
+            return kb
+        with self._tenant_lock(tenant_id):
+            kb = self._hit(tenant_id)
+            if kb is not None:
+                return kb
+            start = time.perf_counter()
+            kb = self.factory()
+            path = self._snapshot_dir(tenant_id)
+            if path:
+                kb.load_snapshot(path)
+            elapsed = time.perf_counter() - start
+            size = kb.memory_usage()["total"]
+            with self._lock:
+                self._tenants[tenant_id] = kb
+                self._sizes[tenant_id] = size
+                self.loads += 1
+                self.load_seconds += elapsed
+        log.info("[TENANTS] Loaded %s (%.1f MB) in %.0f ms", tenant_id, size / 2**20, elapsed * 1000)
+        self._enforce_budget(keep=tenant_id)
+        return kb
+
+    def for_state(self, state: Dict) -> KnowledgeBase:
+        return self.get(tenant_id_for_state(state))
+
+    def refresh(self, tenant_id: str):
+        # Call after ingesting into a tenant so its footprint is re-measured.
+        with self._lock:
+            kb = self._tenants.get(tenant_id)
+        if kb is None:
+            return
+        size = kb.memory_usage()["total"]
+        with self._lock:
+            if tenant_id in self._tenants:
+                self._sizes[tenant_id] = size
+        self._enforce_budget(keep=tenant_id)
+
+    def _enforce_budget(self, keep: Optional[str] = None):
+        if not self.snapshot_root:
+            # Nothing to reload an evicted tenant from.
+            return
+        evicted: List[Tuple[str, KnowledgeBase]] = []
+        with self._lock:
+            total = sum(self._sizes.values())
+            for tenant_id in list(self._tenants):
+                if total <= self.memory_budget_bytes:
+                    break
+                if tenant_id == keep:
+                    continue
+                evicted.append((tenant_id, self._pop(tenant_id)))
+                total -= self._evicting[tenant_id][1]
+        for tenant_id, kb in evicted:
+            self._flush(tenant_id, kb)
+            log.info("[TENANTS] Evicted %s", tenant_id)
+
+    def _pop(self, tenant_id: str) -> KnowledgeBase:
+        # Caller holds self._lock.
+        kb = self._tenants.pop(tenant_id)
+        self._evicting[tenant_id] = (kb, self._sizes.pop(tenant_id))
+        self.evictions += 1
+        return kb
+
+    def _flush(self, tenant_id: str, kb: KnowledgeBase):
+        path = self._snapshot_dir(tenant_id)
+        if path and kb.dirty:
+            kb.save_snapshot(path)
+            with self._lock:
+                self.flushes += 1
+        with self._lock:
+            if self._evicting.get(tenant_id, (None,))[0] is kb:
+                del self._evicting[tenant_id]
+
+    def evict(self, tenant_id: str) -> bool:
+        with self._lock:
+            if tenant_id not in self._tenants:
+                return False
+            kb = self._pop(tenant_id)
+        self._flush(tenant_id, kb)
+        return True
+
+    def flush(self, tenant_id: str):
+        # Save a resident tenant's snapshot if it changed since the last one.
+        with self._lock:
+            timer = self._flush_timers.pop(tenant_id, None)
+            kb = self._tenants.get(tenant_id)
+        if timer is not None:
+            timer.cancel()
+        if kb is not None:
+            self._flush(tenant_id, kb)
+
+    def schedule_flush(self, tenant_id: str):
+        # Debounced flush: the first change starts the timer, later ones ride along.
+        if self.flush_delay <= 0:
+            self.flush(tenant_id)
+            return
+        with self._lock:
+            if tenant_id in self._flush_timers:
+                return
+            timer = self._flush_timers[tenant_id] = threading.Timer(self.flush_delay, self.flush, args=(tenant_id,))
+        timer.daemon = True
+        timer.start()
+
+    def flush_all(self):
+        with self._lock:
+            timers = list(self._flush_timers.values())
+            self._flush_timers.clear()
+            resident = list(self._tenants.items())
+        for timer in timers:
+            timer.cancel()
+        for tenant_id, kb in resident:
+            self._flush(tenant_id, kb)
+
+    def clear(self):
+        with self._lock:
+            for timer in self._flush_timers.values():
+                timer.cancel()
+            self._flush_timers.clear()
+            self._tenants.clear()
+            self._sizes.clear()
+            self._evicting.clear()
+
+    def resident_tenants(self) -> List[str]:
+        with self._lock:
+            return list(self._tenants.keys())
+
+    def stats(self) -> Dict:
+        with self._lock:
+            requests = self.hits + self.loads
+            return {
+                "resident_tenants": len(self._tenants),
+                "resident_bytes": sum(self._sizes.values()),
+                "budget_bytes": self.memory_budget_bytes,
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "flushes": self.flushes,
+                "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+                "avg_load_ms": round(1000 * self.load_seconds / self.loads, 2) if self.loads else 0.0,
+            }
+
+
+_managers: Dict[Tuple[Optional[str], Callable], TenantKnowledgeBaseManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_tenant_manager(snapshot_root: Optional[str] = None, factory=None) -> TenantKnowledgeBaseManager:
+    # One manager per (snapshot root, KB class) per process.
+    key = (snapshot_root, factory or KnowledgeBase)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = TenantKnowledgeBaseManager(snapshot_root=snapshot_root, factory=factory)
+            if snapshot_root:
+                atexit.register(manager.flush_all)
+        return manager
+
+
+def reset_tenant_managers():
+    with _managers_lock:
+        _managers.clear()
@@ -0,0 +1,353 @@
+"""
+core/tracing.py
+
+Spans around graph nodes, agent calls, KB search, embedding and LLM calls.
+Each finished span updates in-process latency metrics (a Prometheus-style
+histogram plus a bounded sample for p50/p99) and, in the default mode, is
+exported as one OTLP/JSON line to CHIMERA_TRACE_FILE through the same
+buffered writer the audit log uses, so the calling thread never touches disk.
+
+    with span("kb.search", kind="kb", queries=1) as s:
+        ...
+        s.set("kb.results", len(rows))
+
+CHIMERA_TRACE=on (metrics + file), metrics (metrics only) or off.
+CHIMERA_METRICS_PORT serves the metrics as Prometheus text on /metrics.
+Per-agent p50/p99 come from `get_tracer().latency_summary("agent")`.
+"""
+
+import atexit
+import contextvars
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from core.audit_log import AuditSink
+from core.log import get_logger
+
+TRACE_MODES = ("on", "metrics", "off")
+TRACE_MODE = os.getenv("CHIMERA_TRACE", "on")
+TRACE_PATH = os.getenv("CHIMERA_TRACE_FILE", os.path.join("traces", "spans.jsonl"))
+TRACE_SAMPLES = int(os.getenv("CHIMERA_TRACE_SAMPLES", "2048"))
+METRICS_PORT = int(os.getenv("CHIMERA_METRICS_PORT", "0"))  # 0 = no endpoint
+SERVICE_NAME = "chimera"
+
+# Histogram bucket bounds in seconds: sub-millisecond agents up to slow LLM calls.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Span kinds that call out of the process; OTLP distinguishes them from internal work.
+CLIENT_KINDS = {"llm"}
+
+log = get_logger(__name__)
+
+_current: contextvars.ContextVar = contextvars.ContextVar("chimera_span", default=None)
+
+
+class Span:
+    __slots__ = (
+        "name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "_t0", "_token", "duration", "attributes", "error"
+    )
+
+    def __init__(self, name: str, kind: str, parent: Optional["Span"], attributes: Dict):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self._t0 = time.perf_counter()
+        self.duration = 0.0
+        self.attributes = attributes
+        self.error = None
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current.reset(self._token)
+        end_span(self)
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_otlp())
+
+    def to_otlp(self) -> Dict:
+        # One ExportTraceServiceRequest per line, as read by the collector's otlpjsonfile receiver.
+        record = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 3 if self.kind in CLIENT_KINDS else 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.start_ns + int(self.duration * 1e9)),
+            "attributes": [_otlp_attribute("chimera.kind", self.kind)]
+                          + [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            record["parentSpanId"] = self.parent_id
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": "chimera.tracing"}, "spans": [record]}],
+        }]}
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def set(self, key: str, value):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class _Series:
+    __slots__ = ("count", "total", "errors", "buckets", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.buckets = [0] * len(BUCKETS)
+        self.samples = deque(maxlen=TRACE_SAMPLES)
+
+
+class Tracer:
+    def __init__(self, mode: str = TRACE_MODE, path: str = TRACE_PATH):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"unknown trace mode {mode!r}, expected one of {TRACE_MODES}")
+        self.mode = mode
+        self.path = path
+        self._sink: Optional[AuditSink] = None
+        self._lock = threading.Lock()
+        self._series: Dict[tuple, _Series] = {}
+        self._counters: Dict[tuple, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def sink(self) -> AuditSink:
+        with self._lock:
+            if self._sink is None:
+                # Spans are queued as-is and converted to OTLP JSON on the writer thread.
+                self._sink = AuditSink(path=self.path, thread_name="chimera-trace", encode=Span.to_json)
+                atexit.register(self._sink.close)
+            return self._sink
+
+    def record(self, span: Span):
+        seconds = span.duration
+        with self._lock:
+            series = self._series.get((span.kind, span.name))
+            if series is None:
+                series = self._series[(span.kind, span.name)] = _Series()
+            series.count += 1
+            series.total += seconds
+            if span.error:
+                series.errors += 1
+            bucket = bisect_left(BUCKETS, seconds)
+            if bucket < len(BUCKETS):
+                series.buckets[bucket] += 1
+            series.samples.append(seconds)
+            if span.kind == "llm":
+                for direction, attribute in (("input", "llm.input_tokens"), ("output", "llm.output_tokens")):
+                    tokens = span.attributes.get(attribute)
+                    if tokens:
+                        key = (span.name, direction)
+                        self._counters[key] = self._counters.get(key, 0) + tokens
+        if self.mode == "on":
+            (self._sink or self.sink()).record(span)
+
+    def latency_summary(self, kind: Optional[str] = None) -> Dict[str, Dict]:
+        with self._lock:
+            snapshot = {
+                key: (series.count, series.total, series.errors, sorted(series.samples))
+                for key, series in self._series.items()
+                if kind is None or key[0] == kind
+            }
+        summary = {}
+        for (span_kind, name), (count, total, errors, samples) in sorted(snapshot.items()):
+            summary[name if kind else f"{span_kind}:{name}"] = {
+                "count": count,
+                "errors": errors,
+                "mean_ms": round(1000 * total / count, 3),
+                "p50_ms": round(1000 * samples[len(samples) // 2], 3),
+                "p99_ms": round(1000 * samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+            }
+        return summary
+
+    def prometheus_text(self) -> str:
+        with self._lock:
+            series = {key: (s.count, s.total, s.errors, list(s.buckets)) for key, s in self._series.items()}
+            counters = dict(self._counters)
+        lines = [
+            "# HELP chimera_span_duration_seconds Duration of traced spans.",
+            "# TYPE chimera_span_duration_seconds histogram",
+        ]
+        for (kind, name), (count, total, errors, buckets) in sorted(series.items()):
+            labels = f'kind="{kind}",name="{name}"'
+            cumulative = 0
+            for bound, hits in zip(BUCKETS, buckets):
+                cumulative += hits
+                lines.append(f'chimera_span_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'chimera_span_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"chimera_span_duration_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"chimera_span_duration_seconds_count{{{labels}}} {count}")
+        lines.append("# HELP chimera_span_errors_total Spans that ended with an exception.")
+        lines.append("# TYPE chimera_span_errors_total counter")
+        for (kind, name), (_, _, errors, _) in sorted(series.items()):
+            lines.append(f'chimera_span_errors_total{{kind="{kind}",name="{name}"}} {errors}')
+        lines.append("# HELP chimera_llm_tokens_total LLM tokens by call site and direction.")
+        lines.append("# TYPE chimera_llm_tokens_total counter")
+        for (name, direction), tokens in sorted(counters.items()):
+            lines.append(f'chimera_llm_tokens_total{{name="{name}",direction="{direction}"}} {tokens}')
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        if self._sink is not None:
+            self._sink.flush()
+
+    def close(self):
+        if self._sink is not None:
+            self._sink.close()
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._counters.clear()
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+_metrics_server: Optional[ThreadingHTTPServer] = None
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+            if METRICS_PORT:
+                start_metrics_server(METRICS_PORT)
+        return _tracer
+
+
+def span(name: str, kind: str = "internal", **attributes):
+    # Use as a context manager; the span is current (parent of nested spans) inside the block.
+    return start_span(name, kind, **attributes)
+
+
+def start_span(name: str, kind: str = "internal", **attributes):
+    # For spans that outlive a with-block (e.g. a streamed reply consumed by a
+    # generator): parented to the current span but never made current itself.
+    # Pair with end_span().
+    tracer = _tracer or get_tracer()
+    if not tracer.enabled:
+        return _NOOP
+    return Span(name, kind, _current.get(), attributes)
+
+
+def end_span(current, error: Optional[BaseException] = None):
+    if current is _NOOP:
+        return
+    current.duration = time.perf_counter() - current._t0
+    if error is not None:
+        current.error = f"{type(error).__name__}: {error}"
+    (_tracer or get_tracer()).record(current)
+
+
+def traced_node(name: str, node):
+    # Wraps a graph node (sync or async) in a "node" span.
+    if inspect.iscoroutinefunction(node):
+        async def async_node(state):
+            with span(name, kind="node", session_id=state.get("session_id")):
+                return await node(state)
+        return async_node
+
+    def sync_node(state):
+        with span(name, kind="node", session_id=state.get("session_id")):
+            return node(state)
+    return sync_node
+
+
+def record_llm_usage(current, response, prompt_chars: Optional[int] = None):
+    # Token counts from the provider when it reports them (LangChain usage_metadata
+    # dict, google.generativeai usage_metadata object); otherwise ~4 chars per token.
+    if current is _NOOP or response is None:
+        return
+    usage = getattr(response, "usage_metadata", None)
+    if isinstance(usage, dict) and usage.get("input_tokens") is not None:
+        current.set("llm.input_tokens", int(usage["input_tokens"]))
+        current.set("llm.output_tokens", int(usage.get("output_tokens") or 0))
+        return
+    if usage is not None and getattr(usage, "prompt_token_count", None) is not None:
+        current.set("llm.input_tokens", int(usage.prompt_token_count))
+        current.set("llm.output_tokens", int(getattr(usage, "candidates_token_count", 0) or 0))
+        return
+    text = getattr(response, "content", None)
+    if not isinstance(text, str):
+        try:
+            text = response.text
+        except Exception:
+            text = ""
+    current.set("llm.output_chars", len(text))
+    current.set("llm.output_tokens", len(text) // 4)
+    if prompt_chars is not None:
+        current.set("llm.input_tokens", prompt_chars // 4)
+    current.set("llm.tokens_estimated", True)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_tracer().prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug("[METRICS] " + format, *args)
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    # Idempotent; port 0 binds an ephemeral port (see server.server_address).
+    global _metrics_server
+    if _metrics_server is None:
+        _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        _metrics_server.daemon_threads = True
+        threading.Thread(target=_metrics_server.serve_forever, name="chimera-metrics", daemon=True).start()
+        log.info("[METRICS] Serving Prometheus metrics on %s:%d/metrics", *_metrics_server.server_address[:2])
+    return _metrics_server
@@ -0,0 +1,198 @@
+"""
+core/vector_index.py
+"""
+
+import math
+import os
+import faiss
+import numpy as np
+from typing import Optional
+
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+STORAGE_TYPES = ("float32", "float16", "sq8", "pq")
+
+# Maps an index's codes (and HNSW links) straight from the file; older faiss has no such flag.
+_MMAP_FLAG = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+
+_SQ_TYPES = {
+    "float16": faiss.ScalarQuantizer.QT_fp16,
+    "sq8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+class IndexConfig:
+    def __init__(
+        self,
+        kind: str = "flat",
+        train_threshold: int = 10_000,
+        nlist: Optional[int] = None,
+        pq_m: int = 48,
+        pq_bits: int = 8,
+        hnsw_m: int = 32,
+        ef_construction: int = 80,
+        nprobe: int = 16,
+        ef_search: int = 64,
+        max_train_points: int = 100_000,
+        storage: str = "float32",
+    ):
+        if kind not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{kind}', expected one of {INDEX_TYPES}")
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"Unknown vector storage '{storage}', expected one of {STORAGE_TYPES}")
+        self.kind = kind
+        self.storage = storage
+        self.train_threshold = train_threshold
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.pq_bits = pq_bits
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.max_train_points = max_train_points
+
+    @classmethod
+    def from_env(cls) -> "IndexConfig":
+        return cls(
+            kind=os.getenv("CHIMERA_INDEX_TYPE", "flat"),
+            train_threshold=int(os.getenv("CHIMERA_INDEX_TRAIN_THRESHOLD", "10000")),
+            nprobe=int(os.getenv("CHIMERA_INDEX_NPROBE", "16")),
+            ef_search=int(os.getenv("CHIMERA_INDEX_EF_SEARCH", "64")),
+            storage=os.getenv("CHIMERA_VECTOR_STORAGE", "float32"),
+        )
+
+    def wants_ann(self, n_vectors: int) -> bool:
+        # Below the threshold everything is staged in a plain float32 flat index.
+        return (self.kind != "flat" or self.storage != "float32") and n_vectors >= self.train_threshold
+
+    def nlist_for(self, n_vectors: int) -> int:
+        if self.nlist:
+            return self.nlist
+        # ~4*sqrt(N) lists, but keep at least 39 training points per centroid.
+        return max(1, min(int(4 * math.sqrt(n_vectors)), n_vectors // 39))
+
+
+def is_flat(index) -> bool:
+    return isinstance(index, faiss.IndexFlat)
+
+
+def build_index(dim: int, config: IndexConfig, n_vectors: int = 0):
+    if not config.wants_ann(n_vectors):
+        return faiss.IndexFlatL2(dim)
+    storage = config.storage
+    if config.kind == "hnsw":
+        if storage in _SQ_TYPES:
+            index = faiss.IndexHNSWSQ(dim, _SQ_TYPES[storage], config.hnsw_m)
+        elif storage == "pq":
+            index = faiss.IndexHNSWPQ(dim, config.pq_m, config.hnsw_m, config.pq_bits)
+        else:
+            index = faiss.IndexHNSWFlat(dim, config.hnsw_m)
+        index.hnsw.efConstruction = config.ef_construction
+        return index
+    if config.kind == "flat":
+        if storage in _SQ_TYPES:
+            return faiss.IndexScalarQuantizer(dim, _SQ_TYPES[storage])
+        # IndexPQ rejects ID selectors, so flat PQ is a single-list IVF-PQ.
+        return faiss.IndexIVFPQ(faiss.IndexFlatL2(dim), dim, 1, config.pq_m, config.pq_bits)
+    nlist = config.nlist_for(n_vectors)
+    quantizer = faiss.IndexFlatL2(dim)
+    if config.kind == "ivf_pq" or storage == "pq":
+        return faiss.IndexIVFPQ(quantizer, dim, nlist, config.pq_m, config.pq_bits)
+    if storage in _SQ_TYPES:
+        return faiss.IndexIVFScalarQuantizer(quantizer, dim, nlist, _SQ_TYPES[storage])
+    return faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_L2)
+
+
+def train_index(index, vectors: np.ndarray, config: IndexConfig, seed: int = 1234):
+    if index.is_trained:
+        return
+    sample = vectors
+    if len(vectors) > config.max_train_points:
+        rng = np.random.default_rng(seed)
+        rows = np.sort(rng.choice(len(vectors), config.max_train_points, replace=False))
+        sample = vectors[rows]
+    index.train(np.ascontiguousarray(sample, dtype="float32"))
+
+
+def apply_search_params(index, config: IndexConfig):
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = config.ef_search
+        return
+    ivf = _ivf_of(index)
+    if ivf is not None:
+        ivf.nprobe = min(config.nprobe, ivf.nlist)
+
+
+def allowed_selector(rows: np.ndarray, ntotal: int):
+    # A bitmap over all rows: O(1) membership per candidate and far cheaper to
+    # build than IDSelectorBatch's hash set when the filter keeps many rows.
+    mask = np.zeros(ntotal, dtype=bool)
+    mask[rows] = True
+    bits = np.packbits(mask, bitorder="little")
+    selector = faiss.IDSelectorBitmap(len(bits), faiss.swig_ptr(bits))
+    selector.referenced_objects = [bits]
+    return selector
+
+
+def search_parameters(index, config: IndexConfig, selector):
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=config.ef_search)
+    ivf = _ivf_of(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=min(config.nprobe, ivf.nlist))
+    return faiss.SearchParameters(sel=selector)
+
+
+def create_index(vectors: np.ndarray, config: IndexConfig):
+    # Build, train and fill in one go; used for rebuilds and benchmarks.
+    index = build_index(vectors.shape[1], config, len(vectors))
+    train_index(index, vectors, config)
+    apply_search_params(index, config)
+    if len(vectors):
+        index.add(np.ascontiguousarray(vectors, dtype="float32"))
+    enable_reconstruct(index)
+    return index
+
+
+def read_index(path: str, mmap: bool = False):
+    # Returns (index, mapped). A mapped index lives in the page cache and is
+    # read-only: pass it through own_index() before adding to it.
+    if mmap and _MMAP_FLAG is not None:
+        return faiss.read_index(path, _MMAP_FLAG), True
+    return faiss.read_index(path), False
+
+
+def own_index(index):
+    # Copy a mapped index into process memory; faiss aborts on adds to a mapped one.
+    return faiss.deserialize_index(faiss.serialize_index(index))
+
+
+def enable_reconstruct(index):
+    # IVF indexes need a direct map before reconstruct_batch() works.
+    ivf = _ivf_of(index)
+    if ivf is not None and ivf.direct_map.type == faiss.DirectMap.NoMap:
+        ivf.make_direct_map()
+
+
+def index_memory_bytes(index) -> int:
+    # Estimate of resident bytes: codes, ids, graph links and trained tables.
+    if index is None:
+        return 0
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexHNSW):
+        return index_memory_bytes(index.storage) + 4 * (index.hnsw.neighbors.size() + index.hnsw.levels.size())
+    if isinstance(index, faiss.IndexIVF):
+        size = index.ntotal * (index.code_size + 8) + index_memory_bytes(index.quantizer)
+        if isinstance(index, faiss.IndexIVFPQ):
+            size += 4 * index.pq.centroids.size()
+        if index.direct_map.type != faiss.DirectMap.NoMap:
+            size += 8 * index.ntotal
+        return size
+    return index.ntotal * getattr(index, "code_size", 4 * index.d)
+
+
+def _ivf_of(index):
+    try:
+        return faiss.extract_index_ivf(index)
+    except RuntimeError:
+        return None
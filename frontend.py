@@ -5,17 +5,18 @@ import pandas as pd
 import plotly.express as px
 import google.generativeai as genai
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
 import requests
-import PyPDF2
-import docx
-import faiss
-import numpy as np
-from sentence_transformers import SentenceTransformer
 from ai import ChimeraAI
+from core.knowledge_base import KnowledgeBase as BaseKnowledgeBase
+from core.tenant_manager import get_tenant_manager
+from core.tracing import get_tracer
+from utils.document_pipeline import docx_paragraph_stream, ingest_stream, pdf_page_stream
+from utils.web_crawler import crawl_website, extract_page_text
 
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+KB_SNAPSHOT_DIR = os.getenv("CHIMERA_KB_DIR", "kb_snapshot")
+TENANT_ID = os.getenv("CHIMERA_TENANT", "default")
 genai.configure(api_key=GEMINI_API_KEY)
 
 st.set_page_config(
@@ -51,87 +52,73 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-class KnowledgeBase:
-    def __init__(self):
-        self.docs = []
-        self.metadatas = []
-        self.model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
-        self.index = None
-
-    def _update_index(self):
-        if not self.docs:
-            self.index = None
-            return
-        embeddings = np.array(self.model.encode(self.docs, show_progress_bar=False)).astype("float32")
-        self.index = faiss.IndexFlatL2(embeddings.shape[1])
-        self.index.add(embeddings)
-
-    def add_text(self, text: str, metadata: dict = None):
-        chunks = [c.strip() for c in text.split("\n\n") if c.strip() and len(c.strip()) > 40]
-        for chunk in chunks:
-            self.docs.append(chunk)
-            self.metadatas.append(metadata or {})
-        self._update_index()
-        return len(chunks)
-
-    def add_pdf(self, file):
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = "\n\n".join([page.extract_text() or "" for page in pdf_reader.pages])
-        return self.add_text(text, {"source": file.name, "type": "pdf"})
-
-    def add_docx(self, file):
-        doc = docx.Document(file)
-        text = "\n\n".join([p.text for p in doc.paragraphs if p.text.strip()])
-        return self.add_text(text, {"source": file.name, "type": "docx"})
+class KnowledgeBase(BaseKnowledgeBase):
+    def add_pdf(self, file, progress=None):
+        # Re-uploading a file replaces its previous chunks.
+        self.remove_source(file.name, compact=False)
+        total, pages = pdf_page_stream(file)
+        added = ingest_stream(self, pages, total, {"source": file.name, "type": "pdf"}, progress=progress)
+        self.maybe_compact()
+        return added
+
+    def add_docx(self, file, progress=None):
+        self.remove_source(file.name, compact=False)
+        total, units = docx_paragraph_stream(file)
+        added = ingest_stream(self, units, total, {"source": file.name, "type": "docx"}, progress=progress)
+        self.maybe_compact()
+        return added
 
     def scrape_website(self, url: str):
         try:
             headers = {"User-Agent": "Mozilla/5.0"}
             response = requests.get(url, headers=headers, timeout=30)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            for tag in soup(["script", "style", "nav", "footer", "header", "form", "aside"]):
-                tag.decompose()
-
-            main = soup.find("main") or soup.find("article") or soup.body or soup
-            paragraphs = [
-                p.get_text(" ", strip=True)
-                for p in main.find_all(["p", "h1", "h2", "h3"])
-                if len(p.get_text(strip=True)) > 40
-            ]
-            text = "\n\n".join(paragraphs)
+            text = extract_page_text(response.text)
             if not text.strip():
                 raise Exception("No meaningful text extracted.")
-            return self.add_text(text, {"source": url, "type": "website"})
+            return self.replace_source(url, text, {"source": url, "type": "website"})
         except Exception as e:
             raise Exception(f"Scraping failed: {str(e)}")
 
-    def search(self, query: str, n: int = 3, db=None):
-        if not self.index or not self.docs:
-            return []
-        query_emb = np.array(self.model.encode([query])).astype("float32")
-        distances, indices = self.index.search(query_emb, min(n, len(self.docs)))
-        return [self.docs[i] for i in indices[0] if i < len(self.docs)]
-
-    def get_count(self):
-        return len(self.docs)
+    def crawl_website(self, seeds, max_pages: int = 100, progress=None):
+        return crawl_website(self, seeds, max_pages=max_pages, progress=progress)
 
 
-if "kb" not in st.session_state:
-    st.session_state.kb = KnowledgeBase()
+kb_manager = get_tenant_manager(KB_SNAPSHOT_DIR, factory=KnowledgeBase)
 if "ai" not in st.session_state:
-    st.session_state.ai = ChimeraAI(st.session_state.kb)
+    # Given the manager, not a KB, so every reply resolves the tenant's current instance.
+    st.session_state.ai = ChimeraAI(kb_manager, tenant_id=TENANT_ID)
 if "messages" not in st.session_state:
     st.session_state.messages = []
 if "session_id" not in st.session_state:
     st.session_state.session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
 
-def display_message(role: str, content: str):
+def tenant_kb() -> KnowledgeBase:
+    # Shared by every browser session of this tenant in the process. Never keep it in
+    # session state: once the manager evicts the tenant, a held instance goes stale.
+    return kb_manager.get(TENANT_ID)
+
+
+def persist_kb():
+    # Debounced: a full snapshot rewrite is O(corpus), so it must not run on every add.
+    kb_manager.schedule_flush(TENANT_ID)
+    kb_manager.refresh(TENANT_ID)
+
+
+def progress_reporter(label: str):
+    bar = st.progress(0.0, text=label)
+
+    def report(done: int, total: int, chunks: int):
+        bar.progress(min(done / total, 1.0) if total else 1.0, text=f"{label} {done}/{total} ({chunks} chunks)")
+
+    return report
+
+
+def display_message(role: str, content: str, target=None):
     css_class = "user-message" if role == "user" else "assistant-message"
     icon = "👤" if role == "user" else "🤖"
-    st.markdown(f"""
+    (target or st).markdown(f"""
     <div class="chat-message {css_class}">
         <strong>{icon} {role.title()}:</strong><br>
         {content}
@@ -160,10 +147,37 @@ with st.sidebar:
             st.rerun()
 
     st.markdown("---")
-    st.metric("Documents", st.session_state.kb.get_count())
+    st.metric("Documents", tenant_kb().get_count())
+    dedup = tenant_kb().dedup_stats()
+    st.metric("Duplicates skipped", dedup["chunks_saved"], help=f"{dedup['bytes_saved'] / 1024:.1f} KB saved")
     stats = st.session_state.ai.get_statistics()
     st.metric("Conversations", stats["total_conversations"])
     st.metric("Messages", stats["total_messages"])
+    if st.session_state.ai.response_cache is not None:
+        replies = st.session_state.ai.response_cache.stats()
+        st.metric("Reply cache hit rate", f"{replies['hit_rate']:.0%}", help=f"{replies['entries']} cached replies")
+    tenants = kb_manager.stats()
+    st.metric(
+        "Resident tenants",
+        tenants["resident_tenants"],
+        help=f"{tenants['resident_bytes'] / 2**20:.0f} / {tenants['budget_bytes'] / 2**20:.0f} MB, "
+             f"{tenants['loads']} loads, {tenants['evictions']} evictions, avg load {tenants['avg_load_ms']} ms",
+    )
+    llm = st.session_state.ai.dispatcher.stats()
+    waits = ", ".join(f"{lane} p99 {w['p99']} ms" for lane, w in llm["wait_ms"].items()) or "no waits yet"
+    st.metric(
+        "LLM queue depth",
+        llm["queue_depth"],
+        help=f"{llm['in_flight']} in flight, peak {llm['max_queue_depth']}, "
+             f"{llm['coalesced']} coalesced; {waits}",
+    )
+    latency = get_tracer().latency_summary()
+    if latency:
+        with st.expander("⏱️ Latency by span"):
+            st.dataframe(
+                pd.DataFrame.from_dict(latency, orient="index")[["count", "p50_ms", "p99_ms", "errors"]],
+                use_container_width=True,
+            )
     st.markdown("---")
     st.success("✅ Using local FAISS embeddings (no API costs)")
 
@@ -185,12 +199,19 @@ with tab1:
 
     if send and user_input:
         st.session_state.messages.append({"role": "user", "content": user_input})
-        with st.spinner("🤖 Chimera is thinking..."):
-            try:
-                result = st.session_state.ai.generate_response(user_input, st.session_state.session_id)
-                st.session_state.messages.append({"role": "assistant", "content": result["response"]})
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
+        display_message("user", user_input)
+        # Render the reply as it streams instead of waiting behind a spinner.
+        placeholder = st.empty()
+        display_message("assistant", "🤖 Chimera is thinking...", target=placeholder)
+        try:
+            stream = st.session_state.ai.generate_response_stream(user_input, st.session_state.session_id)
+            partial = ""
+            for chunk in stream:
+                partial += chunk
+                display_message("assistant", partial + " ▌", target=placeholder)
+            st.session_state.messages.append({"role": "assistant", "content": stream.result["response"]})
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
         st.rerun()
 
 
@@ -202,17 +223,26 @@ with tab2:
         text_content = st.text_area("Enter text content:", height=200)
         if st.button("➕ Add Text"):
             if text_content.strip():
-                chunks = st.session_state.kb.add_text(text_content, {"type": "text"})
+                chunks = tenant_kb().add_text(text_content, {"type": "text"})
+                persist_kb()
                 st.success(f"Added {chunks} chunks to the knowledge base.")
             else:
                 st.warning("Please enter text.")
 
     with tab_site:
-        url = st.text_input("Enter website URL:")
+        url = st.text_input("Enter website or sitemap.xml URL:")
+        crawl = st.checkbox("Crawl linked pages")
+        max_pages = st.number_input("Max pages", min_value=1, max_value=5000, value=100, disabled=not crawl)
         if st.button("🌐 Scrape Website"):
             if url:
                 try:
-                    chunks = st.session_state.kb.scrape_website(url)
+                    if crawl or url.endswith(".xml"):
+                        chunks = tenant_kb().crawl_website(
+                            [url], max_pages=int(max_pages), progress=progress_reporter("Crawling pages")
+                        )
+                    else:
+                        chunks = tenant_kb().scrape_website(url)
+                    persist_kb()
                     st.success(f"Added {chunks} chunks from website.")
                 except Exception as e:
                     st.error(f"{str(e)}")
@@ -220,15 +250,28 @@ with tab2:
     with tab_pdf:
         pdf_file = st.file_uploader("Upload PDF", type=["pdf"])
         if st.button("📄 Process PDF") and pdf_file:
-            chunks = st.session_state.kb.add_pdf(pdf_file)
+            chunks = tenant_kb().add_pdf(pdf_file, progress=progress_reporter("Processing pages"))
+            persist_kb()
             st.success(f"Added {chunks} chunks from PDF.")
 
     with tab_docx:
         doc_file = st.file_uploader("Upload DOCX", type=["docx"])
         if st.button("📃 Process DOCX") and doc_file:
-            chunks = st.session_state.kb.add_docx(doc_file)
+            chunks = tenant_kb().add_docx(doc_file, progress=progress_reporter("Processing paragraphs"))
+            persist_kb()
             st.success(f"Added {chunks} chunks from DOCX.")
 
+    with st.expander("🗂️ Manage Sources"):
+        sources = tenant_kb().sources()
+        if sources:
+            source = st.selectbox("Source", sources)
+            if st.button("🗑️ Remove Source"):
+                removed = tenant_kb().remove_source(source)
+                persist_kb()
+                st.success(f"Removed {removed} chunks from {source}.")
+        else:
+            st.info("No sources yet.")
+
 
 with tab3:
     st.markdown("### 📊 Analytics")
@@ -0,0 +1,56 @@
+import pytest
+
+import core.response_cache as response_cache
+from benchmarks.common import HashingEncoder, synthetic_chunks
+from core.graph import build_supervisor_graph, initial_state
+from core.knowledge_base import KnowledgeBase
+from core.llm_clients import get_llm_provider
+
+SSN = "123-45-6789"
+REPLY = f"Thanks Sam! Growth includes the HubSpot and Salesforce sync, and your reference is {SSN}."
+
+
+class _Message:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class StubChatModel:
+    def __init__(self):
+        self.stylist_calls = 0
+
+    def invoke(self, prompt):
+        if prompt.startswith("Rewrite this message"):
+            self.stylist_calls += 1
+            return _Message(prompt.split("Original: ", 1)[1].split("\n", 1)[0])
+        return _Message(REPLY)
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = StubChatModel()
+    monkeypatch.setattr(get_llm_provider(), "chat_model", lambda *args, **kwargs: model)
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_ENABLED", False)
+    return model
+
+
+@pytest.mark.parametrize("mode", ["two_pass", "fused"])
+def test_compliance_redacts_the_reply_in_every_generation_mode(model, mode):
+    kb = KnowledgeBase(model=HashingEncoder())
+    kb.add_chunks(synthetic_chunks(50))
+    graph = build_supervisor_graph(kb)
+    state = initial_state(
+        f"{mode}-1",
+        # An email reaches the lead phase and, unlike a demo request, keeps the LLM's reply.
+        [{"role": "user", "content": "I'm sam@acme.io, what does the Growth plan include?"}],
+        brand_profile={"tone": "friendly", "voice": "confident"},
+        tenant_config={"tenant_id": "acme", "generation_mode": mode},
+    )
+
+    final = graph.invoke(state)
+
+    assert SSN in final["provisional_reply"]
+    assert SSN not in final["sanitized_output"]
+    assert "[REDACTED]" in final["sanitized_output"]
+    assert "ssn_removed" in final["compliance_flags"]
+    assert model.stylist_calls == (0 if mode == "fused" else 1)
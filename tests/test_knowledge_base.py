@@ -0,0 +1,77 @@
+import numpy as np
+
+from benchmarks.common import HashingEncoder, synthetic_chunks
+from core.knowledge_base import KnowledgeBase
+
+
+def make_kb():
+    return KnowledgeBase(model=HashingEncoder())
+
+
+def test_snapshot_index_is_mmapped_until_the_next_add(tmp_path):
+    docs = synthetic_chunks(200)
+    kb = make_kb()
+    kb.add_chunks(docs[:150])
+    kb.save_snapshot(str(tmp_path))
+
+    loaded = make_kb()
+    assert loaded.load_snapshot(str(tmp_path))
+    assert loaded._index_mapped
+    assert loaded.search(docs[10], n=1) == [docs[10]]
+
+    loaded.add_chunks(docs[150:])
+    assert not loaded._index_mapped
+    assert loaded.index.ntotal == 200
+    assert loaded.search(docs[180], n=1) == [docs[180]]
+    assert loaded.search(docs[10], n=1) == [docs[10]]
+
+
+def test_filtered_search_matches_an_exact_scan_above_and_below_the_scan_threshold():
+    docs = synthetic_chunks(2000)
+    kb = make_kb()
+    for s in range(20):
+        kb.add_chunks(docs[s * 100:(s + 1) * 100], {"source": f"doc{s}"})
+    for sources in (2, 12):  # 200 rows are scanned, 1200 go through the ID selector
+        where = {"source": [f"doc{s}" for s in range(sources)]}
+        allowed = kb.metadata_index.match(where)
+        query = kb._embed_queries(["book a demo"])
+        vectors = kb._get_vectors(allowed)
+        expected = allowed[np.argsort(((vectors - query) ** 2).sum(axis=1), kind="stable")[:5]]
+        assert kb.search("book a demo", n=5, where=where) == [kb.docs[i] for i in expected]
+
+
+FOOTER = "Chimera Inc. 500 Market Street, San Francisco. Contact sales@chimera.ai for pricing and support plans."
+
+
+def test_removing_a_source_keeps_chunks_it_shared_with_another(tmp_path):
+    kb = make_kb()
+    kb.add_chunks(["Page A explains the Growth plan and its HubSpot sync in detail.", FOOTER], {"source": "a"})
+    kb.add_chunks(["Page B walks through SSO setup and the security audit process.", FOOTER], {"source": "b"})
+    assert kb.get_count() == 3  # the footer is stored once, under "a"
+
+    kb.remove_source("a")
+    assert kb.search(FOOTER, n=1, where={"source": "b"}) == [FOOTER]
+
+    # The restored chunk belongs to "b" now, also after a snapshot round trip.
+    kb.save_snapshot(str(tmp_path))
+    loaded = make_kb()
+    loaded.load_snapshot(str(tmp_path))
+    loaded.replace_source("b", "Page B now covers the webhook API instead.")
+    assert FOOTER not in loaded.search(FOOTER, n=5)
+    assert loaded.get_count() == 1
+
+
+def test_re_crawling_pages_that_share_a_footer_keeps_one_copy_for_the_rest():
+    kb = make_kb()
+    for source in ("a", "b", "c"):
+        kb.add_chunks([f"Page {source} has its own introduction about onboarding.", FOOTER], {"source": source})
+
+    kb.remove_source("a")
+    kb.add_chunks(["Page a was rewritten to describe the webhook API.", FOOTER], {"source": "a"})
+    kb.remove_source("b")
+
+    assert kb.get_count() == 3
+    assert kb.search(FOOTER, n=5).count(FOOTER) == 1
+    assert kb.search(FOOTER, n=1, where={"source": "c"}) == [FOOTER]
+    kb.remove_source("c")
+    assert kb.search(FOOTER, n=1, where={"source": "a"}) == [FOOTER]
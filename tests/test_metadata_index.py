@@ -0,0 +1,13 @@
+from core.metadata_index import MetadataIndex
+
+
+def test_repeated_list_values_post_a_row_once():
+    index = MetadataIndex()
+    index.add(0, {"tags": ["pricing", "pricing", "sso"], "type": "pdf"})
+    index.add(1, {"tags": ["pricing"], "type": "pdf"})
+    index.add(2, {"tags": ["sso", {"nested": True}], "type": "docx"})
+
+    assert index.match({"tags": "pricing"}).tolist() == [0, 1]
+    assert index.match({"tags": "pricing", "type": "pdf"}).tolist() == [0, 1]
+    assert index.match({"tags": ["pricing", "sso"], "type": ["pdf", "docx"]}).tolist() == [0, 1, 2]
+    assert index.match({"tags": "sso", "type": "pdf"}).tolist() == [0]
@@ -0,0 +1,21 @@
+from core.graph import apply_conversation_result, initial_state
+from core.state_filter import StateFilter
+from core.state_view import thaw, unwrap
+
+EARLIER = {"event": "lead_scored", "score": 42}
+LATER = {"event": "conversation_turn", "intent": "question"}
+
+
+def test_conversation_merge_leaves_earlier_views_unchanged():
+    state = initial_state("s1", [{"role": "user", "content": "What integrations do you support?"}])
+    state["analytics_events"] = [EARLIER]
+    events = state["analytics_events"]
+    view = StateFilter.for_analytics_agent(state)
+
+    merged = apply_conversation_result(state, {"provisional_reply": "HubSpot.", "analytics_events": [LATER]})
+
+    assert merged["analytics_events"] == [EARLIER, LATER]
+    assert merged["analytics_events"] is not events
+    assert events == [EARLIER]
+    assert unwrap(view["analytics_events"]) is events
+    assert thaw(view["analytics_events"]) == [EARLIER]
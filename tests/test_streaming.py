@@ -0,0 +1,65 @@
+from ai import ChimeraAI
+from benchmarks.common import HashingEncoder, synthetic_chunks
+from core.knowledge_base import KnowledgeBase
+from core.response_cache import SemanticResponseCache
+
+PARTS = ["Chimera syncs", " with HubSpot", " and Salesforce."]
+
+
+class _Part:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeStreamingModel:
+    def __init__(self):
+        self.emitted = 0
+
+    def _parts(self):
+        for text in PARTS:
+            self.emitted += 1
+            yield _Part(text)
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        if stream:
+            return self._parts()
+        return _Part("".join(p.text for p in self._parts()))
+
+
+def make_ai():
+    kb = KnowledgeBase(model=HashingEncoder())
+    kb.add_chunks(synthetic_chunks(50))
+    ai = ChimeraAI(kb, response_cache=SemanticResponseCache())
+    ai.model = FakeStreamingModel()
+    return ai
+
+
+def test_stream_yields_before_the_reply_is_finished_and_commits_at_the_end():
+    ai = make_ai()
+    stream = ai.generate_response_stream("What integrations do you support?", "s1")
+    chunks = iter(stream)
+
+    first = next(chunks)
+    assert first == PARTS[0]
+    assert ai.model.emitted == 1
+    assert stream.result is None
+    assert ai.get_conversation("s1") == []
+    assert len(ai.response_cache) == 0
+
+    rest = list(chunks)
+    reply = "".join([first, *rest])
+    assert reply == stream.result["response"] == "".join(PARTS)
+    assert ai.get_conversation("s1") == [
+        {"role": "user", "content": "What integrations do you support?"},
+        {"role": "assistant", "content": reply},
+    ]
+    assert len(ai.response_cache) == 1
+
+
+def test_abandoned_stream_leaves_history_and_cache_untouched():
+    ai = make_ai()
+    stream = ai.generate_response_stream("What integrations do you support?", "s1")
+    next(iter(stream))
+
+    assert ai.get_conversation("s1") == []
+    assert len(ai.response_cache) == 0
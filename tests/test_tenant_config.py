@@ -0,0 +1,19 @@
+import logging
+
+from core.tenant_config import DEFAULT_GENERATION_MODE, generation_mode_for_state
+
+
+def test_generation_mode_comes_from_the_tenant_config():
+    assert generation_mode_for_state({"_tenant_config": {"generation_mode": "fused"}}) == "fused"
+    assert generation_mode_for_state({"_tenant_config": None}) == DEFAULT_GENERATION_MODE
+
+
+def test_unknown_generation_mode_falls_back_to_the_default(caplog):
+    state = {"_tenant_config": {"tenant_id": "acme", "generation_mode": "fuzed"}}
+    logger = logging.getLogger("chimera")
+    logger.addHandler(caplog.handler)
+    try:
+        assert generation_mode_for_state(state) == DEFAULT_GENERATION_MODE
+    finally:
+        logger.removeHandler(caplog.handler)
+    assert "fuzed" in caplog.text and "acme" in caplog.text
@@ -0,0 +1,62 @@
+import time
+
+from ai import ChimeraAI
+from benchmarks.common import HashingEncoder, synthetic_chunks
+from core.knowledge_base import KnowledgeBase
+from core.response_cache import SemanticResponseCache
+from core.tenant_manager import TenantKnowledgeBaseManager
+
+
+class SizedKB:
+    def memory_usage(self):
+        return {"total": 1024}
+
+
+def test_for_state_resolves_the_tenant_from_state():
+    manager = TenantKnowledgeBaseManager(factory=SizedKB)
+    acme = manager.for_state({"_tenant_config": {"tenant_id": "acme"}})
+
+    assert manager.get("acme") is acme
+    assert manager.for_state({"_tenant_config": None}) is manager.get("default")
+    assert manager.resident_tenants() == ["acme", "default"]
+
+
+def test_flush_saves_through_the_manager_and_the_assistant_follows_evictions(tmp_path):
+    manager = TenantKnowledgeBaseManager(
+        snapshot_root=str(tmp_path), factory=lambda: KnowledgeBase(model=HashingEncoder())
+    )
+    ai = ChimeraAI(manager, tenant_id="acme", response_cache=SemanticResponseCache())
+    kb = manager.get("acme")
+    kb.add_chunks(synthetic_chunks(20), {"source": "faq"})
+
+    manager.flush("acme")
+    assert not kb.dirty
+    assert ai._knowledge_base() is kb
+
+    manager.evict("acme")
+    reloaded = ai._knowledge_base()
+    assert reloaded is not kb
+    assert reloaded.get_count() == 20
+
+
+def test_scheduled_flushes_collapse_into_one_save(tmp_path):
+    manager = TenantKnowledgeBaseManager(
+        snapshot_root=str(tmp_path), factory=lambda: KnowledgeBase(model=HashingEncoder()), flush_delay=0.2
+    )
+    kb = manager.get("acme")
+    for i in range(5):
+        kb.add_chunks(synthetic_chunks(10, seed=i), {"source": f"page{i}"})
+        manager.schedule_flush("acme")
+    assert kb.dirty and manager.flushes == 0
+
+    deadline = time.monotonic() + 5
+    while kb.dirty and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert not kb.dirty
+    assert manager.flushes == 1
+
+    kb.add_chunks(synthetic_chunks(10, seed=99), {"source": "late"})
+    manager.schedule_flush("acme")
+    manager.flush_all()
+    assert not kb.dirty
+    assert manager.flushes == 2
@@ -0,0 +1,60 @@
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.web_crawler import crawl_website
+
+PARAGRAPH = "Chimera answers questions about pricing, integrations and onboarding for page {i}."
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path):
+    pages = 5
+    for i in range(pages):
+        links = "".join(f'<a href="/page{j}.html">{j}</a>' for j in range(pages) if j != i)
+        (tmp_path / f"page{i}.html").write_text(
+            f"<html><body><main><p>{PARAGRAPH.format(i=i)}</p>{links}</main></body></html>"
+        )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", pages
+    server.shutdown()
+    server.server_close()
+
+
+class RecordingKB:
+    def __init__(self):
+        self.sources = {}
+
+    def replace_source(self, source, text, metadata=None):
+        self.sources[source] = text
+        return 1
+
+
+def test_crawl_website_reports_progress_with_chunk_count(site):
+    base, pages = site
+    kb = RecordingKB()
+    calls = []
+
+    def report(done: int, total: int, chunks: int):
+        calls.append((done, total, chunks))
+
+    chunks = crawl_website(kb, [f"{base}/page0.html"], max_pages=pages, progress=report)
+
+    assert chunks == pages == len(kb.sources)
+    assert [done for done, _, _ in calls] == list(range(1, pages + 1))
+    assert all(total == pages for _, total, _ in calls)
+    counts = [count for _, _, count in calls]
+    assert counts == sorted(counts) and counts[-1] <= chunks
+
+
+def test_crawl_website_without_progress(site):
+    base, pages = site
+    assert crawl_website(RecordingKB(), [f"{base}/page0.html"], max_pages=pages) == pages
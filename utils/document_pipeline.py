@@ -0,0 +1,124 @@
+"""
+utils/document_pipeline.py
+
+Streaming ingestion: extract page -> chunk -> embed batch -> index add.
+Only a bounded window of pages and one embedding batch are held in memory
+at any time, so large uploads no longer have to be materialised up front.
+"""
+
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import PyPDF2
+import docx
+
+from core.chunker import TextChunker, default_chunker
+
+EMBED_BATCH_SIZE = 256
+PAGES_PER_TASK = 8
+POOL_MIN_PAGES = 32
+DOCX_PARAGRAPHS_PER_UNIT = 50
+
+ProgressCallback = Callable[[int, int, int], None]
+
+_worker_reader = None
+
+
+def _read_bytes(file) -> bytes:
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if hasattr(file, "getvalue"):
+        return file.getvalue()
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return file.read()
+
+
+def _init_pdf_worker(data: bytes):
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(io.BytesIO(data))
+
+
+def _extract_pdf_range(start: int, end: int) -> List[str]:
+    return [_worker_reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def pdf_page_stream(file, workers: Optional[int] = None) -> Tuple[int, Iterator[str]]:
+    data = _read_bytes(file)
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    total = len(reader.pages)
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    if workers <= 1 or total < POOL_MIN_PAGES:
+        return total, (page.extract_text() or "" for page in reader.pages)
+    return total, _parallel_pdf_pages(data, total, workers)
+
+
+def _parallel_pdf_pages(data: bytes, total: int, workers: int) -> Iterator[str]:
+    # Each worker parses the PDF once; pages come back in order and at most
+    # 2 * workers page ranges are in flight.
+    ranges = iter([(s, min(s + PAGES_PER_TASK, total)) for s in range(0, total, PAGES_PER_TASK)])
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_pdf_worker, initargs=(data,)) as pool:
+        pending = deque()
+        for start, end in ranges:
+            pending.append(pool.submit(_extract_pdf_range, start, end))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            pages = pending.popleft().result()
+            next_range = next(ranges, None)
+            if next_range:
+                pending.append(pool.submit(_extract_pdf_range, *next_range))
+            yield from pages
+
+
+def docx_paragraph_stream(file, group: int = DOCX_PARAGRAPHS_PER_UNIT) -> Tuple[int, Iterator[str]]:
+    document = docx.Document(file)
+    paragraphs = document.paragraphs
+    total = (len(paragraphs) + group - 1) // group
+
+    def units():
+        for start in range(0, len(paragraphs), group):
+            yield "\n\n".join(p.text for p in paragraphs[start:start + group] if p.text.strip())
+
+    return total, units()
+
+
+def ingest_stream(
+    kb,
+    units: Iterator[str],
+    total: int,
+    metadata: dict = None,
+    batch_size: int = EMBED_BATCH_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    chunker: Optional[TextChunker] = None,
+) -> int:
+    # The chunker runs across unit boundaries, so a sentence or chunk can span pages.
+    chunker = chunker or default_chunker()
+    added = 0
+    done = 0
+    reported = -1
+    batch: List[str] = []
+
+    def counted():
+        nonlocal done
+        for text in units:
+            yield text
+            done += 1
+
+    for chunk in chunker.chunk_stream(counted()):
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            added += kb.add_chunks(batch, metadata)
+            batch = []
+        if progress and done != reported:
+            reported = done
+            progress(done, total, added + len(batch))
+    if batch:
+        added += kb.add_chunks(batch, metadata)
+    if progress:
+        progress(done, total, added)
+    return added
@@ -0,0 +1,180 @@
+"""
+utils/web_crawler.py
+
+Concurrent same-site crawler used to onboard customer websites. Fetching and
+HTML parsing both run on a bounded thread pool; each worker thread keeps its
+own keep-alive requests.Session, and a per-host semaphore caps how hard we
+hit any single origin.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "Mozilla/5.0"
+STRIP_TAGS = ["script", "style", "nav", "footer", "header", "form", "aside"]
+MIN_PARAGRAPH_CHARS = 40
+
+
+def extract_page_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    return _page_text(soup)
+
+
+def _page_text(soup: BeautifulSoup) -> str:
+    for tag in soup(STRIP_TAGS):
+        tag.decompose()
+
+    main = soup.find("main") or soup.find("article") or soup.body or soup
+    paragraphs = [
+        p.get_text(" ", strip=True)
+        for p in main.find_all(["p", "h1", "h2", "h3"])
+        if len(p.get_text(strip=True)) > MIN_PARAGRAPH_CHARS
+    ]
+    return "\n\n".join(paragraphs)
+
+
+def _normalize_url(url: str) -> str:
+    return urldefrag(url)[0]
+
+
+class WebCrawler:
+    def __init__(
+        self,
+        max_pages: int = 500,
+        max_depth: int = 3,
+        concurrency: int = 16,
+        per_host: int = 8,
+        timeout: float = 30,
+        same_domain: bool = True,
+    ):
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.same_domain = same_domain
+        self.errors: Dict[str, str] = {}
+        self._local = threading.local()
+        self._host_limits: Dict[str, threading.Semaphore] = {}
+        self._host_limits_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _host_limit(self, host: str) -> threading.Semaphore:
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.Semaphore(self.per_host)
+            return self._host_limits[host]
+
+    def _get(self, url: str) -> requests.Response:
+        with self._host_limit(urlparse(url).netloc):
+            response = self._session().get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    def sitemap_urls(self, sitemap_url: str) -> List[str]:
+        soup = BeautifulSoup(self._get(sitemap_url).text, "html.parser")
+        urls = []
+        if soup.find("sitemapindex"):
+            for loc in soup.find_all("loc"):
+                urls.extend(self.sitemap_urls(loc.get_text(strip=True)))
+        else:
+            urls = [loc.get_text(strip=True) for loc in soup.find_all("loc")]
+        return urls
+
+    def _fetch_page(self, url: str, depth: int) -> Dict:
+        response = self._get(url)
+        if "html" not in response.headers.get("Content-Type", "text/html"):
+            return {"url": url, "depth": depth, "text": "", "links": []}
+        soup = BeautifulSoup(response.text, "html.parser")
+        links = []
+        if depth < self.max_depth:
+            for a in soup.find_all("a", href=True):
+                link = _normalize_url(urljoin(response.url, a["href"]))
+                if urlparse(link).scheme in ("http", "https"):
+                    links.append(link)
+        return {"url": url, "depth": depth, "text": _page_text(soup), "links": links}
+
+    def crawl(self, seeds: List[str], progress: Optional[Callable[[int, int], None]] = None) -> Iterator[Dict]:
+        # progress(done, total) after every fetched page; crawl_website adds the chunk count.
+        start_urls = []
+        for seed in seeds:
+            if seed.endswith(".xml"):
+                start_urls.extend(self.sitemap_urls(seed))
+            else:
+                start_urls.append(seed)
+
+        allowed_hosts = {urlparse(u).netloc for u in start_urls}
+        frontier = deque((_normalize_url(u), 0) for u in start_urls)
+        seen = set(u for u, _ in frontier)
+        scheduled = 0
+        done = 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            in_flight = {}
+            while frontier or in_flight:
+                while frontier and len(in_flight) < self.concurrency and scheduled < self.max_pages:
+                    url, depth = frontier.popleft()
+                    in_flight[pool.submit(self._fetch_page, url, depth)] = url
+                    scheduled += 1
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    url = in_flight.pop(future)
+                    done += 1
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        self.errors[url] = str(e)
+                        page = None
+                    for link in page.pop("links") if page else []:
+                        if link in seen:
+                            continue
+                        if self.same_domain and urlparse(link).netloc not in allowed_hosts:
+                            continue
+                        seen.add(link)
+                        frontier.append((link, page["depth"] + 1))
+                    if progress:
+                        progress(done, min(len(seen), self.max_pages))
+                    if page and page["text"].strip():
+                        yield page
+
+
+def crawl_website(
+    kb,
+    seeds: List[str],
+    max_pages: int = 100,
+    progress: Optional[Callable[[int, int, int], None]] = None,
+    crawler: Optional[WebCrawler] = None,
+) -> int:
+    # Crawls `seeds` into `kb`, replacing each page's previous chunks. `progress`
+    # is called as progress(done, total, chunks), like the document pipeline's.
+    crawler = crawler or WebCrawler(max_pages=max_pages)
+    chunks = 0
+
+    def report(done: int, total: int):
+        progress(done, total, chunks)
+
+    for page in crawler.crawl(seeds, progress=report if progress else None):
+        chunks += kb.replace_source(page["url"], page["text"], {"source": page["url"], "type": "website"})
+    if not chunks:
+        raise Exception(f"Crawl failed: no meaningful text extracted ({len(crawler.errors)} errors)")
+    return chunks